@@ -0,0 +1,92 @@
+"""Benchmark cases for the inference hot path, one per (case, MF type).
+
+Each case takes an MF type and returns ``(func, rows)``: ``func`` is the
+timed callable and ``rows`` the number of samples one call processes (used
+to derive per-row throughput), or None when throughput is meaningless.
+Setup work happens before the callable is returned and is not timed.
+"""
+import numpy as np
+
+from config import fis_config
+from src.analysis.simulation import PopulationConfig, simulate_population
+from src.analysis.sweep import random_inputs
+from src.core.experimental import IntelligentGymMachineExperimental
+from src.core.fis_engine import IntelligentGymMachine
+from src.services.fis_service import FISInputs, FISService
+from src.visualization.plots import compute_surface
+
+MF_TYPES = tuple(IntelligentGymMachineExperimental.FUNCTION_TYPES)
+BATCH_ROWS = 4096
+SURFACE_SHAPE = (40, 40)
+POPULATION = PopulationConfig(users=50)
+SURFACE_FIXED = {'sila': 250, 'predkosc': 0.6, 'faza': 50, 'zmeczenie': 30, 'tryb': 2}
+
+
+def build_machine(mf_type: str):
+    if mf_type == fis_config.DEFAULT_MF_TYPE:
+        return IntelligentGymMachine()
+    return IntelligentGymMachineExperimental(mf_type=mf_type)
+
+
+def compute_latency(mf_type: str):
+    service = FISService(mf_type)
+    inputs = FISInputs(sila=250, predkosc=0.7, faza=50, zmeczenie=20, tryb=2)
+    return (lambda: service.compute(inputs)), 1
+
+
+def batch_throughput(mf_type: str):
+    service = FISService(mf_type)
+    inputs = random_inputs(BATCH_ROWS)
+    return (lambda: service.compute_batch(inputs)), BATCH_ROWS
+
+
+def construction_cold(mf_type: str):
+    def build():
+        cache_dir = fis_config.FIS_CACHE_DIR
+        fis_config.FIS_CACHE_DIR = ''
+        try:
+            build_machine(mf_type)
+        finally:
+            fis_config.FIS_CACHE_DIR = cache_dir
+    return build, None
+
+
+def construction_warm(mf_type: str):
+    build_machine(mf_type)
+    return (lambda: build_machine(mf_type)), None
+
+
+def change_mf_type(mf_type: str):
+    other = next(candidate for candidate in MF_TYPES if candidate != mf_type)
+    # Build both machines up front so only the pooled switch is timed.
+    service = FISService(other)
+    service.change_mf_type(mf_type)
+    service.change_mf_type(other)
+    return (lambda: service.change_mf_type(mf_type)), None
+
+
+def surface_generation(mf_type: str):
+    machine = build_machine(mf_type)
+    sila = np.linspace(0, 500, SURFACE_SHAPE[0])
+    faza = np.linspace(0, 100, SURFACE_SHAPE[1])
+    return (
+        lambda: compute_surface(machine, 'sila', 'faza', sila, faza, SURFACE_FIXED)
+    ), SURFACE_SHAPE[0] * SURFACE_SHAPE[1]
+
+
+def population_simulation(mf_type: str):
+    machine = build_machine(mf_type)
+    return (
+        lambda: simulate_population(machine, POPULATION)
+    ), POPULATION.users * POPULATION.samples_per_user
+
+
+CASES = {
+    'compute_latency': compute_latency,
+    'batch_throughput': batch_throughput,
+    'construction_cold': construction_cold,
+    'construction_warm': construction_warm,
+    'change_mf_type': change_mf_type,
+    'surface_generation': surface_generation,
+    'population_simulation': population_simulation,
+}
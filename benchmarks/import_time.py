@@ -0,0 +1,83 @@
+"""Import cost of the package entry points, measured with ``python -X importtime``.
+
+    python -m benchmarks.import_time
+    python -m benchmarks.import_time --modules src.services.fis_service --runs 10
+
+Every module is imported in a fresh interpreter; the reported time is the
+cumulative import time of that module (best of ``--runs``), together with
+the heavy optional dependencies it pulled in.
+"""
+import argparse
+import json
+import logging
+import os
+import subprocess
+import sys
+from typing import Dict, Iterable, List, Optional
+
+from config.logging_config import LOGGER_NAME, configure_logging
+
+configure_logging(logging.WARNING)
+logger = logging.getLogger(f'{LOGGER_NAME}.benchmarks')
+logger.setLevel(logging.INFO)
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODULES = (
+    'src.core',
+    'src.services.fis_service',
+    'src.services.controller',
+    'src.services.server',
+    'src.analysis.sweep',
+    'src.visualization.plots',
+)
+# Packages the inference path must not import at module load.
+HEAVY_PACKAGES = ('matplotlib', 'scipy', 'skfuzzy', 'PyQt5')
+
+
+def import_profile(module: str) -> Dict[str, object]:
+    """Cumulative import time (s) of ``module`` and the heavy packages it loaded."""
+    script = (
+        f'import sys, {module}; '
+        f'print(",".join(sorted({{name.split(".")[0] for name in sys.modules}} & {set(HEAVY_PACKAGES)!r})))'
+    )
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', script],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    cumulative = None
+    for line in completed.stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        _, cumulative_us, name = (field.strip() for field in line[len('import time:'):].split('|'))
+        if name == module:
+            cumulative = int(cumulative_us) * 1e-6
+    heavy = completed.stdout.strip()
+    return {'seconds': cumulative, 'heavy': heavy.split(',') if heavy else []}
+
+
+def run(modules: Iterable[str], runs: int = 5) -> Dict[str, Dict[str, object]]:
+    results = {}
+    for module in modules:
+        profiles = [import_profile(module) for _ in range(runs)]
+        best = min(profile['seconds'] for profile in profiles)
+        results[module] = {'seconds': best, 'heavy': profiles[0]['heavy']}
+        logger.info("%-28s %8.1f ms  %s", module, best * 1e3, ', '.join(profiles[0]['heavy']) or '-')
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--modules', nargs='+', default=list(MODULES))
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--output', help='write the results as JSON')
+    args = parser.parse_args(argv)
+
+    results = run(args.modules, args.runs)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as handle:
+            json.dump(results, handle, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,158 @@
+"""Run the benchmark suite and write the results as JSON.
+
+    python -m benchmarks.run                                  # full run
+    python -m benchmarks.run --quick --cases compute_latency
+    python -m benchmarks.run --baseline benchmarks/results/main.json
+
+Every case runs once per MF type. Timings are per call in seconds; the
+median is the figure compared against a baseline, where a case slower by
+more than ``--threshold`` is reported as a regression (exit status 1).
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import warnings
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from config import fis_config
+from config.logging_config import LOGGER_NAME, configure_logging
+from benchmarks.cases import CASES, MF_TYPES
+
+# Machines log every MF switch; keep the package quiet and report through a
+# child logger that still uses the package handler.
+configure_logging(logging.WARNING)
+logger = logging.getLogger(f'{LOGGER_NAME}.benchmarks')
+logger.setLevel(logging.INFO)
+
+SCHEMA_VERSION = 1
+DEFAULT_THRESHOLD = 0.2
+# (rounds, minimum seconds per round) for full and quick runs.
+FULL_ROUNDS = (7, 0.2)
+QUICK_ROUNDS = (3, 0.02)
+
+
+def measure(func, rounds: int, min_round_time: float) -> Dict[str, float]:
+    """Per-call timings: each round repeats ``func`` until ``min_round_time`` elapses."""
+    start = time.perf_counter()
+    func()
+    single = time.perf_counter() - start
+    number = max(1, int(min_round_time / max(single, 1e-9)))
+
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        samples.append((time.perf_counter() - start) / number)
+    return {
+        'min': min(samples),
+        'median': statistics.median(samples),
+        'mean': statistics.fmean(samples),
+        'stdev': statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        'rounds': rounds,
+        'calls_per_round': number,
+    }
+
+
+def run_suite(cases: Iterable[str], mf_types: Iterable[str], quick: bool = False) -> dict:
+    rounds, min_round_time = QUICK_ROUNDS if quick else FULL_ROUNDS
+    results = {}
+    for case in cases:
+        for mf_type in mf_types:
+            name = f'{case}[{mf_type}]'
+            func, rows = CASES[case](mf_type)
+            stats = measure(func, rounds, min_round_time)
+            if rows:
+                stats['rows'] = rows
+                stats['rows_per_second'] = rows / stats['median']
+            results[name] = stats
+            logger.info("%-40s median %10.3f ms", name, stats['median'] * 1e3)
+    return {'meta': _metadata(quick), 'results': results}
+
+
+def compare(current: dict, baseline: dict, threshold: float = DEFAULT_THRESHOLD) -> List[dict]:
+    """Cases present in both runs whose median grew by more than ``threshold``."""
+    regressions = []
+    for name, stats in current['results'].items():
+        reference = baseline.get('results', {}).get(name)
+        if reference is None:
+            continue
+        ratio = stats['median'] / reference['median']
+        if ratio > 1.0 + threshold:
+            regressions.append({
+                'case': name,
+                'baseline': reference['median'],
+                'current': stats['median'],
+                'ratio': ratio,
+            })
+    return regressions
+
+
+def _metadata(quick: bool) -> dict:
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'schema': SCHEMA_VERSION,
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'commit': commit,
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'backend': fis_config.DEFAULT_BACKEND,
+        'quick': quick,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--output', default=os.path.join('benchmarks', 'results', 'latest.json'))
+    parser.add_argument('--baseline', help='earlier results JSON to compare against')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument('--cases', nargs='+', choices=sorted(CASES), default=list(CASES))
+    parser.add_argument('--mf-types', nargs='+', choices=MF_TYPES, default=list(MF_TYPES))
+    parser.add_argument('--quick', action='store_true', help='fewer, shorter rounds')
+    args = parser.parse_args(argv)
+
+    warnings.filterwarnings('ignore')
+    # A private artifact cache keeps runs independent of whatever the user
+    # has cached and of each other.
+    user_cache_dir = fis_config.FIS_CACHE_DIR
+    with tempfile.TemporaryDirectory(prefix='fis-bench-') as cache_dir:
+        fis_config.FIS_CACHE_DIR = cache_dir
+        try:
+            report = run_suite(args.cases, args.mf_types, args.quick)
+        finally:
+            fis_config.FIS_CACHE_DIR = user_cache_dir
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, 'w', encoding='utf-8') as handle:
+        json.dump(report, handle, indent=2)
+    logger.info("Results written to %s", args.output)
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as handle:
+            regressions = compare(report, json.load(handle), args.threshold)
+        for item in regressions:
+            logger.warning("Regression in %s: %.3f ms -> %.3f ms (x%.2f)",
+                           item['case'], item['baseline'] * 1e3, item['current'] * 1e3, item['ratio'])
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,3 +1,4 @@
+import os
 from dataclasses import dataclass
 from typing import Tuple, Dict
 
@@ -20,6 +21,20 @@ class TermDefinition:
     params: Tuple[float, ...]
 
 
+@dataclass(frozen=True)
+class RuleDefinition:
+    """IF every (variable, term) antecedent THEN every (variable, term) consequent."""
+    antecedents: Tuple[Tuple[str, str], ...]
+    consequents: Tuple[Tuple[str, str], ...]
+
+
+def _rule(*antecedents: str, opor: str, feedback: str) -> RuleDefinition:
+    return RuleDefinition(
+        tuple(tuple(item.split('.')) for item in antecedents),
+        (('opor', opor), ('feedback', feedback)),
+    )
+
+
 @dataclass(frozen=True)
 class VariableMetadata:
     label: str
@@ -55,6 +70,47 @@ MF_TYPE_OPTIONS = (
 MF_TYPE_LABELS = {value: label for label, value in MF_TYPE_OPTIONS}
 DEFAULT_MF_TYPE = 'triangular'
 
+# Inference backends: 'skfuzzy' runs ControlSystemSimulation per sample,
+# 'compiled' evaluates the same rule base with the NumPy engine, 'sparse' is
+# the compiled engine restricted to rules that can fire for each sample and
+# 'lut' interpolates a table sampled from the compiled engine.
+FIS_BACKENDS = ('skfuzzy', 'compiled', 'sparse', 'lut')
+DEFAULT_BACKEND = 'compiled'
+
+# Centroid defuzzification: 'sampled' integrates over the output universe
+# like skfuzzy, 'analytic' integrates the clipped piecewise-linear terms
+# exactly from their breakpoints (compiled backends only).
+DEFUZZIFIERS = ('sampled', 'analytic')
+DEFAULT_DEFUZZIFIER = 'sampled'
+
+# LUT nodes per input, ordered as INPUT_ORDER.
+LUT_GRID_SHAPE = (21, 16, 21, 21, 5)
+
+# Points per axis of the GUI inference surface (FISService.compute_surface).
+SURFACE_RESOLUTION = 101
+
+# Directory of cached compiled engines/LUTs; set the environment variable to
+# an empty string to disable caching.
+FIS_CACHE_DIR = os.environ.get(
+    'INTELLIGENT_GYM_CACHE_DIR',
+    os.path.join(os.path.expanduser('~'), '.cache', 'intelligent_gym'),
+)
+
+# Default tick rate of the streaming controller (src/services/controller.py).
+CONTROL_RATE_HZ = 500.0
+
+INPUT_ORDER = ('sila', 'predkosc', 'faza', 'zmeczenie', 'tryb')
+OUTPUT_ORDER = ('opor', 'feedback')
+
+# Feedback code i covers FEEDBACK_THRESHOLDS[i-1] <= value < FEEDBACK_THRESHOLDS[i].
+FEEDBACK_LABELS = ('ZWOLNIJ', 'DOBRZE', 'IDEALNIE', 'MOCNIEJ', 'STOP')
+FEEDBACK_THRESHOLDS = (1.5, 2.5, 3.5, 4.5)
+
+# Command issued when no rule fires for the inputs.
+FALLBACK_RESISTANCE = 50.0
+FALLBACK_FEEDBACK = 3.0
+FALLBACK_FEEDBACK_LABEL = 'DOBRZE'
+
 VARIABLE_UNIVERSES = {
     'sila': (0, 500, 1),
     'predkosc': (0.0, 1.5, 0.01),
@@ -115,6 +171,81 @@ TERM_DEFINITIONS = {
     ),
 }
 
+# Variable names used by the skfuzzy control system.
+CONTROL_LABELS = {
+    'sila': 'sila_generowana',
+    'predkosc': 'predkosc_ruchu',
+    'faza': 'faza_ruchu',
+    'zmeczenie': 'wskaznik_zmeczenia',
+    'tryb': 'tryb_treningu',
+    'opor': 'opor_maszyny',
+    'feedback': 'sygnal_feedback',
+}
+
+# Rule base of IntelligentGymMachine (TERM_DEFINITIONS terms).
+RULES = (
+    _rule('faza.poczatkowa', 'sila.srednia', opor='niski', feedback='dobrze'),
+    _rule('faza.dolna', 'sila.srednia', opor='sredni', feedback='dobrze'),
+    _rule('faza.srodkowa', 'sila.niska', opor='niski', feedback='mocniej'),
+    _rule('faza.srodkowa', 'sila.srednia', opor='sredni', feedback='idealnie'),
+    _rule('faza.gorna', 'sila.wysoka', opor='wysoki', feedback='idealnie'),
+    _rule('faza.koncowa', 'sila.bardzo_wysoka', opor='maksymalny', feedback='idealnie'),
+
+    _rule('predkosc.bardzo_szybka', 'zmeczenie.swiezy', opor='wysoki', feedback='zwolnij'),
+    _rule('predkosc.szybka', 'tryb.silowy', opor='wysoki', feedback='dobrze'),
+    _rule('predkosc.umiarkowana', 'tryb.hipertrofia', opor='sredni', feedback='idealnie'),
+    _rule('predkosc.wolna', 'zmeczenie.lekkie', opor='sredni', feedback='dobrze'),
+    _rule('predkosc.bardzo_wolna', 'zmeczenie.wysokie', opor='niski', feedback='stop'),
+
+    _rule('zmeczenie.swiezy', 'sila.bardzo_wysoka', opor='maksymalny', feedback='idealnie'),
+    _rule('zmeczenie.lekkie', 'sila.srednia', opor='sredni', feedback='dobrze'),
+    _rule('zmeczenie.umiarkowane', 'sila.srednia', opor='niski', feedback='dobrze'),
+    _rule('zmeczenie.wysokie', 'sila.niska', opor='minimalny', feedback='stop'),
+    _rule('zmeczenie.wyczerpanie', opor='minimalny', feedback='stop'),
+
+    _rule('tryb.silowy', 'sila.bardzo_wysoka', 'zmeczenie.swiezy', opor='maksymalny', feedback='idealnie'),
+    _rule('tryb.silowy', 'sila.srednia', 'faza.gorna', opor='wysoki', feedback='mocniej'),
+    _rule('tryb.hipertrofia', 'predkosc.umiarkowana', 'zmeczenie.lekkie', opor='sredni', feedback='idealnie'),
+    _rule('tryb.hipertrofia', 'zmeczenie.umiarkowane', opor='niski', feedback='mocniej'),
+    _rule('tryb.wytrzymalosc', 'predkosc.szybka', opor='niski', feedback='idealnie'),
+    _rule('tryb.wytrzymalosc', 'zmeczenie.umiarkowane', opor='niski', feedback='dobrze'),
+
+    _rule('sila.bardzo_niska', 'faza.poczatkowa', opor='minimalny', feedback='mocniej'),
+    _rule('sila.bardzo_niska', 'zmeczenie.wysokie', opor='minimalny', feedback='stop'),
+    _rule('sila.bardzo_wysoka', 'zmeczenie.wyczerpanie', opor='niski', feedback='stop'),
+
+    _rule('faza.poczatkowa', 'predkosc.bardzo_wolna', 'sila.niska', opor='minimalny', feedback='mocniej'),
+    _rule('faza.srodkowa', 'predkosc.umiarkowana', 'sila.srednia', opor='sredni', feedback='idealnie'),
+    _rule('faza.koncowa', 'predkosc.szybka', 'sila.wysoka', opor='maksymalny', feedback='idealnie'),
+    _rule('faza.gorna', 'tryb.silowy', 'sila.wysoka', opor='wysoki', feedback='idealnie'),
+    _rule('faza.dolna', 'predkosc.wolna', 'tryb.hipertrofia', opor='sredni', feedback='idealnie'),
+)
+
+# Simplified rule base of IntelligentGymMachineExperimental (MF_CENTER_POINTS terms).
+EXPERIMENTAL_RULES = (
+    _rule('faza.poczatkowa', 'sila.srednia', opor='niski', feedback='dobrze'),
+    _rule('faza.dolna', 'sila.srednia', opor='sredni', feedback='dobrze'),
+    _rule('faza.srodkowa', 'sila.niska', opor='niski', feedback='mocniej'),
+    _rule('faza.srodkowa', 'sila.srednia', opor='sredni', feedback='idealnie'),
+    _rule('faza.gorna', 'sila.wysoka', opor='wysoki', feedback='idealnie'),
+    _rule('faza.koncowa', 'sila.bardzo_wysoka', opor='maksymalny', feedback='idealnie'),
+
+    _rule('predkosc.bardzo_szybka', 'zmeczenie.swiezy', opor='wysoki', feedback='zwolnij'),
+    _rule('predkosc.bardzo_wolna', 'zmeczenie.swiezy', opor='niski', feedback='mocniej'),
+
+    _rule('zmeczenie.wyczerpanie', opor='minimalny', feedback='stop'),
+    _rule('zmeczenie.wysokie', 'sila.niska', opor='niski', feedback='mocniej'),
+    _rule('zmeczenie.umiarkowane', 'tryb.hipertrofia', opor='sredni', feedback='idealnie'),
+
+    _rule('tryb.silowy', 'sila.bardzo_wysoka', opor='maksymalny', feedback='idealnie'),
+    _rule('tryb.wytrzymalosc', opor='niski', feedback='dobrze'),
+
+    _rule('sila.srednia', 'predkosc.umiarkowana', 'zmeczenie.lekkie', opor='sredni', feedback='idealnie'),
+)
+
+# MF shapes IntelligentGymMachineExperimental generates from MF_CENTER_POINTS.
+MF_FUNCTION_TYPES = ('triangular', 'gaussian', 'gbell', 'sigmoid')
+
 MF_CENTER_POINTS = {
     'sila': (50, 125, 250, 375, 450),
     'predkosc': (0.1, 0.35, 0.7, 1.1, 1.4),
@@ -0,0 +1,105 @@
+"""Run the batched FIS server or load-test it.
+
+    python fis_server.py serve --port 8765
+    python fis_server.py loadtest --clients 32 --requests 200
+    python fis_server.py loadtest --port 8765     # against a running server
+"""
+import argparse
+import asyncio
+import time
+
+import numpy as np
+
+from config.logging_config import configure_logging
+from src.analysis.sweep import random_inputs
+from src.services.fis_service import FISService
+from src.services.server import DEFAULT_MAX_BATCH, DEFAULT_WINDOW, FISClient, FISServer
+
+logger = configure_logging()
+
+
+async def run_load(connect, clients: int, requests: int, seed: int = 0) -> dict:
+    """Each client sends ``requests`` back-to-back requests; returns latency stats."""
+    rng = np.random.default_rng(seed)
+    latencies = np.empty((clients, requests))
+
+    async def client_loop(index):
+        client = await connect()
+        try:
+            for row_idx, row in enumerate(random_inputs(requests, rng)):
+                start = time.perf_counter()
+                response = await client.compute(row)
+                latencies[index, row_idx] = time.perf_counter() - start
+                if 'error' in response:
+                    raise RuntimeError(response['error'])
+        finally:
+            await client.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client_loop(index) for index in range(clients)))
+    elapsed = time.perf_counter() - start
+    return {
+        'requests': latencies.size,
+        'seconds': elapsed,
+        'throughput': latencies.size / elapsed,
+        'p50_ms': float(np.percentile(latencies, 50) * 1e3),
+        'p99_ms': float(np.percentile(latencies, 99) * 1e3),
+    }
+
+
+async def serve(args):
+    async with FISServer(FISService(args.mf_type), args.window, args.max_batch) as server:
+        if args.unix:
+            await server.start_unix(args.unix)
+        else:
+            await server.start_tcp(args.host, args.port)
+        await asyncio.Event().wait()
+
+
+async def loadtest(args):
+    server = None
+    if args.port is None and args.unix is None:
+        server = FISServer(FISService(args.mf_type), args.window, args.max_batch)
+        args.host, args.port = await server.start_tcp(args.host, 0)
+
+    if args.unix:
+        connect = lambda: FISClient.connect_unix(args.unix)
+    else:
+        connect = lambda: FISClient.connect_tcp(args.host, args.port)
+    try:
+        report = await run_load(connect, args.clients, args.requests)
+    finally:
+        if server is not None:
+            await server.close()
+
+    logger.info("%d requests from %d clients in %.2f s: %.0f req/s, p50 %.2f ms, p99 %.2f ms",
+                report['requests'], args.clients, report['seconds'], report['throughput'],
+                report['p50_ms'], report['p99_ms'])
+    if server is not None:
+        logger.info("Server ran %d batches, mean batch size %.1f",
+                    server.stats.batches, server.stats.mean_batch_size)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('command', choices=('serve', 'loadtest'))
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int)
+    parser.add_argument('--unix', help='Unix socket path instead of TCP')
+    parser.add_argument('--mf-type', default='triangular')
+    parser.add_argument('--window', type=float, default=DEFAULT_WINDOW, help='coalescing window in seconds')
+    parser.add_argument('--max-batch', type=int, default=DEFAULT_MAX_BATCH)
+    parser.add_argument('--clients', type=int, default=32)
+    parser.add_argument('--requests', type=int, default=200, help='requests per client')
+    args = parser.parse_args()
+
+    if args.command == 'serve':
+        if args.port is None and args.unix is None:
+            args.port = 8765
+        asyncio.run(serve(args))
+    else:
+        asyncio.run(loadtest(args))
+
+
+if __name__ == '__main__':
+    main()
@@ -9,7 +9,9 @@ from scipy.ndimage import gaussian_filter
 
 from src.core.fis_engine import IntelligentGymMachine
 from src.core.experimental import IntelligentGymMachineExperimental
-from src.visualization.plots import plot_membership_functions, plot_surface_3d, simulate_exercise
+from src.analysis.simulation import simulate_session
+from src.analysis.sweep import ParallelSweep
+from src.visualization.plots import plot_membership_functions, plot_surface_3d, compute_surface, simulate_exercise
 
 
 def plot_membership_exp(machine, save_path, output_dir):
@@ -114,7 +116,7 @@ def plot_membership_exp(machine, save_path, output_dir):
 
 
 def plot_surface_exp(machine, var1_name, var2_name, var1_range, var2_range,
-                     fixed_values, save_path, output_dir):
+                     fixed_values, save_path, output_dir, sweep=None):
     var1_start, var1_end, var1_step = var1_range
     var2_start, var2_end, var2_step = var2_range
     var1_step_fine = var1_step / 2
@@ -123,28 +125,11 @@ def plot_surface_exp(machine, var1_name, var2_name, var1_range, var2_range,
     var1_vals = np.arange(var1_start, var1_end, var1_step_fine)
     var2_vals = np.arange(var2_start, var2_end, var2_step_fine)
 
-    X, Y = np.meshgrid(var1_vals, var2_vals)
-    Z_opor = np.zeros_like(X, dtype=float)
-    Z_feedback = np.zeros_like(X, dtype=float)
-
-    for i in range(len(var2_vals)):
-        for j in range(len(var1_vals)):
-            try:
-                inputs = dict(fixed_values)
-                inputs[var1_name] = var1_vals[j]
-                inputs[var2_name] = var2_vals[i]
-
-                machine.simulator.input['sila_generowana'] = inputs.get('sila', 250)
-                machine.simulator.input['predkosc_ruchu'] = inputs.get('predkosc', 0.6)
-                machine.simulator.input['faza_ruchu'] = inputs.get('faza', 50)
-                machine.simulator.input['wskaznik_zmeczenia'] = inputs.get('zmeczenie', 30)
-                machine.simulator.input['tryb_treningu'] = inputs.get('tryb', 2)
-                machine.simulator.compute()
-                Z_opor[i, j] = machine.simulator.output['opor_maszyny']
-                Z_feedback[i, j] = machine.simulator.output['sygnal_feedback']
-            except Exception:
-                Z_opor[i, j] = np.nan
-                Z_feedback[i, j] = np.nan
+    inputs = {'sila': 250, 'predkosc': 0.6, 'faza': 50, 'zmeczenie': 30, 'tryb': 2}
+    inputs.update(fixed_values)
+    X, Y, Z_opor, Z_feedback = compute_surface(
+        machine, var1_name, var2_name, var1_vals, var2_vals, inputs, sweep=sweep
+    )
 
     Z_opor = np.nan_to_num(Z_opor, nan=np.nanmean(Z_opor))
     Z_feedback = np.nan_to_num(Z_feedback, nan=np.nanmean(Z_feedback))
@@ -182,41 +167,7 @@ def plot_surface_exp(machine, var1_name, var2_name, var1_range, var2_range,
 def simulate_exercise_exp(machine, tryb, serie, powtorzenia, save_path, output_dir):
     tryb_nazwa = {1: 'Silowy', 2: 'Hipertrofia', 3: 'Wytrzymalosc'}
 
-    results = {
-        'time': [], 'seria': [], 'powtorzenie': [], 'faza': [],
-        'sila': [], 'predkosc': [], 'zmeczenie': [], 'opor': [], 'feedback': []
-    }
-
-    t = 0
-    base_sila = 300 if tryb == 1 else (250 if tryb == 2 else 200)
-    base_predkosc = 0.5 if tryb == 1 else (0.7 if tryb == 2 else 1.0)
-
-    for s in range(1, serie + 1):
-        zmeczenie_base = (s - 1) * 25
-
-        for p in range(1, powtorzenia + 1):
-            zmeczenie = min(100, zmeczenie_base + (p - 1) * 3)
-
-            for faza in np.linspace(0, 100, 20):
-                sila_mod = np.sin(np.pi * faza / 100) * 0.5 + 0.5
-                sila = base_sila * sila_mod * (1 - zmeczenie / 200)
-
-                predkosc = base_predkosc * (1 - zmeczenie / 300) * (1 - abs(faza - 50) / 150)
-                predkosc = max(0.05, min(1.45, predkosc))
-
-                result = machine.compute(sila, predkosc, faza, zmeczenie, tryb)
-
-                results['time'].append(t)
-                results['seria'].append(s)
-                results['powtorzenie'].append(p)
-                results['faza'].append(faza)
-                results['sila'].append(sila)
-                results['predkosc'].append(predkosc)
-                results['zmeczenie'].append(zmeczenie)
-                results['opor'].append(result['opor'])
-                results['feedback'].append(result['feedback'])
-
-                t += 0.05
+    results = simulate_session(machine, tryb, serie, powtorzenia)
 
     fig, axes = plt.subplots(4, 1, figsize=(14, 12), sharex=True)
     time = np.array(results['time'])
@@ -285,7 +236,7 @@ def simulate_exercise_exp(machine, tryb, serie, powtorzenia, save_path, output_d
     print(f'Zapisano wykres: {full_path}')
 
 
-if __name__ == '__main__':
+def main(sweep):
     os.makedirs('output_trojkat', exist_ok=True)
     os.makedirs('output_gauss', exist_ok=True)
 
@@ -306,7 +257,8 @@ if __name__ == '__main__':
         {'predkosc': 0.6, 'zmeczenie': 30, 'tryb': 2},
         save_path='surface_sila_faza.png',
         output_dir='output_trojkat',
-        smooth=True
+        smooth=True,
+        sweep=sweep
     )
 
     plot_surface_3d(
@@ -316,7 +268,8 @@ if __name__ == '__main__':
         {'sila': 250, 'faza': 50, 'tryb': 2},
         save_path='surface_zmeczenie_predkosc.png',
         output_dir='output_trojkat',
-        smooth=True
+        smooth=True,
+        sweep=sweep
     )
 
     print('Wykresy trojkatne zapisane w output_trojkat/')
@@ -343,7 +296,8 @@ if __name__ == '__main__':
         (50, 450, 10), (0, 100, 2),
         {'predkosc': 0.6, 'zmeczenie': 30, 'tryb': 2},
         'surface_sila_faza.png',
-        'output_gauss'
+        'output_gauss',
+        sweep=sweep
     )
 
     plot_surface_exp(
@@ -352,7 +306,8 @@ if __name__ == '__main__':
         (0, 100, 2), (0.1, 1.4, 0.05),
         {'sila': 250, 'faza': 50, 'tryb': 2},
         'surface_zmeczenie_predkosc.png',
-        'output_gauss'
+        'output_gauss',
+        sweep=sweep
     )
 
     print('Wykresy gaussowskie zapisane w output_gauss/')
@@ -370,3 +325,8 @@ if __name__ == '__main__':
     print('  output_trojkat/ - funkcje trojkatne/trapezoidalne')
     print('  output_gauss/   - funkcje gaussowskie')
     print('=' * 70)
+
+
+if __name__ == '__main__':
+    with ParallelSweep() as sweep:
+        main(sweep)
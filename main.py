@@ -3,13 +3,7 @@ import warnings
 
 from config.logging_config import configure_logging
 from src.core.fis_engine import IntelligentGymMachine
-from src.visualization.plots import (
-    plot_membership_functions,
-    plot_surface_3d,
-    simulate_exercise
-)
-from src.analysis.scenarios import run_scenarios_with_analysis
-from src.analysis.experiments import run_experiments
+from src.analysis.sweep import ParallelSweep
 
 
 warnings.filterwarnings('ignore')
@@ -21,8 +15,13 @@ def ensure_output_dir():
     os.makedirs('output', exist_ok=True)
 
 
-def main():
+def main(sweep=None):
     """Glowna funkcja programu."""
+    # Plotting pulls in matplotlib and scipy; sweep workers that re-import
+    # this module never need them.
+    from src.visualization.plots import plot_membership_functions, plot_surface_3d, simulate_exercise
+    from src.analysis.scenarios import run_scenarios_with_analysis
+    from src.analysis.experiments import run_experiments
 
     logger.info("%s", "=" * 70)
     logger.info("INTELIGENTNY SYSTEM STEROWANIA MASZYNA TRENINGOWA")
@@ -36,7 +35,7 @@ def main():
     logger.info("System zainicjalizowany pomyslnie!")
     logger.info("  * Liczba zmiennych wejsciowych: %s", 5)
     logger.info("  * Liczba zmiennych wyjsciowych: %s", 2)
-    logger.info("  * Liczba regul: %s", len(machine.rules))
+    logger.info("  * Liczba regul: %s", machine.rule_count)
 
     logger.info("[1/5] Generowanie wykresow funkcji przynaleznosci...")
     plot_membership_functions(machine, save_path='membership_functions.png', output_dir='output')
@@ -51,7 +50,8 @@ def main():
         (50, 450, 10), (0, 100, 2),
         {'predkosc': 0.6, 'zmeczenie': 30, 'tryb': 2},
         save_path='surface_sila_faza.png',
-        output_dir='output'
+        output_dir='output',
+        sweep=sweep
     )
 
     plot_surface_3d(
@@ -60,7 +60,8 @@ def main():
         (0, 100, 2), (0.1, 1.4, 0.05),
         {'sila': 250, 'faza': 50, 'tryb': 2},
         save_path='surface_zmeczenie_predkosc.png',
-        output_dir='output'
+        output_dir='output',
+        sweep=sweep
     )
 
     logger.info("[4/5] Symulacja pelnego cwiczenia...")
@@ -71,7 +72,7 @@ def main():
                      save_path='simulation_silowy.png', output_dir='output')
 
     logger.info("[5/5] Eksperymenty z roznymi typami funkcji przynaleznosci...")
-    run_experiments(output_dir='output')
+    run_experiments(output_dir='output', sweep=sweep)
 
     logger.info("%s", "=" * 70)
     logger.info("TABELE FUNKCJI PRZYNALEZNOSCI:")
@@ -80,4 +81,5 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    with ParallelSweep() as sweep:
+        main(sweep)
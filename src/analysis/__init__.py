@@ -1,10 +1,24 @@
-from .scenarios import run_scenarios_with_analysis, check_scenario_validity
-from .experiments import compare_membership_functions, compare_inference_results, run_experiments
-
-__all__ = [
-    'run_scenarios_with_analysis',
-    'check_scenario_validity',
-    'compare_membership_functions',
-    'compare_inference_results',
-    'run_experiments'
-]
+from importlib import import_module
+
+# Submodules are imported on first attribute access: experiments pulls in
+# matplotlib, which sweep workers and headless callers should not pay for.
+_EXPORTS = {
+    'run_scenarios_with_analysis': 'scenarios',
+    'check_scenario_validity': 'scenarios',
+    'compare_membership_functions': 'experiments',
+    'compare_inference_results': 'experiments',
+    'run_experiments': 'experiments',
+    'simulate_session': 'simulation',
+    'simulate_population': 'simulation',
+    'PopulationConfig': 'simulation',
+    'simulate_closed_loop': 'closed_loop',
+    'PlantConfig': 'closed_loop',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(import_module(f'.{_EXPORTS[name]}', __name__), name)
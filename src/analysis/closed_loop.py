@@ -0,0 +1,178 @@
+"""Closed-loop simulation: the FIS resistance drives a fatigue plant stepped in lockstep.
+
+Each user is a small state machine (fatigue, phase of the current
+repetition, set and repetition counters). Every step the plant turns the
+resistance chosen on the previous step into a load, the user's force
+capacity and effort profile into a speed, and power into fatigue; the FIS
+then sees the resulting force, speed, phase and fatigue and picks the next
+resistance. All users advance together, so one step is one batched
+inference call over the users still exercising.
+"""
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+
+from .simulation import MODE_BASE_FORCE, MODE_BASE_SPEED
+
+TRACES = ('time', 'resistance', 'feedback', 'sila', 'predkosc', 'faza', 'zmeczenie')
+# Initial trace rows; traces double (capped at max_steps) when full, so the
+# history is copied O(log steps) times instead of once per block.
+TRACE_BLOCK_STEPS = 1024
+
+
+@dataclass(frozen=True)
+class PlantConfig:
+    """Population and plant parameters; the ``*_sd`` are log-normal sigmas.
+
+    A user's force capacity is the mode's nominal force, lowered linearly by
+    fatigue (``capacity_drop`` at 100 %). Resistance R maps to a load of
+    R % of the fresh capacity and the speed follows a linear force-velocity
+    relation, ``v = v_max * (1 - load / force)``, with ``v_max`` twice the
+    mode's nominal speed. Fatigue grows with relative power at
+    ``fatigue_gain`` % per second and recovers exponentially during the rest
+    between sets, which is applied in one step.
+    """
+    users: int = 1000
+    modes: Sequence[int] = (1, 2, 3)
+    serie: int = 3
+    powtorzenia: int = 10
+    dt: float = 0.05
+    range_of_motion: float = 0.5
+    min_speed: float = 0.05
+    initial_resistance: float = 50.0
+    capacity_drop: float = 0.6
+    fatigue_gain: float = 6.0
+    recovery_rate: float = 0.01
+    rest_seconds: float = 60.0
+    strength_sd: float = 0.15
+    speed_sd: float = 0.1
+    max_steps: int = 20000
+    seed: Optional[int] = 0
+
+
+@dataclass(frozen=True, eq=False)
+class ClosedLoopRun:
+    """Per-step traces, each (steps, users) float32 with NaN once a user has finished."""
+    config: PlantConfig
+    traces: Dict[str, np.ndarray]
+    modes: np.ndarray
+    completed: np.ndarray
+    inference_seconds: float
+
+    @property
+    def steps(self) -> int:
+        return len(self.traces['time'])
+
+    def metrics(self, tolerance: float = 0.5) -> Dict[str, np.ndarray]:
+        """Per-user stability figures.
+
+        ``reversal_rate`` counts direction changes of the resistance (steps
+        smaller than ``tolerance`` % are ignored) per second of exercise and
+        ``resistance_variation`` is its total variation per second; both are
+        near zero for a well-damped controller and grow with oscillation.
+        """
+        resistance = self.traces['resistance']
+        active = ~np.isnan(resistance)
+        seconds = active.sum(axis=0) * self.config.dt
+        delta = np.diff(resistance, axis=0)
+        delta = np.where(np.abs(delta) >= tolerance, delta, 0.0)
+        delta = np.nan_to_num(delta)
+        direction = np.sign(delta)
+        # Carry the last non-zero direction forward so plateaus do not hide reversals.
+        last_move = np.where(direction != 0, np.arange(len(direction))[:, None], 0)
+        np.maximum.accumulate(last_move, axis=0, out=last_move)
+        carried = np.take_along_axis(direction, last_move, axis=0)
+        reversals = np.count_nonzero(carried[1:] * carried[:-1] < 0, axis=0)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return {
+                'reversal_rate': reversals / seconds,
+                'resistance_variation': np.abs(delta).sum(axis=0) / seconds,
+                'mean_resistance': np.nanmean(resistance, axis=0),
+                'peak_fatigue': np.nanmax(self.traces['zmeczenie'], axis=0),
+                'session_seconds': np.nanmax(self.traces['time'], axis=0),
+                'completed': self.completed,
+            }
+
+
+def simulate_closed_loop(machine, config: PlantConfig = PlantConfig()) -> ClosedLoopRun:
+    """Step every user's plant and the FIS together until all finish or ``max_steps``."""
+    rng = np.random.default_rng(config.seed)
+    users = config.users
+    modes = rng.choice(np.asarray(config.modes), size=users)
+    fresh_force = MODE_BASE_FORCE[modes] * rng.lognormal(0.0, config.strength_sd, users)
+    v_max = 2.0 * MODE_BASE_SPEED[modes] * rng.lognormal(0.0, config.speed_sd, users)
+
+    clock = np.zeros(users)
+    fatigue = np.zeros(users)
+    phase = np.zeros(users)
+    rep = np.zeros(users, dtype=np.int64)
+    seria = np.zeros(users, dtype=np.int64)
+    resistance = np.full(users, config.initial_resistance)
+    active = np.ones(users, dtype=bool)
+    inputs = np.empty((users, 5))
+    inputs[:, 4] = modes
+
+    traces = {name: np.empty((0, users), dtype=np.float32) for name in TRACES}
+    rest_recovery = np.exp(-config.recovery_rate * config.rest_seconds)
+    inference_seconds = 0.0
+    steps = 0
+    while steps < config.max_steps and active.any():
+        # Plant: load from the last resistance, speed from force-velocity.
+        capacity = fresh_force * (1 - config.capacity_drop * fatigue / 100)
+        effort = np.sin(np.pi * phase / 100) * 0.5 + 0.5
+        force = capacity * effort
+        load = resistance / 100 * fresh_force
+        speed = np.clip(v_max * (1 - load / force), config.min_speed, None)
+        power = load * speed / (fresh_force * MODE_BASE_SPEED[modes])
+        fatigue = np.minimum(100, fatigue + config.fatigue_gain * power * config.dt)
+
+        inputs[:, 0] = force
+        inputs[:, 1] = np.minimum(speed, 1.5)
+        inputs[:, 2] = phase
+        inputs[:, 3] = fatigue
+        if steps == len(traces['time']):
+            capacity = min(max(2 * steps, TRACE_BLOCK_STEPS), config.max_steps)
+            traces = {name: _grow(values, capacity) for name, values in traces.items()}
+
+        start = time.perf_counter()
+        raw = machine.compute_batch(inputs[active])
+        inference_seconds += time.perf_counter() - start
+        resistance[active] = raw['opor']
+
+        for name, values in (('time', clock), ('sila', force), ('predkosc', inputs[:, 1]),
+                             ('faza', phase), ('zmeczenie', fatigue), ('resistance', resistance)):
+            traces[name][steps, active] = values[active]
+        traces['feedback'][steps, active] = raw['feedback']
+        steps += 1
+
+        # Advance the movement; a completed repetition may finish the set.
+        clock[active] += config.dt
+        phase[active] += speed[active] * config.dt / config.range_of_motion * 100
+        done_rep = active & (phase >= 100)
+        phase[done_rep] = 0
+        rep[done_rep] += 1
+        done_set = done_rep & (rep == config.powtorzenia)
+        rep[done_set] = 0
+        seria[done_set] += 1
+        finished = done_set & (seria == config.serie)
+        active &= ~finished
+        rests = done_set & ~finished
+        fatigue[rests] *= rest_recovery
+        clock[rests] += config.rest_seconds
+        resistance[rests] = config.initial_resistance
+
+    return ClosedLoopRun(
+        config=config,
+        traces={name: values[:steps] for name, values in traces.items()},
+        modes=modes,
+        completed=~active,
+        inference_seconds=inference_seconds,
+    )
+
+
+def _grow(values: np.ndarray, capacity: int) -> np.ndarray:
+    grown = np.full((capacity, values.shape[1]), np.nan, dtype=values.dtype)
+    grown[:len(values)] = values
+    return grown
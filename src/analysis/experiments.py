@@ -3,7 +3,9 @@ import matplotlib
 matplotlib.use('Agg')
 import matplotlib.pyplot as plt
 
+from config import fis_config
 from ..core.experimental import IntelligentGymMachineExperimental
+from .sweep import MachineSpec, ParallelSweep
 
 
 def compare_membership_functions(output_dir='output'):
@@ -56,7 +58,7 @@ def compare_membership_functions(output_dir='output'):
     print(f"\nZapisano: {save_path}")
 
 
-def compare_inference_results(output_dir='output'):
+def compare_inference_results(output_dir='output', sweep=None):
     print("\n" + "=" * 70)
     print("  EKSPERYMENT: POROWNANIE WYNIKOW WNIOSKOWANIA")
     print("=" * 70)
@@ -77,10 +79,14 @@ def compare_inference_results(output_dir='output'):
         'sigmoid': 'Sigmoidalne'
     }
 
+    runner = sweep if sweep is not None else ParallelSweep(workers=1)
+    scenario_inputs = np.array(
+        [[scenario[name] for name in fis_config.INPUT_ORDER] for scenario in scenarios], dtype=float
+    )
     systems = {}
     for mf_type in mf_types:
         try:
-            systems[mf_type] = IntelligentGymMachineExperimental(mf_type=mf_type)
+            systems[mf_type] = runner.evaluate(MachineSpec(mf_type), scenario_inputs)['opor']
         except Exception as e:
             print(f"  [!] Blad tworzenia systemu {mf_type}: {e}")
 
@@ -93,22 +99,14 @@ def compare_inference_results(output_dir='output'):
 
     results_data = {mf: [] for mf in mf_types}
 
-    for scenario in scenarios:
+    for idx, scenario in enumerate(scenarios):
         row = f"{scenario['nazwa']:<20}"
 
         for mf_type in mf_types:
             if mf_type in systems:
-                try:
-                    result = systems[mf_type].compute(
-                        scenario['sila'], scenario['predkosc'],
-                        scenario['faza'], scenario['zmeczenie'], scenario['tryb']
-                    )
-                    opor = result['opor']
-                    results_data[mf_type].append(opor)
-                    row += f" | Opor: {opor:5.1f}%     "
-                except Exception:
-                    row += f" | Blad            "
-                    results_data[mf_type].append(None)
+                opor = systems[mf_type][idx]
+                results_data[mf_type].append(opor)
+                row += f" | Opor: {opor:5.1f}%     "
             else:
                 row += f" | N/A              "
                 results_data[mf_type].append(None)
@@ -163,14 +161,14 @@ def compare_inference_results(output_dir='output'):
 
 
 
-def run_experiments(output_dir='output'):
+def run_experiments(output_dir='output', sweep=None):
     print("\n" + "=" * 70)
     print("  EKSPERYMENTY Z FUNKCJAMI PRZYNALEZNOSCI")
     print("  (trojkatne, gaussowskie, generalized bell, sigmoidalne)")
     print("=" * 70)
 
     compare_membership_functions(output_dir)
-    compare_inference_results(output_dir)
+    compare_inference_results(output_dir, sweep=sweep)
 
     print("\n" + "=" * 70)
     print("  EKSPERYMENTY ZAKONCZONE")
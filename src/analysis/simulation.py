@@ -0,0 +1,189 @@
+"""Exercise simulation: synthetic populations evaluated in batches of users."""
+import time
+from dataclasses import dataclass
+from typing import Optional, Sequence
+
+import numpy as np
+
+from ..services.session_log import EXERCISE_DTYPE, POPULATION_DTYPE, SessionLog
+
+SAMPLES_PER_REP = 20
+SAMPLE_PERIOD = 0.05
+# Rows generated and evaluated per step of simulate_population.
+POPULATION_CHUNK_ROWS = 65536
+
+# Nominal peak force [N] and speed [m/s] per training mode (index = tryb).
+MODE_BASE_FORCE = np.array([np.nan, 300.0, 250.0, 200.0])
+MODE_BASE_SPEED = np.array([np.nan, 0.5, 0.7, 1.0])
+
+
+@dataclass(frozen=True)
+class PopulationConfig:
+    """Synthetic users and the workout each of them performs.
+
+    Every user draws a training mode from ``modes`` (weighted by
+    ``mode_weights``) and log-normal multipliers with the given ``*_sd``
+    (sigma of the underlying normal) on the mode's nominal force and speed
+    and on the fatigue build-up; an ``*_sd`` of 0 gives the nominal user.
+    """
+    users: int = 100
+    modes: Sequence[int] = (1, 2, 3)
+    mode_weights: Optional[Sequence[float]] = None
+    serie: int = 3
+    powtorzenia: int = 10
+    samples_per_rep: int = SAMPLES_PER_REP
+    sample_period: float = SAMPLE_PERIOD
+    strength_sd: float = 0.15
+    speed_sd: float = 0.1
+    fatigue_sd: float = 0.2
+    fatigue_per_set: float = 25.0
+    fatigue_per_rep: float = 3.0
+    seed: Optional[int] = 0
+
+    @property
+    def samples_per_user(self) -> int:
+        return self.serie * self.powtorzenia * self.samples_per_rep
+
+    @property
+    def session_seconds(self) -> float:
+        return self.samples_per_user * self.sample_period
+
+
+@dataclass(frozen=True, eq=False)
+class PopulationRun:
+    """Simulated rows (``POPULATION_DTYPE``) plus the cost of evaluating them.
+
+    ``table`` is None when the rows were streamed into a ``SessionLog``.
+    """
+    config: PopulationConfig
+    table: Optional[np.ndarray]
+    inference_seconds: float
+    rows: int = 0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.inference_seconds if self.inference_seconds else float('inf')
+
+    @property
+    def realtime_users(self) -> float:
+        """Users one evaluator keeps up with when each streams at ``1 / sample_period`` Hz."""
+        return self.rows_per_second * self.config.sample_period
+
+
+def _draw_users(config: PopulationConfig):
+    """Per-user training mode and force, speed and fatigue-rate multipliers."""
+    rng = np.random.default_rng(config.seed)
+    users = config.users
+    weights = None
+    if config.mode_weights is not None:
+        weights = np.asarray(config.mode_weights, dtype=float)
+        weights = weights / weights.sum()
+    modes = rng.choice(np.asarray(config.modes), size=users, p=weights)
+    strength = MODE_BASE_FORCE[modes] * rng.lognormal(0.0, config.strength_sd, users)
+    speed = MODE_BASE_SPEED[modes] * rng.lognormal(0.0, config.speed_sd, users)
+    fatigue_rate = rng.lognormal(0.0, config.fatigue_sd, users)
+    return modes, strength, speed, fatigue_rate
+
+
+def _trajectories(config: PopulationConfig, modes, strength, speed, fatigue_rate) -> np.ndarray:
+    # Axes: (user, set, repetition, phase sample).
+    seria = np.arange(config.serie)[None, :, None, None]
+    rep = np.arange(config.powtorzenia)[None, None, :, None]
+    faza = np.linspace(0, 100, config.samples_per_rep)[None, None, None, :]
+    rate = fatigue_rate[:, None, None, None]
+    zmeczenie = np.minimum(100, seria * config.fatigue_per_set * rate + rep * config.fatigue_per_rep * rate)
+
+    sila_mod = np.sin(np.pi * faza / 100) * 0.5 + 0.5
+    sila = strength[:, None, None, None] * sila_mod * (1 - zmeczenie / 200)
+    predkosc = speed[:, None, None, None] * (1 - zmeczenie / 300) * (1 - np.abs(faza - 50) / 150)
+    np.clip(predkosc, 0.05, 1.45, out=predkosc)
+
+    shape = (len(modes), config.serie, config.powtorzenia, config.samples_per_rep)
+    return np.column_stack([
+        sila.ravel(),
+        predkosc.ravel(),
+        np.broadcast_to(faza, shape).ravel(),
+        np.broadcast_to(zmeczenie, shape).ravel(),
+        np.repeat(modes, config.samples_per_user).astype(float),
+    ])
+
+
+def population_inputs(config: PopulationConfig):
+    """Trajectories for every user as ``(users, modes, inputs)``.
+
+    ``inputs`` is an (users * samples_per_user, 5) array ordered as
+    ``fis_config.INPUT_ORDER``; rows of one user are contiguous and follow
+    set, repetition and phase order.
+    """
+    modes, strength, speed, fatigue_rate = _draw_users(config)
+    return modes, _trajectories(config, modes, strength, speed, fatigue_rate)
+
+
+def simulate_population(machine, config: PopulationConfig = PopulationConfig(), sweep=None,
+                        log: Optional[SessionLog] = None,
+                        chunk_rows: int = POPULATION_CHUNK_ROWS) -> PopulationRun:
+    """Generate and evaluate the users' trajectories about ``chunk_rows`` rows at a time.
+
+    Pass a ``ParallelSweep`` to spread inference over worker processes. With
+    a ``SessionLog`` (``POPULATION_DTYPE``) each chunk is streamed into it
+    and not kept, so peak memory stays at one chunk whatever the population
+    size; without one the chunks are joined into ``PopulationRun.table``.
+    """
+    if chunk_rows <= 0:
+        raise ValueError(f"chunk_rows must be positive, got {chunk_rows}")
+    modes, strength, speed, fatigue_rate = _draw_users(config)
+    per_user = config.samples_per_user
+    chunk_users = max(1, chunk_rows // per_user)
+    sample = np.arange(per_user)
+    seria = sample // (config.powtorzenia * config.samples_per_rep) + 1
+    powtorzenie = sample // config.samples_per_rep % config.powtorzenia + 1
+
+    tables = []
+    inference_seconds = 0.0
+    for first in range(0, config.users, chunk_users):
+        users = slice(first, first + chunk_users)
+        count = len(modes[users])
+        inputs = _trajectories(config, modes[users], strength[users], speed[users], fatigue_rate[users])
+        start = time.perf_counter()
+        raw = sweep.evaluate(machine, inputs) if sweep is not None else machine.compute_batch(inputs)
+        inference_seconds += time.perf_counter() - start
+
+        table = np.empty(len(inputs), dtype=POPULATION_DTYPE)
+        table['user'] = np.repeat(np.arange(first, first + count), per_user)
+        table['tryb'] = np.repeat(modes[users], per_user)
+        table['time'] = np.tile(sample * config.sample_period, count)
+        table['seria'] = np.tile(seria, count)
+        table['powtorzenie'] = np.tile(powtorzenie, count)
+        for col, name in enumerate(('sila', 'predkosc', 'faza', 'zmeczenie')):
+            table[name] = inputs[:, col]
+        table['opor'] = raw['opor']
+        table['feedback'] = raw['feedback']
+        if log is not None:
+            log.extend(table)
+        else:
+            tables.append(table)
+
+    if log is not None:
+        log.flush()
+        table = None
+    else:
+        table = np.concatenate(tables) if tables else np.empty(0, dtype=POPULATION_DTYPE)
+    return PopulationRun(config, table, inference_seconds, config.users * per_user)
+
+
+def simulate_session(machine, tryb=2, serie=3, powtorzenia=10, log: Optional[SessionLog] = None) -> np.ndarray:
+    """One nominal user's session as an ``EXERCISE_DTYPE`` array.
+
+    Passing a file-backed ``log`` also writes the session to disk; the
+    caller closes it.
+    """
+    config = PopulationConfig(users=1, modes=(tryb,), serie=serie, powtorzenia=powtorzenia,
+                              strength_sd=0.0, speed_sd=0.0, fatigue_sd=0.0)
+    table = simulate_population(machine, config).table[list(EXERCISE_DTYPE.names)]
+    if log is not None:
+        log.extend(table)
+        log.flush()
+    session = np.empty(len(table), dtype=EXERCISE_DTYPE)
+    for name in EXERCISE_DTYPE.names:
+        session[name] = table[name]
+    return session
@@ -0,0 +1,176 @@
+"""Process-pool evaluation of large input grids and parameter studies."""
+import os
+from concurrent.futures import ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Dict, Iterable, Optional, Sequence, Tuple
+
+import numpy as np
+
+from config import fis_config
+from ..core.experimental import IntelligentGymMachineExperimental
+from ..core.fis_engine import IntelligentGymMachine
+
+DEFAULT_CHUNK_ROWS = 4096
+RESULT_FIELDS = ('opor', 'feedback', 'valid')
+
+# Machines built inside a worker process, one per spec, reused across chunks.
+_WORKER_MACHINES = {}
+
+
+@dataclass(frozen=True)
+class MachineSpec:
+    """Picklable recipe for a machine; ``mf_type=None`` is IntelligentGymMachine."""
+    mf_type: Optional[str] = None
+    backend: str = fis_config.DEFAULT_BACKEND
+    lut_shape: Optional[Tuple[int, ...]] = None
+    defuzzifier: str = fis_config.DEFAULT_DEFUZZIFIER
+
+    @classmethod
+    def of(cls, machine) -> 'MachineSpec':
+        lut_shape = machine.lut_shape if machine.backend == 'lut' else None
+        return cls(getattr(machine, 'mf_type', None), machine.backend, lut_shape, machine.defuzzifier)
+
+    def build(self):
+        options = dict(backend=self.backend, lut_shape=self.lut_shape, defuzzifier=self.defuzzifier)
+        if self.mf_type is None:
+            return IntelligentGymMachine(**options)
+        return IntelligentGymMachineExperimental(mf_type=self.mf_type, **options)
+
+
+def grid_inputs(axes: Dict[str, Sequence[float]], fixed_values: Dict[str, float]) -> np.ndarray:
+    """(N, 5) rows covering the product of ``axes``; other inputs from ``fixed_values``.
+
+    Rows are ordered C-style over ``axes`` in insertion order, so results
+    reshape to ``tuple(len(values) for values in axes.values())``.
+    """
+    mesh = np.meshgrid(*(np.asarray(values, dtype=np.float64) for values in axes.values()), indexing='ij')
+    size = mesh[0].size if mesh else 1
+    columns = []
+    for name in fis_config.INPUT_ORDER:
+        if name in axes:
+            columns.append(mesh[list(axes).index(name)].ravel())
+        else:
+            columns.append(np.full(size, fixed_values[name], dtype=np.float64))
+    return np.column_stack(columns)
+
+
+def random_inputs(count: int, seed=0) -> np.ndarray:
+    """(count, 5) rows drawn uniformly over each input's universe.
+
+    ``seed`` is anything ``np.random.default_rng`` accepts, including a
+    Generator to draw from.
+    """
+    rng = np.random.default_rng(seed)
+    return np.column_stack([
+        rng.uniform(*fis_config.VARIABLE_UNIVERSES[name][:2], count) for name in fis_config.INPUT_ORDER
+    ])
+
+
+def _evaluate_chunk(spec: MachineSpec, input_name: str, output_name: str,
+                    rows: int, start: int, stop: int):
+    machine = _WORKER_MACHINES.get(spec)
+    if machine is None:
+        machine = _WORKER_MACHINES[spec] = spec.build()
+
+    input_shm = shared_memory.SharedMemory(name=input_name)
+    output_shm = shared_memory.SharedMemory(name=output_name)
+    try:
+        inputs = np.ndarray((rows, len(fis_config.INPUT_ORDER)), dtype=np.float64, buffer=input_shm.buf)
+        output = np.ndarray((len(RESULT_FIELDS), rows), dtype=np.float64, buffer=output_shm.buf)
+        raw = machine.compute_batch(inputs[start:stop])
+        for idx, field in enumerate(RESULT_FIELDS):
+            output[idx, start:stop] = raw[field]
+        del inputs, output
+    finally:
+        input_shm.close()
+        output_shm.close()
+
+
+class ParallelSweep:
+    """Evaluates input arrays across a ``ProcessPoolExecutor``.
+
+    Inputs and results live in shared memory; each task only carries a row
+    range. Jobs no larger than one chunk run in-process. Use as a context
+    manager (or call ``close``) to shut the pool down.
+    """
+
+    def __init__(self, workers: Optional[int] = None, chunk_rows: int = DEFAULT_CHUNK_ROWS):
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_rows = chunk_rows
+        self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def _pool(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        return self._executor
+
+    def evaluate(self, machine, inputs) -> Dict[str, np.ndarray]:
+        """``compute_batch``-style arrays for ``inputs`` using a machine or MachineSpec."""
+        return self.evaluate_many([machine], inputs)[0]
+
+    def evaluate_many(self, machines: Iterable, inputs) -> Tuple[Dict[str, np.ndarray], ...]:
+        """Evaluate the same inputs on several machines within one pool run."""
+        machines = list(machines)
+        inputs = np.atleast_2d(np.asarray(inputs, dtype=np.float64))
+        rows = len(inputs)
+        if self.workers <= 1 or rows * len(machines) <= self.chunk_rows:
+            return tuple(self._evaluate_inline(machine, inputs) for machine in machines)
+
+        specs = [machine if isinstance(machine, MachineSpec) else MachineSpec.of(machine) for machine in machines]
+        input_shm = shared_memory.SharedMemory(create=True, size=max(inputs.nbytes, 1))
+        output_shms = [
+            shared_memory.SharedMemory(create=True, size=max(len(RESULT_FIELDS) * rows * 8, 1))
+            for _ in specs
+        ]
+        try:
+            np.ndarray(inputs.shape, dtype=np.float64, buffer=input_shm.buf)[:] = inputs
+            pool = self._pool()
+            futures = [
+                pool.submit(_evaluate_chunk, spec, input_shm.name, output_shm.name,
+                            rows, start, min(start + self.chunk_rows, rows))
+                for spec, output_shm in zip(specs, output_shms)
+                for start in range(0, rows, self.chunk_rows)
+            ]
+            wait(futures)
+            for future in futures:
+                future.result()
+            return tuple(self._read_results(output_shm, rows) for output_shm in output_shms)
+        finally:
+            for shm in [input_shm] + output_shms:
+                shm.close()
+                shm.unlink()
+
+    def grid(self, machine, axes: Dict[str, Sequence[float]],
+             fixed_values: Dict[str, float]) -> Dict[str, np.ndarray]:
+        """Evaluate the product of ``axes``; arrays are shaped like the grid."""
+        shape = tuple(len(values) for values in axes.values())
+        raw = self.evaluate(machine, grid_inputs(axes, fixed_values))
+        return {field: values.reshape(shape) for field, values in raw.items()}
+
+    @staticmethod
+    def _evaluate_inline(machine, inputs) -> Dict[str, np.ndarray]:
+        if isinstance(machine, MachineSpec):
+            machine = machine.build()
+        raw = machine.compute_batch(inputs)
+        return {field: raw[field] for field in RESULT_FIELDS}
+
+    @staticmethod
+    def _read_results(output_shm, rows) -> Dict[str, np.ndarray]:
+        output = np.ndarray((len(RESULT_FIELDS), rows), dtype=np.float64, buffer=output_shm.buf).copy()
+        return {
+            'opor': output[0],
+            'feedback': output[1],
+            'valid': output[2].astype(bool),
+        }
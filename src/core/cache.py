@@ -0,0 +1,117 @@
+"""On-disk cache of compiled FIS artifacts keyed by a configuration hash."""
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+from typing import Optional
+
+import numpy as np
+
+from config import fis_config
+from config.logging_config import LOGGER_NAME
+from src.core.compiled import CompiledFIS
+from src.core.lut import FISLookupTable
+from src.core.sparse import SparseCompiledFIS
+
+# Bump when the stored layout of CompiledFIS/FISLookupTable changes.
+CACHE_FORMAT_VERSION = 1
+MANIFEST_NAME = 'manifest.json'
+
+LOGGER = logging.getLogger(LOGGER_NAME)
+
+ENGINE_KINDS = {
+    'compiled': CompiledFIS,
+    'sparse': SparseCompiledFIS,
+    'lut': FISLookupTable,
+}
+
+
+def artifact_key(machine) -> str:
+    """Hash of everything the compiled artifacts of ``machine`` derive from.
+
+    Covers the shared config tables as well as the universes, membership
+    arrays and rules of the machine's definition, so edits to either the
+    config or the definition builder invalidate the entry.
+    """
+    definition = machine.definition
+    digest = hashlib.sha256()
+    digest.update(repr((
+        CACHE_FORMAT_VERSION,
+        type(machine).__name__,
+        getattr(machine, 'mf_type', fis_config.DEFAULT_MF_TYPE),
+        machine.backend,
+        machine.defuzzifier,
+        machine.lut_shape if machine.backend == 'lut' else None,
+        fis_config.VARIABLE_UNIVERSES,
+        fis_config.TERM_DEFINITIONS,
+        fis_config.MF_CENTER_POINTS,
+    )).encode())
+    for variable in definition.inputs + definition.outputs:
+        digest.update(variable.label.encode())
+        digest.update(np.ascontiguousarray(variable.universe, dtype=np.float64).tobytes())
+        for term_name, memberships in zip(variable.term_names, variable.memberships):
+            digest.update(term_name.encode())
+            digest.update(np.ascontiguousarray(memberships, dtype=np.float64).tobytes())
+    for rule in definition.rules:
+        digest.update(repr((rule.antecedents, rule.consequents)).encode())
+    return digest.hexdigest()
+
+
+class ArtifactCache:
+    """Directory of ``<key>/manifest.json`` plus one ``.npy`` file per array.
+
+    Arrays are memory-mapped read-only on load, so a warm start only touches
+    the pages inference actually reads.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+
+    @classmethod
+    def default(cls) -> Optional['ArtifactCache']:
+        return cls(fis_config.FIS_CACHE_DIR) if fis_config.FIS_CACHE_DIR else None
+
+    def path_for(self, key: str) -> str:
+        return os.path.join(self.root, key)
+
+    def load(self, key: str):
+        path = self.path_for(key)
+        try:
+            with open(os.path.join(path, MANIFEST_NAME), encoding='utf-8') as handle:
+                manifest = json.load(handle)
+            arrays = {
+                name: np.load(os.path.join(path, f'{name}.npy'), mmap_mode='r')
+                for name in manifest['arrays']
+            }
+            return ENGINE_KINDS[manifest['kind']].from_state(manifest, arrays)
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def store(self, key: str, engine) -> bool:
+        """Publish ``engine`` under ``key``; returns False if it could not be written.
+
+        The cache is only an optimisation, so any failure (unusable root,
+        full disk, unserialisable state) is logged and the caller keeps the
+        engine it already holds in memory.
+        """
+        staging = None
+        try:
+            manifest, arrays = engine.state()
+            manifest['arrays'] = sorted(arrays)
+            os.makedirs(self.root, exist_ok=True)
+            staging = tempfile.mkdtemp(prefix=f'.{key[:12]}-', dir=self.root)
+            for name, array in arrays.items():
+                np.save(os.path.join(staging, f'{name}.npy'), np.asarray(array), allow_pickle=False)
+            with open(os.path.join(staging, MANIFEST_NAME), 'w', encoding='utf-8') as handle:
+                json.dump(manifest, handle)
+            # Atomic publish; a concurrent writer that got there first wins.
+            os.rename(staging, self.path_for(key))
+        except Exception as exc:
+            if staging is not None:
+                shutil.rmtree(staging, ignore_errors=True)
+            if not os.path.isdir(self.path_for(key)):
+                LOGGER.warning("Could not store FIS artifacts in %s: %s", self.root, exc)
+                return False
+        return True
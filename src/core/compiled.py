@@ -0,0 +1,355 @@
+"""Compiled NumPy Mamdani engine built from a machine definition."""
+import time
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from config import fis_config
+
+# Rows evaluated together in the defuzzification step; bounds peak memory of
+# the (rows, terms, universe) crossing masks for large batches.
+CHUNK_ROWS = 2048
+
+# Slope changes below this (relative to the steepest term) are sampling
+# noise, not breakpoints of a piecewise-linear membership function.
+KNOT_TOLERANCE = 1e-9
+
+
+class CompiledVariable:
+    """Universe, membership matrix and per-segment slopes of one variable."""
+
+    def __init__(self, name: str, universe: np.ndarray, term_names: Sequence[str],
+                 memberships: np.ndarray):
+        self.name = name
+        self.universe = np.ascontiguousarray(universe, dtype=np.float64)
+        self.term_names = tuple(term_names)
+        self.memberships = np.ascontiguousarray(memberships, dtype=np.float64)
+        self.widths = np.diff(self.universe)
+        self.slopes = np.diff(self.memberships, axis=1) / self.widths
+
+    @property
+    def bounds(self) -> Tuple[float, float]:
+        return float(self.universe.min()), float(self.universe.max())
+
+    def fuzzify(self, values: np.ndarray) -> np.ndarray:
+        """Membership degree of every term for each value, shape (N, terms)."""
+        low, high = self.bounds
+        values = np.clip(values, low, high)
+        idx = np.searchsorted(self.universe, values, side='right') - 1
+        np.clip(idx, 0, len(self.universe) - 2, out=idx)
+        offset = values - self.universe[idx]
+        return (self.memberships[:, idx] + self.slopes[:, idx] * offset).T
+
+
+class CompiledFIS:
+    """Mamdani min/max/centroid inference evaluated with NumPy only.
+
+    Reproduces ``skfuzzy.control.ControlSystemSimulation`` including the
+    up-sampling of the output universe at the points where each consequent
+    term crosses its clip level, so results match the skfuzzy path to
+    floating point precision.
+    """
+
+    def __init__(self, inputs: Sequence[CompiledVariable], outputs: Sequence[CompiledVariable],
+                 rule_antecedents: np.ndarray, rule_consequents: np.ndarray,
+                 rule_weights: np.ndarray, defuzzifier: str = 'sampled'):
+        if defuzzifier not in fis_config.DEFUZZIFIERS:
+            raise ValueError(f"Unknown defuzzifier: {defuzzifier}")
+        self.inputs = tuple(inputs)
+        self.outputs = tuple(outputs)
+        # (rules, max_terms) indices into the stacked input memberships; the
+        # padding index points at a constant column of ones.
+        self.rule_antecedents = np.asarray(rule_antecedents, dtype=np.intp)
+        # (rules, outputs) term index per output, -1 when the rule is silent.
+        self.rule_consequents = np.asarray(rule_consequents, dtype=np.intp)
+        self.rule_weights = np.asarray(rule_weights, dtype=np.float64)
+        self.clip_tables = tuple(
+            self._clip_table(col, len(var.term_names)) for col, var in enumerate(self.outputs)
+        )
+        self.defuzzifier = defuzzifier
+        # Optional StageTimings (src/core/instrumentation.py) fed by evaluate().
+        self.timings = None
+        # Outputs whose terms are not piecewise linear keep the sampled centroid.
+        self.analytic = tuple(
+            AnalyticCentroid.for_variable(variable) if defuzzifier == 'analytic' else None
+            for variable in self.outputs
+        )
+
+    @classmethod
+    def from_definition(cls, definition, defuzzifier: str = 'sampled') -> 'CompiledFIS':
+        """Engine over the arrays of a ``FISDefinition`` (shared, not copied)."""
+        def compile_variables(variables):
+            return [CompiledVariable(variable.name, variable.universe, variable.term_names, variable.memberships)
+                    for variable in variables]
+        inputs = compile_variables(definition.inputs)
+        outputs = compile_variables(definition.outputs)
+
+        term_index: Dict[Tuple[str, str], int] = {}
+        for variable in inputs:
+            for term_name in variable.term_names:
+                term_index[(variable.name, term_name)] = len(term_index)
+        output_index = {variable.name: (col, variable.term_names) for col, variable in enumerate(outputs)}
+
+        antecedents = [[term_index[term] for term in rule.antecedents] for rule in definition.rules]
+        width = max(len(terms) for terms in antecedents)
+        padding = len(term_index)
+        rule_antecedents = np.full((len(antecedents), width), padding, dtype=np.intp)
+        for row, terms in enumerate(antecedents):
+            rule_antecedents[row, :len(terms)] = terms
+
+        rule_consequents = np.full((len(definition.rules), len(outputs)), -1, dtype=np.intp)
+        rule_weights = np.zeros((len(definition.rules), len(outputs)), dtype=np.float64)
+        for row, rule in enumerate(definition.rules):
+            for name, term_name in rule.consequents:
+                col, term_names = output_index[name]
+                rule_consequents[row, col] = term_names.index(term_name)
+                rule_weights[row, col] = 1.0
+
+        return cls(inputs, outputs, rule_antecedents, rule_consequents, rule_weights, defuzzifier)
+
+    def _clip_table(self, col: int, term_count: int) -> np.ndarray:
+        """(rules, terms) weights mapping rule firing strength to term cuts."""
+        table = np.zeros((len(self.rule_consequents), term_count), dtype=np.float64)
+        active = self.rule_consequents[:, col] >= 0
+        rows = np.nonzero(active)[0]
+        table[rows, self.rule_consequents[rows, col]] = self.rule_weights[rows, col]
+        return table
+
+    def state(self) -> Tuple[dict, Dict[str, np.ndarray]]:
+        """Manifest and arrays needed to rebuild this engine (see ``from_state``)."""
+        manifest = {
+            'kind': 'compiled',
+            'defuzzifier': self.defuzzifier,
+            'inputs': [[variable.name, list(variable.term_names)] for variable in self.inputs],
+            'outputs': [[variable.name, list(variable.term_names)] for variable in self.outputs],
+        }
+        arrays = {
+            'rule_antecedents': self.rule_antecedents,
+            'rule_consequents': self.rule_consequents,
+            'rule_weights': self.rule_weights,
+        }
+        for prefix, variables in (('input', self.inputs), ('output', self.outputs)):
+            for idx, variable in enumerate(variables):
+                arrays[f'{prefix}{idx}_universe'] = variable.universe
+                arrays[f'{prefix}{idx}_memberships'] = variable.memberships
+        return manifest, arrays
+
+    @classmethod
+    def from_state(cls, manifest: dict, arrays: Dict[str, np.ndarray]) -> 'CompiledFIS':
+        def variables(prefix):
+            return [
+                CompiledVariable(name, arrays[f'{prefix}{idx}_universe'], term_names,
+                                 arrays[f'{prefix}{idx}_memberships'])
+                for idx, (name, term_names) in enumerate(manifest[f'{prefix}s'])
+            ]
+        return cls(variables('input'), variables('output'), arrays['rule_antecedents'],
+                   arrays['rule_consequents'], arrays['rule_weights'],
+                   manifest.get('defuzzifier', 'sampled'))
+
+    @property
+    def rule_count(self) -> int:
+        return len(self.rule_antecedents)
+
+    def fuzzify(self, inputs: np.ndarray) -> np.ndarray:
+        """Memberships of all input terms side by side plus a column of ones, (N, terms + 1)."""
+        memberships = [variable.fuzzify(inputs[:, col]) for col, variable in enumerate(self.inputs)]
+        memberships.append(np.ones((len(inputs), 1)))
+        return np.hstack(memberships)
+
+    def rule_strengths(self, memberships: np.ndarray) -> np.ndarray:
+        return memberships[:, self.rule_antecedents].min(axis=2)
+
+    def firing_strengths(self, inputs: np.ndarray) -> np.ndarray:
+        """Rule activation (min of antecedent memberships), shape (N, rules)."""
+        return self.rule_strengths(self.fuzzify(inputs))
+
+    def term_cuts(self, firing: np.ndarray) -> Tuple[np.ndarray, ...]:
+        """Max-accumulated clip level of every output term, one (N, terms) array per output."""
+        return tuple(
+            (firing[:, :, None] * table[None, :, :]).max(axis=1) for table in self.clip_tables
+        )
+
+    def evaluate(self, inputs) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Evaluate an (N, 5) input array.
+
+        Returns ``(opor, feedback, valid)`` where ``valid`` is False for rows
+        on which no rule fired and the crisp outputs are undefined (NaN).
+        """
+        inputs = np.atleast_2d(np.asarray(inputs, dtype=np.float64))
+        if inputs.shape[1] != len(self.inputs):
+            raise ValueError(f"Expected {len(self.inputs)} input columns, got {inputs.shape[1]}")
+
+        results = np.empty((len(self.outputs), len(inputs)), dtype=np.float64)
+        for start in range(0, len(inputs), CHUNK_ROWS):
+            chunk = slice(start, start + CHUNK_ROWS)
+            self._evaluate_chunk(inputs[chunk], results[:, chunk])
+
+        valid = ~np.isnan(results).any(axis=0)
+        return results[0], results[1], valid
+
+    def _evaluate_chunk(self, inputs: np.ndarray, results: np.ndarray):
+        timings = self.timings
+        mark = time.perf_counter_ns() if timings is not None else 0
+        memberships = self.fuzzify(inputs)
+        if timings is not None:
+            mark = timings.lap('fuzzify', mark)
+        firing = self.rule_strengths(memberships)
+        if timings is not None:
+            mark = timings.lap('rules', mark)
+        cuts = self.term_cuts(firing)
+        if timings is not None:
+            mark = timings.lap('aggregate', mark)
+        for col, cut in enumerate(cuts):
+            results[col] = self.defuzzify(col, cut)
+        if timings is not None:
+            timings.lap('defuzzify', mark)
+
+    def defuzzify(self, col: int, cuts: np.ndarray) -> np.ndarray:
+        """Centroid of output ``col`` for (N, terms) cuts, NaN where no term is cut."""
+        analytic = self.analytic[col]
+        if analytic is not None:
+            return analytic(cuts)
+        return _centroid(self.outputs[col], cuts)
+
+
+class AnalyticCentroid:
+    """Exact centroid of clipped piecewise-linear terms computed from their breakpoints.
+
+    The output universe is reduced to the knots where any term changes slope.
+    Between two knots every term is a line, so the aggregated shape
+    ``max_t min(cut_t, line_t)`` only bends where a line meets its own cut,
+    another term's cut or another line. Those points are inserted per segment
+    and the area and moment of the resulting polygon are integrated exactly,
+    independently of how finely the universe is sampled.
+    """
+
+    def __init__(self, variable: CompiledVariable, knots: np.ndarray):
+        values = variable.memberships[:, knots]
+        term_count = len(values)
+        self.knots = variable.universe[knots]
+        self.widths = np.diff(self.knots)
+        slopes = np.diff(values, axis=1) / self.widths
+
+        # Per segment, the terms with non-zero membership on it, padded with
+        # an index past the last term that selects an all-zero pseudo term.
+        active = (values[:, :-1] > 0) | (values[:, 1:] > 0)
+        width = max(int(active.sum(axis=0).max()), 1)
+        self.terms = np.full((len(self.widths), width), term_count, dtype=np.intp)
+        for segment in range(len(self.widths)):
+            own = np.flatnonzero(active[:, segment])
+            self.terms[segment, :len(own)] = own
+        segments = np.arange(len(self.widths))[:, None]
+        self.y0 = np.vstack([values[:, :-1], np.zeros(len(self.widths))])[self.terms, segments]
+        self.slope = np.vstack([slopes, np.zeros(len(self.widths))])[self.terms, segments]
+
+        # Line/line intersections do not depend on the cuts.
+        first, second = np.triu_indices(width, 1)
+        slope_gap = self.slope[:, first] - self.slope[:, second]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            self.line_crossings = np.where(
+                slope_gap != 0, (self.y0[:, second] - self.y0[:, first]) / slope_gap, 0.0
+            )
+        self.line_term, self.cut_term = (
+            pair.ravel() for pair in np.nonzero(~np.eye(width, dtype=bool))
+        )
+
+    @classmethod
+    def for_variable(cls, variable: CompiledVariable) -> Optional['AnalyticCentroid']:
+        """Build for ``variable``, or None when its terms are not piecewise linear."""
+        slopes = variable.slopes
+        bends = np.abs(np.diff(slopes, axis=1)) > KNOT_TOLERANCE * max(np.abs(slopes).max(), 1.0)
+        knots = np.r_[0, np.flatnonzero(bends.any(axis=0)) + 1, len(variable.universe) - 1]
+        if len(knots) > len(variable.universe) // 4:
+            return None
+        return cls(variable, knots)
+
+    def __call__(self, cuts: np.ndarray) -> np.ndarray:
+        cuts = np.hstack([cuts, np.zeros((len(cuts), 1))])
+        levels = cuts[:, self.terms]
+        y0, slope = self.y0, self.slope
+        flat = slope == 0
+        safe_slope = np.where(flat, 1.0, slope)
+
+        own_cut = np.where(flat, 0.0, (levels - y0) / safe_slope)
+        other_cut = np.where(
+            flat[:, self.line_term], 0.0,
+            (levels[:, :, self.cut_term] - y0[:, self.line_term]) / safe_slope[:, self.line_term],
+        )
+        shape = levels.shape[:2]
+        offsets = np.concatenate([
+            np.zeros(shape + (1,)),
+            own_cut,
+            other_cut,
+            np.broadcast_to(self.line_crossings, shape + self.line_crossings.shape[1:]),
+            np.broadcast_to(self.widths[:, None], shape + (1,)),
+        ], axis=2)
+        np.clip(offsets, 0.0, self.widths[:, None], out=offsets)
+        offsets.sort(axis=2)
+
+        # At most a few terms overlap a segment: fold them one at a time
+        # instead of reducing over a short trailing axis.
+        values = np.zeros(offsets.shape)
+        for slot in range(self.terms.shape[1]):
+            line = y0[:, slot, None] + slope[:, slot, None] * offsets
+            np.maximum(values, np.minimum(line, levels[:, :, slot, None]), out=values)
+        points = self.knots[:-1, None] + offsets
+        area, moment = _segment_integrals(points[..., :-1], points[..., 1:], values[..., :-1], values[..., 1:])
+        # No epsilon floor on the area: even cuts at rounding-noise level give
+        # a well-defined polygon here.
+        total_area = area.reshape(len(area), -1).sum(axis=1)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            result = moment.reshape(len(moment), -1).sum(axis=1) / total_area
+        result[~(total_area > 0)] = np.nan
+        return result
+
+
+def _segment_integrals(x0, x1, y0, y1):
+    """Area and first moment of the linear segments (x0, y0)-(x1, y1)."""
+    width = x1 - x0
+    area = 0.5 * width * (y0 + y1)
+    moment = width * (y0 * (2.0 * x0 + x1) + y1 * (x0 + 2.0 * x1)) / 6.0
+    return area, moment
+
+
+def _centroid(variable: CompiledVariable, cuts: np.ndarray) -> np.ndarray:
+    """Centroid of the max-aggregated, min-clipped output terms per row."""
+    universe = variable.universe
+    mf = variable.memberships
+    levels = cuts[:, :, None]
+
+    aggregated = np.minimum(levels, mf[None, :, :]).max(axis=1)
+    area, moment = _segment_integrals(universe[:-1], universe[1:], aggregated[:, :-1], aggregated[:, 1:])
+
+    # Segments in which a term crosses its clip level get the crossing points
+    # inserted, exactly like skfuzzy's up-sampled universe.
+    above = mf[None, :, :] >= levels
+    crossing = (above[:, :, :-1] != above[:, :, 1:]) & (levels > 0)
+    rows, segments = np.nonzero(crossing.any(axis=1))
+    if len(rows):
+        seg_cuts = cuts[rows]
+        y_left = mf[:, segments].T
+        slope = variable.slopes[:, segments].T
+        offsets = np.where(
+            crossing[rows, :, segments],
+            (seg_cuts - y_left) / np.where(slope == 0, 1.0, slope),
+            0.0,
+        )
+        offsets.sort(axis=1)
+        widths = variable.widths[segments]
+        offsets = np.hstack([np.zeros((len(rows), 1)), offsets, widths[:, None]])
+
+        values = np.minimum(
+            seg_cuts[:, None, :],
+            y_left[:, None, :] + slope[:, None, :] * offsets[:, :, None],
+        ).max(axis=2)
+        points = universe[segments][:, None] + offsets
+        sub_area, sub_moment = _segment_integrals(points[:, :-1], points[:, 1:], values[:, :-1], values[:, 1:])
+        area[rows, segments] = sub_area.sum(axis=1)
+        moment[rows, segments] = sub_moment.sum(axis=1)
+
+    total_area = area.sum(axis=1)
+    empty = ~(aggregated > 0).any(axis=1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        result = moment.sum(axis=1) / np.fmax(total_area, np.finfo(float).eps)
+    result[empty] = np.nan
+    return result
@@ -0,0 +1,174 @@
+"""Machine definitions built from ``fis_config`` alone.
+
+A ``FISDefinition`` holds everything a machine is made of: the universes,
+the term membership arrays and the rule base. It is computed once per MF
+type and process, its arrays are read-only, and every backend derives from
+it: the compiled engines and the artifact cache key read it directly and the
+skfuzzy control system is assembled from it on demand. The membership
+functions reproduce skfuzzy's element for element, so no skfuzzy import is
+needed to build or evaluate a compiled machine.
+"""
+import functools
+from dataclasses import dataclass
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from config import fis_config
+from config.fis_config import RuleDefinition, TermDefinition
+
+
+def trimf(x: np.ndarray, abc: Sequence[float]) -> np.ndarray:
+    a, b, c = abc
+    y = np.zeros(len(x))
+    if a != b:
+        left = (a < x) & (x < b)
+        y[left] = (x[left] - a) / float(b - a)
+    if b != c:
+        right = (b < x) & (x < c)
+        y[right] = (c - x[right]) / float(c - b)
+    y[x == b] = 1
+    return y
+
+
+def trapmf(x: np.ndarray, abcd: Sequence[float]) -> np.ndarray:
+    a, b, c, d = abcd
+    y = np.ones(len(x))
+    rising = x <= b
+    y[rising] = trimf(x[rising], (a, b, b))
+    falling = x >= c
+    y[falling] = trimf(x[falling], (c, c, d))
+    y[(x < a) | (x > d)] = 0
+    return y
+
+
+def gaussmf(x: np.ndarray, params: Sequence[float]) -> np.ndarray:
+    mean, sigma = params
+    return np.exp(-((x - mean) ** 2.) / (2 * sigma ** 2.))
+
+
+def gbellmf(x: np.ndarray, params: Sequence[float]) -> np.ndarray:
+    a, b, c = params
+    return 1. / (1. + np.abs((x - c) / a) ** (2 * b))
+
+
+def sigmf(x: np.ndarray, params: Sequence[float]) -> np.ndarray:
+    b, c = params
+    return 1. / (1. + np.exp(- c * (x - b)))
+
+
+def psigmf(x: np.ndarray, params: Sequence[float]) -> np.ndarray:
+    """Product of two sigmoids, ``params`` = (b1, c1, b2, c2)."""
+    b1, c1, b2, c2 = params
+    return sigmf(x, (b1, c1)) * sigmf(x, (b2, c2))
+
+
+MEMBERSHIP_FUNCTIONS = {
+    'trimf': trimf,
+    'trapmf': trapmf,
+    'gaussmf': gaussmf,
+    'gbellmf': gbellmf,
+    'sigmf': sigmf,
+    'psigmf': psigmf,
+}
+
+
+@dataclass(frozen=True, eq=False)
+class VariableDefinition:
+    name: str
+    label: str
+    universe: np.ndarray
+    terms: Tuple[TermDefinition, ...]
+    # (terms, universe) membership degrees, rows in ``terms`` order.
+    memberships: np.ndarray
+
+    @property
+    def term_names(self) -> Tuple[str, ...]:
+        return tuple(term.name for term in self.terms)
+
+
+@dataclass(frozen=True, eq=False)
+class FISDefinition:
+    mf_type: Optional[str]
+    variables: Dict[str, VariableDefinition]
+    rules: Tuple[RuleDefinition, ...]
+
+    @property
+    def inputs(self) -> Tuple[VariableDefinition, ...]:
+        return tuple(self.variables[name] for name in fis_config.INPUT_ORDER)
+
+    @property
+    def outputs(self) -> Tuple[VariableDefinition, ...]:
+        return tuple(self.variables[name] for name in fis_config.OUTPUT_ORDER)
+
+
+def fis_definition(mf_type: Optional[str] = None) -> FISDefinition:
+    """Definition of ``IntelligentGymMachine`` (``mf_type=None``) or of the
+    experimental machine with MFs of ``mf_type`` generated from MF_CENTER_POINTS."""
+    return _build_definition(mf_type)
+
+
+@functools.lru_cache(maxsize=None)
+def _build_definition(mf_type: Optional[str]) -> FISDefinition:
+    if mf_type is not None and mf_type not in fis_config.MF_FUNCTION_TYPES:
+        raise ValueError(f"Unknown MF type: {mf_type}")
+    variables = {}
+    for name in fis_config.INPUT_ORDER + fis_config.OUTPUT_ORDER:
+        universe = make_universe(*fis_config.VARIABLE_UNIVERSES[name])
+        terms = fis_config.TERM_DEFINITIONS[name]
+        # The training mode and the feedback command are categorical, so
+        # they keep their triangular terms whatever the MF type.
+        if mf_type is not None and name in fis_config.MF_CENTER_POINTS:
+            names = [term.name for term in terms]
+            terms = generated_terms(mf_type, universe, fis_config.MF_CENTER_POINTS[name], names)
+        memberships = np.vstack([MEMBERSHIP_FUNCTIONS[term.function](universe, term.params) for term in terms])
+        universe.flags.writeable = False
+        memberships.flags.writeable = False
+        variables[name] = VariableDefinition(name, fis_config.CONTROL_LABELS[name], universe, tuple(terms),
+                                             memberships)
+    rules = fis_config.RULES if mf_type is None else fis_config.EXPERIMENTAL_RULES
+    return FISDefinition(mf_type, variables, tuple(rules))
+
+
+def make_universe(start: float, stop: float, step: float) -> np.ndarray:
+    """``start`` to ``stop`` inclusive in ``step`` increments."""
+    return np.arange(start, stop + step / 2, step, dtype=np.float64)
+
+
+def generated_terms(mf_type: str, universe: np.ndarray, centers: Sequence[float],
+                    names: Sequence[str]) -> Tuple[TermDefinition, ...]:
+    """Terms of ``mf_type`` centred on ``centers``; widths follow the neighbour spacing."""
+    terms = []
+    count = len(centers)
+    for i, (center, name) in enumerate(zip(centers, names)):
+        if i == 0:
+            width = (centers[1] - centers[0]) * 0.6
+        elif i == count - 1:
+            width = (centers[-1] - centers[-2]) * 0.6
+        else:
+            width = min(centers[i] - centers[i - 1], centers[i + 1] - centers[i]) * 0.6
+        edge = 'left' if i == 0 else 'right' if i == count - 1 else None
+
+        if mf_type == 'triangular':
+            if edge == 'left':
+                left = float(universe.min())
+                terms.append(TermDefinition(name, 'trapmf', (left, left, center, center + width * 1.5)))
+            elif edge == 'right':
+                right = float(universe.max())
+                terms.append(TermDefinition(name, 'trapmf', (center - width * 1.5, center, right, right)))
+            else:
+                terms.append(TermDefinition(name, 'trimf', (center - width * 1.5, center, center + width * 1.5)))
+        elif mf_type == 'gaussian':
+            terms.append(TermDefinition(name, 'gaussmf', (center, width * 0.8)))
+        elif mf_type == 'gbell':
+            terms.append(TermDefinition(name, 'gbellmf', (width * 1.2, 2.5, center)))
+        elif mf_type == 'sigmoid':
+            steepness = 0.1 / width if width > 0 else 0.1
+            if edge == 'left':
+                terms.append(TermDefinition(name, 'sigmf', (center + width, -steepness * 5)))
+            elif edge == 'right':
+                terms.append(TermDefinition(name, 'sigmf', (center - width, steepness * 5)))
+            else:
+                terms.append(TermDefinition(name, 'psigmf', (center - width, steepness * 5,
+                                                             center + width, -steepness * 5)))
+    return tuple(terms)
@@ -1,251 +1,233 @@
+import bisect
+import functools
+import operator
+import threading
+import time
+
 import numpy as np
-import skfuzzy as fuzz
-from skfuzzy import control as ctrl
+
+from config import fis_config
+from src.core.cache import ArtifactCache, artifact_key
+from src.core.compiled import CompiledFIS
+from src.core.definition import FISDefinition, fis_definition
+from src.core.lut import FISLookupTable
+from src.core.sparse import SparseCompiledFIS
+
+# Serializes on-demand construction of the skfuzzy objects; re-entrant
+# because building the control system first builds the rules.
+_SYSTEM_LOCK = threading.RLock()
+
+# skfuzzy variables and rules, assembled from the definition on first use.
+CONTROL_ATTRIBUTES = fis_config.INPUT_ORDER + fis_config.OUTPUT_ORDER + ('rules',)
+SYSTEM_ATTRIBUTES = ('system', 'control_system', 'simulator', 'simulation_lock')
+
+FALLBACK_FEEDBACK_CODE = fis_config.FEEDBACK_LABELS.index(fis_config.FALLBACK_FEEDBACK_LABEL)
+
+
+def feedback_code(value: float) -> int:
+    """Index into FEEDBACK_LABELS of a crisp feedback value."""
+    return bisect.bisect_right(fis_config.FEEDBACK_THRESHOLDS, value)
+
+
+def feedback_codes(values) -> np.ndarray:
+    """``feedback_code`` over an array."""
+    return np.searchsorted(fis_config.FEEDBACK_THRESHOLDS, values, side='right')
+
+
+def fallback_result(error: str) -> dict:
+    """Result of ``compute`` when the inputs produce no crisp output."""
+    return {
+        'opor': fis_config.FALLBACK_RESISTANCE,
+        'feedback': fis_config.FALLBACK_FEEDBACK,
+        'feedback_text': fis_config.FALLBACK_FEEDBACK_LABEL,
+        'error': error
+    }
 
 
 class IntelligentGymMachine:
-    def __init__(self):
-        self.setup_variables()
-        self.setup_membership_functions()
-        self.setup_rules()
-        self.build_system()
-
-    def setup_variables(self):
-        self.sila = ctrl.Antecedent(np.arange(0, 501, 1), 'sila_generowana')
-        self.predkosc = ctrl.Antecedent(np.arange(0, 1.51, 0.01), 'predkosc_ruchu')
-        self.faza = ctrl.Antecedent(np.arange(0, 101, 1), 'faza_ruchu')
-        self.zmeczenie = ctrl.Antecedent(np.arange(0, 101, 1), 'wskaznik_zmeczenia')
-        self.tryb = ctrl.Antecedent(np.arange(1, 3.01, 0.01), 'tryb_treningu')
-
-        self.opor = ctrl.Consequent(np.arange(0, 101, 1), 'opor_maszyny')
-        self.feedback = ctrl.Consequent(np.arange(1, 5.01, 0.01), 'sygnal_feedback')
-
-    def setup_membership_functions(self):
-        self.sila['bardzo_niska'] = fuzz.trapmf(self.sila.universe, [0, 0, 50, 100])
-        self.sila['niska'] = fuzz.trimf(self.sila.universe, [50, 125, 200])
-        self.sila['srednia'] = fuzz.trimf(self.sila.universe, [150, 250, 350])
-        self.sila['wysoka'] = fuzz.trimf(self.sila.universe, [300, 375, 450])
-        self.sila['bardzo_wysoka'] = fuzz.trapmf(self.sila.universe, [400, 450, 500, 500])
-
-        self.predkosc['bardzo_wolna'] = fuzz.trapmf(self.predkosc.universe, [0, 0, 0.1, 0.25])
-        self.predkosc['wolna'] = fuzz.trimf(self.predkosc.universe, [0.15, 0.35, 0.55])
-        self.predkosc['umiarkowana'] = fuzz.trimf(self.predkosc.universe, [0.45, 0.7, 0.95])
-        self.predkosc['szybka'] = fuzz.trimf(self.predkosc.universe, [0.85, 1.1, 1.35])
-        self.predkosc['bardzo_szybka'] = fuzz.trapmf(self.predkosc.universe, [1.2, 1.35, 1.5, 1.5])
-
-        self.faza['poczatkowa'] = fuzz.trapmf(self.faza.universe, [0, 0, 10, 25])
-        self.faza['dolna'] = fuzz.trimf(self.faza.universe, [15, 30, 45])
-        self.faza['srodkowa'] = fuzz.trimf(self.faza.universe, [35, 50, 65])
-        self.faza['gorna'] = fuzz.trimf(self.faza.universe, [55, 70, 85])
-        self.faza['koncowa'] = fuzz.trapmf(self.faza.universe, [75, 90, 100, 100])
-
-        self.zmeczenie['swiezy'] = fuzz.trapmf(self.zmeczenie.universe, [0, 0, 5, 15])
-        self.zmeczenie['lekkie'] = fuzz.trimf(self.zmeczenie.universe, [10, 25, 40])
-        self.zmeczenie['umiarkowane'] = fuzz.trimf(self.zmeczenie.universe, [30, 50, 70])
-        self.zmeczenie['wysokie'] = fuzz.trimf(self.zmeczenie.universe, [60, 75, 90])
-        self.zmeczenie['wyczerpanie'] = fuzz.trapmf(self.zmeczenie.universe, [80, 90, 100, 100])
-
-        self.tryb['silowy'] = fuzz.trimf(self.tryb.universe, [1, 1, 1.8])
-        self.tryb['hipertrofia'] = fuzz.trimf(self.tryb.universe, [1.5, 2, 2.5])
-        self.tryb['wytrzymalosc'] = fuzz.trimf(self.tryb.universe, [2.2, 3, 3])
-
-        self.opor['minimalny'] = fuzz.trapmf(self.opor.universe, [0, 0, 10, 20])
-        self.opor['niski'] = fuzz.trimf(self.opor.universe, [15, 30, 45])
-        self.opor['sredni'] = fuzz.trimf(self.opor.universe, [35, 50, 65])
-        self.opor['wysoki'] = fuzz.trimf(self.opor.universe, [55, 70, 85])
-        self.opor['maksymalny'] = fuzz.trapmf(self.opor.universe, [75, 90, 100, 100])
-
-        self.feedback['zwolnij'] = fuzz.trimf(self.feedback.universe, [1, 1, 2])
-        self.feedback['dobrze'] = fuzz.trimf(self.feedback.universe, [1.5, 2.5, 3.5])
-        self.feedback['idealnie'] = fuzz.trimf(self.feedback.universe, [2.5, 3, 3.5])
-        self.feedback['mocniej'] = fuzz.trimf(self.feedback.universe, [3, 3.5, 4.5])
-        self.feedback['stop'] = fuzz.trimf(self.feedback.universe, [4, 5, 5])
-
-    def setup_rules(self):
-        self.rules = []
-
-        self.rules.append(ctrl.Rule(
-            self.faza['poczatkowa'] & self.sila['srednia'],
-            (self.opor['niski'], self.feedback['dobrze'])
-        ))
-        self.rules.append(ctrl.Rule(
-            self.faza['dolna'] & self.sila['srednia'],
-            (self.opor['sredni'], self.feedback['dobrze'])
-        ))
-        self.rules.append(ctrl.Rule(
-            self.faza['srodkowa'] & self.sila['niska'],
-            (self.opor['niski'], self.feedback['mocniej'])
-        ))
-        self.rules.append(ctrl.Rule(
-            self.faza['srodkowa'] & self.sila['srednia'],
-            (self.opor['sredni'], self.feedback['idealnie'])
-        ))
-        self.rules.append(ctrl.Rule(
-            self.faza['gorna'] & self.sila['wysoka'],
-            (self.opor['wysoki'], self.feedback['idealnie'])
-        ))
-        self.rules.append(ctrl.Rule(
-            self.faza['koncowa'] & self.sila['bardzo_wysoka'],
-            (self.opor['maksymalny'], self.feedback['idealnie'])
-        ))
-
-        self.rules.append(ctrl.Rule(
-            self.predkosc['bardzo_szybka'] & self.zmeczenie['swiezy'],
-            (self.opor['wysoki'], self.feedback['zwolnij'])
-        ))
-        self.rules.append(ctrl.Rule(
-            self.predkosc['szybka'] & self.tryb['silowy'],
-            (self.opor['wysoki'], self.feedback['dobrze'])
-        ))
-        self.rules.append(ctrl.Rule(
-            self.predkosc['umiarkowana'] & self.tryb['hipertrofia'],
-            (self.opor['sredni'], self.feedback['idealnie'])
-        ))
-        self.rules.append(ctrl.Rule(
-            self.predkosc['wolna'] & self.zmeczenie['lekkie'],
-            (self.opor['sredni'], self.feedback['dobrze'])
-        ))
-        self.rules.append(ctrl.Rule(
-            self.predkosc['bardzo_wolna'] & self.zmeczenie['wysokie'],
-            (self.opor['niski'], self.feedback['stop'])
-        ))
-
-        self.rules.append(ctrl.Rule(
-            self.zmeczenie['swiezy'] & self.sila['bardzo_wysoka'],
-            (self.opor['maksymalny'], self.feedback['idealnie'])
-        ))
-        self.rules.append(ctrl.Rule(
-            self.zmeczenie['lekkie'] & self.sila['srednia'],
-            (self.opor['sredni'], self.feedback['dobrze'])
-        ))
-        self.rules.append(ctrl.Rule(
-            self.zmeczenie['umiarkowane'] & self.sila['srednia'],
-            (self.opor['niski'], self.feedback['dobrze'])
-        ))
-        self.rules.append(ctrl.Rule(
-            self.zmeczenie['wysokie'] & self.sila['niska'],
-            (self.opor['minimalny'], self.feedback['stop'])
-        ))
-        self.rules.append(ctrl.Rule(
-            self.zmeczenie['wyczerpanie'],
-            (self.opor['minimalny'], self.feedback['stop'])
-        ))
-
-        self.rules.append(ctrl.Rule(
-            self.tryb['silowy'] & self.sila['bardzo_wysoka'] & self.zmeczenie['swiezy'],
-            (self.opor['maksymalny'], self.feedback['idealnie'])
-        ))
-        self.rules.append(ctrl.Rule(
-            self.tryb['silowy'] & self.sila['srednia'] & self.faza['gorna'],
-            (self.opor['wysoki'], self.feedback['mocniej'])
-        ))
-        self.rules.append(ctrl.Rule(
-            self.tryb['hipertrofia'] & self.predkosc['umiarkowana'] & self.zmeczenie['lekkie'],
-            (self.opor['sredni'], self.feedback['idealnie'])
-        ))
-        self.rules.append(ctrl.Rule(
-            self.tryb['hipertrofia'] & self.zmeczenie['umiarkowane'],
-            (self.opor['niski'], self.feedback['mocniej'])
-        ))
-        self.rules.append(ctrl.Rule(
-            self.tryb['wytrzymalosc'] & self.predkosc['szybka'],
-            (self.opor['niski'], self.feedback['idealnie'])
-        ))
-        self.rules.append(ctrl.Rule(
-            self.tryb['wytrzymalosc'] & self.zmeczenie['umiarkowane'],
-            (self.opor['niski'], self.feedback['dobrze'])
-        ))
-
-        self.rules.append(ctrl.Rule(
-            self.sila['bardzo_niska'] & self.faza['poczatkowa'],
-            (self.opor['minimalny'], self.feedback['mocniej'])
-        ))
-        self.rules.append(ctrl.Rule(
-            self.sila['bardzo_niska'] & self.zmeczenie['wysokie'],
-            (self.opor['minimalny'], self.feedback['stop'])
-        ))
-        self.rules.append(ctrl.Rule(
-            self.sila['bardzo_wysoka'] & self.zmeczenie['wyczerpanie'],
-            (self.opor['niski'], self.feedback['stop'])
-        ))
-
-        self.rules.append(ctrl.Rule(
-            self.faza['poczatkowa'] & self.predkosc['bardzo_wolna'] & self.sila['niska'],
-            (self.opor['minimalny'], self.feedback['mocniej'])
-        ))
-        self.rules.append(ctrl.Rule(
-            self.faza['srodkowa'] & self.predkosc['umiarkowana'] & self.sila['srednia'],
-            (self.opor['sredni'], self.feedback['idealnie'])
-        ))
-        self.rules.append(ctrl.Rule(
-            self.faza['koncowa'] & self.predkosc['szybka'] & self.sila['wysoka'],
-            (self.opor['maksymalny'], self.feedback['idealnie'])
-        ))
-        self.rules.append(ctrl.Rule(
-            self.faza['gorna'] & self.tryb['silowy'] & self.sila['wysoka'],
-            (self.opor['wysoki'], self.feedback['idealnie'])
-        ))
-        self.rules.append(ctrl.Rule(
-            self.faza['dolna'] & self.predkosc['wolna'] & self.tryb['hipertrofia'],
-            (self.opor['sredni'], self.feedback['idealnie'])
-        ))
+    def __init__(self, backend=fis_config.DEFAULT_BACKEND, lut_shape=None,
+                 defuzzifier=fis_config.DEFAULT_DEFUZZIFIER):
+        self.backend = backend
+        self.defuzzifier = defuzzifier
+        self.timings = None
+        self.lut_shape = tuple(lut_shape or fis_config.LUT_GRID_SHAPE)
+        self.definition = self.load_definition()
+        if self.backend == 'skfuzzy':
+            self.build_system()
+        self.build_engine()
+
+    def load_definition(self) -> FISDefinition:
+        return fis_definition()
+
+    def __getattr__(self, name):
+        # The skfuzzy variables, rules and control system are only needed by
+        # the skfuzzy backend and by callers using them directly (plots, the
+        # simulator), so they are built on demand. skfuzzy (and matplotlib,
+        # which skfuzzy.control imports) is therefore not loaded by machines
+        # with a compiled backend.
+        if name in CONTROL_ATTRIBUTES or name in SYSTEM_ATTRIBUTES:
+            with _SYSTEM_LOCK:
+                if name not in self.__dict__:
+                    if name in CONTROL_ATTRIBUTES:
+                        self.build_control_variables()
+                    else:
+                        self.build_system()
+            if name in self.__dict__:
+                return self.__dict__[name]
+        raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+
+    @property
+    def rule_count(self) -> int:
+        return len(self.definition.rules)
+
+    def build_control_variables(self):
+        """skfuzzy Antecedents, Consequents and rules of the definition."""
+        from skfuzzy import control as ctrl
+
+        for name, variable in self.definition.variables.items():
+            kind = ctrl.Antecedent if name in fis_config.INPUT_ORDER else ctrl.Consequent
+            # skfuzzy owns (and may write to) its arrays: give it copies.
+            control = kind(np.array(variable.universe), variable.label)
+            for term_name, memberships in zip(variable.term_names, variable.memberships):
+                control[term_name] = np.array(memberships)
+            setattr(self, name, control)
+
+        def term(name, term_name):
+            return getattr(self, name)[term_name]
+
+        self.rules = [
+            ctrl.Rule(
+                functools.reduce(operator.and_, (term(*item) for item in rule.antecedents)),
+                tuple(term(*item) for item in rule.consequents),
+            )
+            for rule in self.definition.rules
+        ]
 
     def build_system(self):
         """Budowa systemu sterowania rozmytego."""
+        from skfuzzy import control as ctrl
+
         self.system = ctrl.ControlSystem(self.rules)
         self.simulator = ctrl.ControlSystemSimulation(self.system)
+        # skfuzzy keeps simulation state on the shared antecedents and terms
+        # (even across separate simulations), so runs must not overlap.
+        self.simulation_lock = threading.Lock()
+
+    def build_engine(self):
+        if self.backend not in fis_config.FIS_BACKENDS:
+            raise ValueError(f"Unknown FIS backend: {self.backend}")
+        if self.defuzzifier not in fis_config.DEFUZZIFIERS:
+            raise ValueError(f"Unknown defuzzifier: {self.defuzzifier}")
+        if self.backend == 'skfuzzy':
+            if self.defuzzifier != 'sampled':
+                raise ValueError("The skfuzzy backend only supports sampled defuzzification")
+            self.engine = None
+            return
+
+        cache = ArtifactCache.default()
+        key = artifact_key(self) if cache else None
+        self.engine = cache.load(key) if cache else None
+        if self.engine is not None:
+            return
+
+        engine_class = SparseCompiledFIS if self.backend == 'sparse' else CompiledFIS
+        self.engine = engine_class.from_definition(self.definition, self.defuzzifier)
+        if self.backend == 'lut':
+            exact = self.engine
+            self.engine = FISLookupTable.build(exact, self.lut_shape)
+            self.engine.measure_error(exact)
+        if cache:
+            cache.store(key, self.engine)
 
     def compute(self, sila_val, predkosc_val, faza_val, zmeczenie_val, tryb_val):
+        if self.engine is not None:
+            return self._compute_compiled(sila_val, predkosc_val, faza_val, zmeczenie_val, tryb_val)
 
-        self.simulator.reset()
-
-        self.simulator.input['sila_generowana'] = sila_val
-        self.simulator.input['predkosc_ruchu'] = predkosc_val
-        self.simulator.input['faza_ruchu'] = faza_val
-        self.simulator.input['wskaznik_zmeczenia'] = zmeczenie_val
-        self.simulator.input['tryb_treningu'] = tryb_val
+        with self.simulation_lock:
+            return self._compute_simulated(sila_val, predkosc_val, faza_val, zmeczenie_val, tryb_val)
 
+    def _compute_simulated(self, *values):
+        self.simulator.reset()
+        opor, feedback = (variable.label for variable in self.definition.outputs)
         try:
+            for variable, value in zip(self.definition.inputs, values):
+                self.simulator.input[variable.label] = value
             self.simulator.compute()
+            feedback_val = self.simulator.output[feedback]
             return {
-                'opor': self.simulator.output['opor_maszyny'],
-                'feedback': self.simulator.output['sygnal_feedback'],
-                'feedback_text': self._get_feedback_text(self.simulator.output['sygnal_feedback'])
+                'opor': self.simulator.output[opor],
+                'feedback': feedback_val,
+                'feedback_text': self._get_feedback_text(feedback_val)
             }
         except Exception as e:
-            return {
-                'opor': 50.0,
-                'feedback': 3.0,
-                'feedback_text': 'DOBRZE',
-                'error': str(e)
+            return fallback_result(str(e))
+
+    def instrument(self, timings):
+        """Attach a ``StageTimings`` (or None to detach) to the machine and its engine."""
+        if timings is not None and self.engine is None:
+            raise ValueError("Stage timings need a compiled backend")
+        self.timings = timings
+        if self.engine is not None:
+            self.engine.timings = timings
+
+    def _compute_compiled(self, *values):
+        # Read once: instrument() may detach the timings from another thread.
+        timings = self.timings
+        mark = time.perf_counter_ns() if timings is not None else 0
+        opor, feedback, valid = self.engine.evaluate([values])
+        if not valid[0]:
+            result = fallback_result('No rule fired for the given inputs')
+        else:
+            result = {
+                'opor': opor[0],
+                'feedback': feedback[0],
+                'feedback_text': self._get_feedback_text(feedback[0])
             }
+        if timings is not None:
+            timings.lap('compute', mark)
+        return result
+
+    def compute_batch(self, inputs):
+        """Evaluate an (N, 5) array of (sila, predkosc, faza, zmeczenie, tryb) rows."""
+        inputs = np.atleast_2d(np.asarray(inputs, dtype=np.float64))
+        if self.engine is not None:
+            timings = self.timings
+            mark = time.perf_counter_ns() if timings is not None else 0
+            opor, feedback, valid = self.engine.evaluate(inputs)
+            if timings is not None:
+                timings.lap('compute_batch', mark)
+        else:
+            raw = [self.compute(*row) for row in inputs]
+            opor = np.array([item['opor'] for item in raw], dtype=np.float64)
+            feedback = np.array([item['feedback'] for item in raw], dtype=np.float64)
+            valid = np.array(['error' not in item for item in raw], dtype=bool)
+
+        # Rows without a crisp output get the same fallback as compute().
+        return {
+            'opor': np.where(valid, opor, fis_config.FALLBACK_RESISTANCE),
+            'feedback': np.where(valid, feedback, fis_config.FALLBACK_FEEDBACK),
+            'feedback_code': np.where(valid, feedback_codes(feedback), FALLBACK_FEEDBACK_CODE),
+            'valid': valid
+        }
 
     def _get_feedback_text(self, feedback_val):
-        if feedback_val < 1.5:
-            return "ZWOLNIJ"
-        elif feedback_val < 2.5:
-            return "DOBRZE"
-        elif feedback_val < 3.5:
-            return "IDEALNIE"
-        elif feedback_val < 4.5:
-            return "MOCNIEJ"
-        else:
-            return "STOP"
+        return fis_config.FEEDBACK_LABELS[feedback_code(feedback_val)]
 
     def get_membership_functions_table(self):
         tables = []
 
         variables = [
-            ('Siła generowana', 'N', '0-500', self.sila),
-            ('Prędkość ruchu', 'm/s', '0-1.5', self.predkosc),
-            ('Faza ruchu', '% ROM', '0-100', self.faza),
-            ('Wskaźnik zmęczenia', '%', '0-100', self.zmeczenie),
-            ('Tryb treningu', '-', '1-3', self.tryb),
-            ('Opór maszyny (WYJŚCIE)', '%', '0-100', self.opor),
-            ('Sygnał feedbacku (WYJŚCIE)', '-', '1-5', self.feedback),
+            ('Siła generowana', 'N', '0-500', 'sila'),
+            ('Prędkość ruchu', 'm/s', '0-1.5', 'predkosc'),
+            ('Faza ruchu', '% ROM', '0-100', 'faza'),
+            ('Wskaźnik zmęczenia', '%', '0-100', 'zmeczenie'),
+            ('Tryb treningu', '-', '1-3', 'tryb'),
+            ('Opór maszyny (WYJŚCIE)', '%', '0-100', 'opor'),
+            ('Sygnał feedbacku (WYJŚCIE)', '-', '1-5', 'feedback'),
         ]
 
-        for var_name, unit, range_str, var_obj in variables:
+        for var_name, unit, range_str, name in variables:
+            variable = self.definition.variables[name]
             table = f"\n{'='*80}\n"
             table += f"Zmienna: {var_name}\n"
             table += f"Jednostka: {unit} | Zakres: {range_str}\n"
@@ -253,10 +235,8 @@ class IntelligentGymMachine:
             table += f"{'Nazwa zbioru':<20} {'Typ funkcji':<12} {'Parametry (a, b, c, d)':<30}\n"
             table += f"{'-'*80}\n"
 
-            for term_name in var_obj.terms:
-                mf = var_obj[term_name].mf
-                universe = var_obj.universe
-
+            universe = variable.universe
+            for term_name, mf in zip(variable.term_names, variable.memberships):
                 non_zero_indices = np.where(mf > 0)[0]
                 if len(non_zero_indices) > 0:
                     start_idx = non_zero_indices[0]
@@ -0,0 +1,125 @@
+"""Per-stage latency histograms for the inference hot path."""
+import logging
+import threading
+import time
+from typing import Dict, Optional
+
+# Sub-buckets per power of two: values are kept to within 1/16 (~6%).
+SUB_BUCKET_BITS = 4
+SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+# Values up to 2**40 ns (about 18 minutes) are tracked; larger ones land in
+# the last bucket.
+MAX_EXPONENT = 40
+BUCKET_COUNT = 2 * SUB_BUCKETS + (MAX_EXPONENT - SUB_BUCKET_BITS) * SUB_BUCKETS
+
+STAGES = ('fuzzify', 'rules', 'aggregate', 'defuzzify', 'interpolate', 'compute', 'compute_batch')
+PERCENTILES = (50.0, 90.0, 99.0, 99.9)
+
+
+def _bucket_index(nanoseconds: int) -> int:
+    if nanoseconds < 2 * SUB_BUCKETS:
+        return max(nanoseconds, 0)
+    shift = nanoseconds.bit_length() - 1 - SUB_BUCKET_BITS
+    index = SUB_BUCKETS + shift * SUB_BUCKETS + (nanoseconds >> shift) - SUB_BUCKETS
+    return min(index, BUCKET_COUNT - 1)
+
+
+def _bucket_upper(index: int) -> int:
+    """Highest value (ns) that maps to ``index``."""
+    if index < 2 * SUB_BUCKETS:
+        return index
+    shift = (index - SUB_BUCKETS) // SUB_BUCKETS
+    mantissa = SUB_BUCKETS + (index - SUB_BUCKETS) % SUB_BUCKETS
+    return ((mantissa + 1) << shift) - 1
+
+
+class LatencyHistogram:
+    """HDR-style log-linear histogram of durations in nanoseconds.
+
+    Recording is one bucket increment; count, sum, min and max are exact,
+    percentiles are reported as the upper edge of their bucket.
+    """
+
+    def __init__(self):
+        self.counts = [0] * BUCKET_COUNT
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = 0
+
+    def record(self, nanoseconds: int):
+        self.counts[_bucket_index(nanoseconds)] += 1
+        self.count += 1
+        self.total += nanoseconds
+        if self.min is None or nanoseconds < self.min:
+            self.min = nanoseconds
+        if nanoseconds > self.max:
+            self.max = nanoseconds
+
+    def percentile(self, percent: float) -> int:
+        if not self.count:
+            return 0
+        rank = max(1, int(percent / 100.0 * self.count + 0.5))
+        seen = 0
+        for index, bucket in enumerate(self.counts):
+            seen += bucket
+            if seen >= rank:
+                return min(_bucket_upper(index), self.max)
+        return self.max
+
+    def summary(self) -> Dict[str, float]:
+        """Count plus mean/min/max/percentiles in seconds."""
+        summary = {
+            'count': self.count,
+            'mean': self.total / self.count * 1e-9 if self.count else 0.0,
+            'min': (self.min or 0) * 1e-9,
+            'max': self.max * 1e-9,
+        }
+        for percent in PERCENTILES:
+            summary[f'p{percent:g}'] = self.percentile(percent) * 1e-9
+        return summary
+
+
+class StageTimings:
+    """Histograms keyed by stage, fed by ``lap`` calls from the engine.
+
+    Engines hold ``timings = None`` unless instrumented, so the disabled
+    path costs one attribute check per stage boundary. Concurrent callers
+    may share an instance; recording itself is not locked, so counts are
+    approximate under heavy contention.
+    """
+
+    def __init__(self):
+        self.histograms: Dict[str, LatencyHistogram] = {}
+        self._lock = threading.Lock()
+
+    def lap(self, stage: str, since: int) -> int:
+        """Record the time from ``since`` (``time.perf_counter_ns``) to now; return now."""
+        now = time.perf_counter_ns()
+        histogram = self.histograms.get(stage)
+        if histogram is None:
+            with self._lock:
+                histogram = self.histograms.setdefault(stage, LatencyHistogram())
+        histogram.record(now - since)
+        return now
+
+    def reset(self):
+        with self._lock:
+            self.histograms.clear()
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            histograms = dict(self.histograms)
+        ordered = sorted(histograms, key=lambda stage: (
+            STAGES.index(stage) if stage in STAGES else len(STAGES), stage
+        ))
+        return {stage: histograms[stage].summary() for stage in ordered}
+
+    def log(self, logger: logging.Logger, level: int = logging.INFO, title: Optional[str] = None):
+        logger.log(level, "%s", title or "FIS stage timings (us)")
+        for stage, summary in self.stats().items():
+            logger.log(
+                level, "  %-14s n=%-8d mean=%9.1f p50=%9.1f p99=%9.1f max=%9.1f",
+                stage, summary['count'], summary['mean'] * 1e6, summary['p50'] * 1e6,
+                summary['p99'] * 1e6, summary['max'] * 1e6,
+            )
@@ -0,0 +1,106 @@
+"""Tabulated FIS surface answered by multilinear interpolation."""
+import itertools
+import time
+from typing import Dict, Sequence, Tuple
+
+import numpy as np
+
+
+class FISLookupTable:
+    """Regular-grid sample of a compiled engine over all five inputs.
+
+    The table stores ``opor * valid``, ``feedback * valid`` and ``valid`` per
+    node as float32. Interpolation normalises by the interpolated validity so
+    nodes where no rule fired do not drag neighbouring results towards zero;
+    a point is undefined only when all of its corners are.
+    """
+
+    def __init__(self, axes: Sequence[np.ndarray], table: np.ndarray):
+        self.axes = tuple(np.asarray(axis, dtype=np.float64) for axis in axes)
+        self.table = np.ascontiguousarray(table, dtype=np.float32)
+        self.shape = tuple(len(axis) for axis in self.axes)
+        self.low = np.array([axis[0] for axis in self.axes])
+        self.step = np.array([axis[1] - axis[0] for axis in self.axes])
+        self.upper_index = np.array(self.shape) - 2
+        self._flat = self.table.reshape(-1, self.table.shape[-1])
+        self._strides = np.array([int(np.prod(self.shape[dim + 1:])) for dim in range(len(self.shape))])
+        self._corners = np.array(list(itertools.product((0, 1), repeat=len(self.shape))), dtype=np.intp)
+        self._corner_offsets = self._corners @ self._strides
+        self.error_stats: Dict[str, float] = {}
+        self.timings = None
+
+    @classmethod
+    def build(cls, engine, shape: Sequence[int]) -> 'FISLookupTable':
+        if len(shape) != len(engine.inputs) or min(shape) < 2:
+            raise ValueError(f"LUT shape must have {len(engine.inputs)} axes of at least 2 nodes, got {shape}")
+        axes = [np.linspace(*variable.bounds, count) for variable, count in zip(engine.inputs, shape)]
+        grid = np.stack(np.meshgrid(*axes, indexing='ij'), axis=-1).reshape(-1, len(axes))
+        opor, feedback, valid = engine.evaluate(grid)
+        table = np.column_stack([
+            np.where(valid, opor, 0.0),
+            np.where(valid, feedback, 0.0),
+            valid.astype(np.float64),
+        ])
+        return cls(axes, table.reshape(tuple(shape) + (3,)))
+
+    def state(self) -> Tuple[dict, Dict[str, np.ndarray]]:
+        manifest = {'kind': 'lut', 'error_stats': self.error_stats}
+        arrays = {'table': self.table}
+        arrays.update({f'axis{idx}': axis for idx, axis in enumerate(self.axes)})
+        return manifest, arrays
+
+    @classmethod
+    def from_state(cls, manifest: dict, arrays: Dict[str, np.ndarray]) -> 'FISLookupTable':
+        table = arrays['table']
+        axes = [arrays[f'axis{idx}'] for idx in range(table.ndim - 1)]
+        lut = cls(axes, table)
+        lut.error_stats = dict(manifest.get('error_stats', {}))
+        return lut
+
+    @property
+    def nbytes(self) -> int:
+        return self.table.nbytes
+
+    def evaluate(self, inputs) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Same contract as ``CompiledFIS.evaluate``."""
+        inputs = np.atleast_2d(np.asarray(inputs, dtype=np.float64))
+        if inputs.shape[1] != len(self.shape):
+            raise ValueError(f"Expected {len(self.shape)} input columns, got {inputs.shape[1]}")
+
+        timings = self.timings
+        mark = time.perf_counter_ns() if timings is not None else 0
+        position = (inputs - self.low) / self.step
+        position = np.clip(position, 0, self.upper_index + 1)
+        index = np.minimum(position.astype(np.intp), self.upper_index)
+        frac = position - index
+
+        weights = np.where(self._corners[None, :, :], frac[:, None, :], 1.0 - frac[:, None, :]).prod(axis=2)
+        base = index @ self._strides
+        corners = self._flat[base[:, None] + self._corner_offsets[None, :]]
+        opor_sum, feedback_sum, weight_sum = np.einsum('nc,nck->kn', weights, corners)
+
+        valid = weight_sum > 1e-6
+        with np.errstate(invalid='ignore', divide='ignore'):
+            opor = np.where(valid, opor_sum / weight_sum, np.nan)
+            feedback = np.where(valid, feedback_sum / weight_sum, np.nan)
+        if timings is not None:
+            timings.lap('interpolate', mark)
+        return opor, feedback, valid
+
+    def measure_error(self, engine, samples: int = 2000, seed: int = 0) -> Dict[str, float]:
+        """Max/mean absolute error versus ``engine`` on uniformly random inputs."""
+        rng = np.random.default_rng(seed)
+        inputs = np.column_stack([rng.uniform(axis[0], axis[-1], samples) for axis in self.axes])
+        exact_opor, exact_feedback, exact_valid = engine.evaluate(inputs)
+        opor, feedback, valid = self.evaluate(inputs)
+        both = exact_valid & valid
+        opor_error = np.abs(opor[both] - exact_opor[both])
+        feedback_error = np.abs(feedback[both] - exact_feedback[both])
+        self.error_stats = {
+            'opor_max': float(opor_error.max(initial=0.0)),
+            'opor_mean': float(opor_error.mean()) if both.any() else 0.0,
+            'feedback_max': float(feedback_error.max(initial=0.0)),
+            'feedback_mean': float(feedback_error.mean()) if both.any() else 0.0,
+            'validity_mismatch': float(np.mean(exact_valid != valid)),
+        }
+        return self.error_stats
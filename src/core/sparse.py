@@ -0,0 +1,218 @@
+"""Compiled engine that only evaluates rules with non-zero firing strength."""
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from src.core.compiled import CHUNK_ROWS, CompiledFIS, CompiledVariable, _segment_integrals
+
+# Above this fraction of candidate (row, rule) pairs the index prunes too
+# little to pay for the gathers and a chunk is evaluated densely.
+SPARSE_DENSITY_LIMIT = 0.5
+
+_EPS = np.finfo(float).eps
+
+
+class RuleIndex:
+    """Per-input interval index from term supports to the rules that can fire.
+
+    Each input universe is cut into intervals on which the set of terms with
+    non-zero membership is constant; every interval stores the mask of rules
+    whose antecedent on that input is one of those terms (rules without an
+    antecedent on the input are always allowed). A rule can fire for a sample
+    only if it is allowed on all inputs. The index is conservative: it may
+    keep a rule that fires at exactly zero, but never drops a firing one.
+    """
+
+    def __init__(self, engine: CompiledFIS):
+        offsets = np.cumsum([0] + [len(variable.term_names) for variable in engine.inputs])
+        self.edges = []
+        self.masks = []
+        for col, variable in enumerate(engine.inputs):
+            # Memberships are linear between grid points, so a term is
+            # non-zero inside a segment iff it is non-zero at either end.
+            mf = variable.memberships
+            term_active = (mf[:, :-1] > 0) | (mf[:, 1:] > 0)
+            segment_masks = np.ones((len(variable.widths), engine.rule_count), dtype=bool)
+            for rule, terms in enumerate(engine.rule_antecedents):
+                own = terms[(terms >= offsets[col]) & (terms < offsets[col + 1])] - offsets[col]
+                for term in own:
+                    segment_masks[:, rule] &= term_active[term]
+            starts = np.flatnonzero(np.r_[True, (segment_masks[1:] != segment_masks[:-1]).any(axis=1)])
+            self.edges.append(variable.universe[starts])
+            self.masks.append(segment_masks[starts])
+
+    @property
+    def interval_counts(self) -> Tuple[int, ...]:
+        return tuple(len(edges) for edges in self.edges)
+
+    def candidates(self, inputs: np.ndarray) -> np.ndarray:
+        """(N, rules) mask of rules that may have non-zero firing strength."""
+        active = np.ones((len(inputs), self.masks[0].shape[1]), dtype=bool)
+        for col, (edges, masks) in enumerate(zip(self.edges, self.masks)):
+            interval = np.searchsorted(edges, inputs[:, col], side='right') - 1
+            np.maximum(interval, 0, out=interval)
+            active &= masks[interval]
+        return active
+
+
+class SparseCompiledFIS(CompiledFIS):
+    """``CompiledFIS`` evaluating only candidate rules and active output terms.
+
+    Firing strengths are computed for the (row, rule) pairs selected by the
+    ``RuleIndex`` and max-accumulated straight into the term cuts; the
+    centroid then clips and aggregates only terms with a non-zero cut.
+    Chunks the index cannot prune (smooth MFs with full support) fall back
+    to the dense path. Results are identical to the dense engine.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.rule_index = RuleIndex(self)
+        # Engines are shared between threads (service pool, server, GUI
+        # worker); the statistics are the only state evaluate() touches.
+        self._stats_lock = threading.Lock()
+        self._active_rules = 0
+        self._rows = 0
+
+    def state(self) -> Tuple[dict, Dict[str, np.ndarray]]:
+        manifest, arrays = super().state()
+        manifest['kind'] = 'sparse'
+        return manifest, arrays
+
+    @property
+    def mean_active_rules(self) -> float:
+        """Average number of rules evaluated per row since construction."""
+        with self._stats_lock:
+            return self._active_rules / self._rows if self._rows else 0.0
+
+    def sparse_cuts(self, inputs: np.ndarray) -> Optional[Tuple[np.ndarray, ...]]:
+        """Same result as ``term_cuts(firing_strengths(inputs))``.
+
+        Returns None when more than ``SPARSE_DENSITY_LIMIT`` of the rules are
+        candidates, in which case the dense path is cheaper.
+        """
+        timings = self.timings
+        mark = time.perf_counter_ns() if timings is not None else 0
+        candidates = self.rule_index.candidates(inputs)
+        rows, rules = np.nonzero(candidates)
+        with self._stats_lock:
+            self._active_rules += len(rows)
+            self._rows += len(inputs)
+        if len(rows) > SPARSE_DENSITY_LIMIT * candidates.size:
+            return None
+
+        stacked = self.fuzzify(inputs)
+        if timings is not None:
+            mark = timings.lap('fuzzify', mark)
+        firing = stacked[rows[:, None], self.rule_antecedents[rules]].min(axis=1)
+        if timings is not None:
+            mark = timings.lap('rules', mark)
+
+        cuts = []
+        for col, variable in enumerate(self.outputs):
+            cut = np.zeros((len(inputs), len(variable.term_names)))
+            terms = self.rule_consequents[rules, col]
+            speaks = terms >= 0
+            np.maximum.at(
+                cut, (rows[speaks], terms[speaks]), firing[speaks] * self.rule_weights[rules[speaks], col]
+            )
+            cuts.append(cut)
+        if timings is not None:
+            timings.lap('aggregate', mark)
+        return tuple(cuts)
+
+    def evaluate(self, inputs) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        inputs = np.atleast_2d(np.asarray(inputs, dtype=np.float64))
+        if inputs.shape[1] != len(self.inputs):
+            raise ValueError(f"Expected {len(self.inputs)} input columns, got {inputs.shape[1]}")
+
+        timings = self.timings
+        results = np.empty((len(self.outputs), len(inputs)), dtype=np.float64)
+        for start in range(0, len(inputs), CHUNK_ROWS):
+            chunk = slice(start, start + CHUNK_ROWS)
+            cuts = self.sparse_cuts(inputs[chunk])
+            if cuts is None:
+                self._evaluate_chunk(inputs[chunk], results[:, chunk])
+                continue
+            mark = time.perf_counter_ns() if timings is not None else 0
+            for col, (variable, cut) in enumerate(zip(self.outputs, cuts)):
+                analytic = self.analytic[col]
+                if analytic is not None:
+                    results[col, chunk] = analytic(cut)
+                else:
+                    results[col, chunk] = _sparse_centroid(variable, cut)
+            if timings is not None:
+                timings.lap('defuzzify', mark)
+
+        valid = ~np.isnan(results).any(axis=0)
+        return results[0], results[1], valid
+
+
+def _sparse_centroid(variable: CompiledVariable, cuts: np.ndarray) -> np.ndarray:
+    """``_centroid`` restricted to the (row, term) pairs with a non-zero cut."""
+    result = np.full(len(cuts), np.nan)
+    rows, terms = np.nonzero(cuts > 0)
+    if not len(rows):
+        return result
+
+    universe = variable.universe
+    mf = variable.memberships
+    new_row = np.empty(len(rows), dtype=bool)
+    new_row[0] = True
+    np.not_equal(rows[1:], rows[:-1], out=new_row[1:])
+    starts = np.flatnonzero(new_row)
+    owners = rows[starts]
+    group = np.cumsum(new_row) - 1
+    slot = np.arange(len(rows)) - starts[group]
+
+    levels = cuts[rows, terms][:, None]
+    term_mf = mf[terms]
+    clipped = np.minimum(levels, term_mf)
+    above = term_mf >= levels
+    pair_crossing = above[:, :-1] != above[:, 1:]
+
+    # Rows have at most a handful of active terms: fold them slot by slot,
+    # the first slot covering every row exactly once.
+    aggregated = clipped[starts]
+    crossing = pair_crossing[starts]
+    for position in range(1, slot.max() + 1):
+        pick = slot == position
+        owner = group[pick]
+        aggregated[owner] = np.maximum(aggregated[owner], clipped[pick])
+        crossing[owner] |= pair_crossing[pick]
+    area, moment = _segment_integrals(universe[:-1], universe[1:], aggregated[:, :-1], aggregated[:, 1:])
+
+    hits, segments = np.nonzero(crossing)
+    if len(hits):
+        seg_cuts = cuts[owners[hits]]
+        y_left = mf[:, segments].T
+        y_right = mf[:, segments + 1].T
+        slope = variable.slopes[:, segments].T
+        term_crossing = ((y_left >= seg_cuts) != (y_right >= seg_cuts)) & (seg_cuts > 0)
+        offsets = np.where(
+            term_crossing,
+            (seg_cuts - y_left) / np.where(slope == 0, 1.0, slope),
+            0.0,
+        )
+        offsets.sort(axis=1)
+        widths = variable.widths[segments]
+        offsets = np.hstack([np.zeros((len(hits), 1)), offsets, widths[:, None]])
+
+        values = np.minimum(
+            seg_cuts[:, None, :],
+            y_left[:, None, :] + slope[:, None, :] * offsets[:, :, None],
+        ).max(axis=2)
+        points = universe[segments][:, None] + offsets
+        sub_area, sub_moment = _segment_integrals(points[:, :-1], points[:, 1:], values[:, :-1], values[:, 1:])
+        area[hits, segments] = sub_area.sum(axis=1)
+        moment[hits, segments] = sub_moment.sum(axis=1)
+
+    total_area = area.sum(axis=1)
+    empty = ~(aggregated > 0).any(axis=1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        centroid = moment.sum(axis=1) / np.fmax(total_area, _EPS)
+    centroid[empty] = np.nan
+    result[owners] = centroid
+    return result
@@ -0,0 +1,149 @@
+import abc
+import threading
+from typing import Dict, Optional, Tuple
+
+from PyQt5.QtCore import QObject, QThread, pyqtSignal
+
+from src.services.fis_service import FISInputs, FISService
+
+
+class _ThreadedWorkerMeta(type(QObject), abc.ABCMeta):
+    pass
+
+
+class _ThreadedWorker(QObject, metaclass=_ThreadedWorkerMeta):
+    """QObject living on its own QThread, woken through a queued signal.
+
+    Subclasses keep only the newest pending request under ``_lock`` and
+    consume it in ``_process``; extra wake-ups find nothing to do.
+    """
+
+    failed = pyqtSignal(str)
+    _wake = pyqtSignal()
+
+    def __init__(self, service: FISService, name: str):
+        super().__init__()
+        self.service = service
+        self._lock = threading.Lock()
+
+        self._thread = QThread()
+        self._thread.setObjectName(name)
+        self.moveToThread(self._thread)
+        # The worker lives on its thread, so the wake-up is a queued call.
+        self._wake.connect(self._process)
+        self._thread.start()
+
+    def stop(self):
+        """Finish the request in progress, drop the rest and join the thread."""
+        with self._lock:
+            self._clear_pending()
+        self._thread.quit()
+        self._thread.wait()
+
+    @abc.abstractmethod
+    def _clear_pending(self):
+        """Drop pending requests; called with ``_lock`` held."""
+
+    @abc.abstractmethod
+    def _process(self):
+        """Take the pending request and run it on the worker thread."""
+
+
+class FISWorker(_ThreadedWorker):
+    """Runs evaluations and MF type switches for the GUI on its own thread.
+
+    ``evaluate`` and ``change_mf_type`` may be called as often as the UI
+    likes: each only replaces the pending request and wakes the worker, so a
+    burst of slider moves collapses into one inference on the newest values.
+    A result that is already superseded by a newer request when it finishes
+    is not posted. A pending switch runs before a pending evaluation, so the
+    evaluation uses the newly selected MF type.
+    """
+
+    resultReady = pyqtSignal(object, object, str)
+    mfTypeChanged = pyqtSignal(str, object, int)
+
+    def __init__(self, service: FISService):
+        self._pending_inputs: Optional[FISInputs] = None
+        self._pending_mf_type: Optional[str] = None
+        super().__init__(service, 'fis-worker')
+
+    def evaluate(self, inputs: FISInputs):
+        with self._lock:
+            self._pending_inputs = inputs
+        self._wake.emit()
+
+    def change_mf_type(self, mf_type: str):
+        with self._lock:
+            self._pending_mf_type = mf_type
+        self._wake.emit()
+
+    def _clear_pending(self):
+        self._pending_inputs = self._pending_mf_type = None
+
+    def _process(self):
+        with self._lock:
+            mf_type, self._pending_mf_type = self._pending_mf_type, None
+        if mf_type is not None:
+            try:
+                self.service.change_mf_type(mf_type)
+            except Exception as exc:
+                self.failed.emit(str(exc))
+            else:
+                if not self._superseded(switch_only=True):
+                    self.mfTypeChanged.emit(mf_type, self.service.get_membership_plot_data(),
+                                            self.service.rule_count)
+
+        with self._lock:
+            inputs, self._pending_inputs = self._pending_inputs, None
+        if inputs is None:
+            return
+        try:
+            result = self.service.compute(inputs)
+        except Exception as exc:
+            self.failed.emit(str(exc))
+            return
+        if not self._superseded():
+            self.resultReady.emit(inputs, result, self.service.current_mf_label)
+
+    def _superseded(self, switch_only: bool = False) -> bool:
+        with self._lock:
+            return self._pending_mf_type is not None or (not switch_only and self._pending_inputs is not None)
+
+
+class SurfaceWorker(_ThreadedWorker):
+    """Computes inference surfaces for the GUI, newest request only.
+
+    Surfaces take far longer than one evaluation, so they run on a thread
+    of their own and never delay live results. ``FISService`` caches them,
+    so repeating a request (e.g. while an axis input moves) is cheap.
+    """
+
+    surfaceReady = pyqtSignal(object)
+
+    def __init__(self, service: FISService):
+        self._pending: Optional[Tuple[str, str, Dict[str, float]]] = None
+        super().__init__(service, 'fis-surface')
+
+    def request(self, x_name: str, y_name: str, fixed_values: Dict[str, float]):
+        with self._lock:
+            self._pending = (x_name, y_name, fixed_values)
+        self._wake.emit()
+
+    def _clear_pending(self):
+        self._pending = None
+
+    def _process(self):
+        with self._lock:
+            request, self._pending = self._pending, None
+        if request is None:
+            return
+        try:
+            surface = self.service.compute_surface(*request)
+        except Exception as exc:
+            self.failed.emit(str(exc))
+            return
+        with self._lock:
+            superseded = self._pending is not None
+        if not superseded:
+            self.surfaceReady.emit(surface)
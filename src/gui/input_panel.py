@@ -2,7 +2,7 @@ from typing import Dict
 
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QSlider,
-    QDoubleSpinBox, QComboBox, QPushButton, QGroupBox
+    QDoubleSpinBox, QComboBox, QPushButton, QGroupBox, QCheckBox
 )
 from PyQt5.QtCore import Qt, pyqtSignal
 
@@ -103,6 +103,9 @@ class InputPanel(QWidget):
 
     evaluateClicked = pyqtSignal()
     mfTypeChanged = pyqtSignal(str)
+    # Any input value changed; emitted on every slider tick.
+    inputsChanged = pyqtSignal()
+    liveModeToggled = pyqtSignal(bool)
 
     def __init__(self):
         super().__init__()
@@ -123,6 +126,7 @@ class InputPanel(QWidget):
                 step=config.step,
                 decimals=config.decimals,
             )
+            slider.valueChanged.connect(self.inputsChanged)
             self.sliders[identifier] = slider
             group_layout.addWidget(slider)
 
@@ -139,6 +143,7 @@ class InputPanel(QWidget):
         )
         self.tryb_combo.setCurrentIndex(default_training_index)
         self.default_training_index = default_training_index
+        self.tryb_combo.currentIndexChanged.connect(self.inputsChanged)
         mode_row.addWidget(mode_label)
         mode_row.addWidget(self.tryb_combo, 1)
         group_layout.addLayout(mode_row)
@@ -159,6 +164,10 @@ class InputPanel(QWidget):
         mf_layout.addWidget(self.mf_combo)
         layout.addWidget(mf_group)
 
+        self.live_check = QCheckBox("Live update (evaluate while sliders move)")
+        self.live_check.toggled.connect(self.liveModeToggled)
+        layout.addWidget(self.live_check)
+
         btn_layout = QHBoxLayout()
         btn_layout.setSpacing(10)
 
@@ -180,6 +189,9 @@ class InputPanel(QWidget):
         _, mf_type = fis_config.MF_TYPE_OPTIONS[index]
         self.mfTypeChanged.emit(mf_type)
 
+    def is_live(self) -> bool:
+        return self.live_check.isChecked()
+
     def _reset_all(self):
         for slider in self.sliders.values():
             slider.reset()
@@ -1,21 +1,33 @@
+from dataclasses import asdict
+
 from PyQt5.QtWidgets import (
     QMainWindow, QWidget, QHBoxLayout, QVBoxLayout,
-    QSplitter, QApplication
+    QSplitter
 )
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtGui import QGuiApplication
 
 from config import fis_config
+from src.gui.fis_worker import FISWorker, SurfaceWorker
 from src.gui.input_panel import InputPanel
 from src.gui.output_panel import OutputPanel
 from src.gui.visualization_panel import VisualizationPanel
 from src.services.fis_service import FISService
 
+# Used when the screen does not report its refresh rate (e.g. offscreen).
+DEFAULT_REFRESH_HZ = 60.0
+
 
 class MainWindow(QMainWindow):
 
     def __init__(self, service: FISService):
         super().__init__()
         self.service = service
+        # Switching MF types from the combo box should not wait for a build.
+        service.preload()
+        # Inference and machine switches run off the UI thread.
+        self.worker = FISWorker(service)
+        self.surface_worker = SurfaceWorker(service)
 
         self.setWindowTitle("Intelligent Gym Machine — FIS Controller")
         self.setMinimumSize(1200, 700)
@@ -54,6 +66,28 @@ class MainWindow(QMainWindow):
 
         self.input_panel.evaluateClicked.connect(self._evaluate)
         self.input_panel.mfTypeChanged.connect(self._change_mf_type)
+        self.input_panel.inputsChanged.connect(self._inputs_changed)
+        self.input_panel.liveModeToggled.connect(self._live_mode_toggled)
+        self.worker.resultReady.connect(self._show_result)
+        self.worker.mfTypeChanged.connect(self._show_mf_type)
+        self.worker.failed.connect(self._show_error)
+        self.surface_worker.surfaceReady.connect(self.viz_panel.surface_tab.show_surface)
+        self.surface_worker.failed.connect(self._show_error)
+        self.viz_panel.surface_tab.axesChanged.connect(self._request_surface)
+        self.viz_panel.surface_tab.set_operating_point(self.input_panel.get_values())
+        self._request_surface()
+
+        # Live mode evaluates at most once per display frame while inputs move.
+        self.live_timer = QTimer(self)
+        self.live_timer.setSingleShot(True)
+        self.live_timer.setInterval(self._frame_interval_ms())
+        self.live_timer.timeout.connect(self._evaluate)
+
+    @staticmethod
+    def _frame_interval_ms() -> int:
+        screen = QGuiApplication.primaryScreen()
+        refresh_hz = screen.refreshRate() if screen is not None else 0.0
+        return max(1, round(1000 / (refresh_hz if refresh_hz > 0 else DEFAULT_REFRESH_HZ)))
 
     def _setup_statusbar(self):
         self._update_status_idle()
@@ -66,25 +100,48 @@ class MainWindow(QMainWindow):
         )
 
     def _change_mf_type(self, mf_type: str):
-        QApplication.setOverrideCursor(Qt.WaitCursor)
-        try:
-            self.service.change_mf_type(mf_type)
-            self.viz_panel.refresh_membership_data()
-            self.output_panel.clear()
-            self._update_status_idle()
-        finally:
-            QApplication.restoreOverrideCursor()
+        if not self.service.is_ready(mf_type):
+            self.statusBar().showMessage(f"Building {fis_config.MF_TYPE_LABELS[mf_type]} machine...")
+        self.worker.change_mf_type(mf_type)
+        if self.input_panel.is_live():
+            self._evaluate()
+
+    def _show_mf_type(self, mf_type: str, membership_data, rule_count: int):
+        self.viz_panel.show_membership_data(membership_data, rule_count)
+        self._request_surface()
+        self.output_panel.clear()
+        self._update_status_idle()
+
+    def _request_surface(self):
+        # Cached per MF type and the inputs off the axes, so this only
+        # computes when one of those changed.
+        x_name, y_name = self.viz_panel.surface_tab.axes()
+        self.surface_worker.request(x_name, y_name, asdict(self.input_panel.get_values()))
+
+    def _inputs_changed(self):
+        self.viz_panel.surface_tab.set_operating_point(self.input_panel.get_values())
+        self._request_surface()
+        # Ticks arriving while the timer runs are picked up when it fires,
+        # so the final slider position is always evaluated.
+        if self.input_panel.is_live() and not self.live_timer.isActive():
+            self.live_timer.start()
+
+    def _live_mode_toggled(self, live: bool):
+        if live:
+            self._evaluate()
+        else:
+            self.live_timer.stop()
 
     def _evaluate(self):
-        inputs = self.input_panel.get_values()
-        result = self.service.compute(inputs)
+        self.worker.evaluate(self.input_panel.get_values())
 
+    def _show_result(self, inputs, result, mf_label: str):
         self.output_panel.update_results(result)
         self.viz_panel.update_results(result)
 
         mode_label = fis_config.TRAINING_MODE_STATUS_NAMES.get(inputs.tryb, str(inputs.tryb))
         self.statusBar().showMessage(
-            f"[{self.service.current_mf_label}]  "
+            f"[{mf_label}]  "
             f"Force={inputs.sila:.0f}N, "
             f"Speed={inputs.predkosc:.2f}m/s, "
             f"Phase={inputs.faza:.0f}%, "
@@ -93,3 +150,11 @@ class MainWindow(QMainWindow):
             f"Resistance={result.resistance:.1f}%, "
             f"Feedback={result.feedback_text}"
         )
+
+    def _show_error(self, message: str):
+        self.statusBar().showMessage(f"Error: {message}")
+
+    def closeEvent(self, event):
+        self.worker.stop()
+        self.surface_worker.stop()
+        super().closeEvent(event)
@@ -168,6 +168,23 @@ APP_STYLESHEET = f"""
         border: 1px solid {ACCENT};
     }}
 
+    QCheckBox {{
+        color: {TEXT_SECONDARY};
+        font-size: 12px;
+        spacing: 8px;
+    }}
+    QCheckBox::indicator {{
+        width: 14px;
+        height: 14px;
+        border: 1px solid {BORDER_HOVER};
+        border-radius: 3px;
+        background-color: {BG_ELEMENT};
+    }}
+    QCheckBox::indicator:checked {{
+        background-color: {ACCENT};
+        border: 1px solid {ACCENT};
+    }}
+
     QTabWidget::pane {{
         border: 1px solid {BORDER};
         border-radius: 6px;
@@ -1,12 +1,16 @@
 from typing import Optional, Tuple
 
+import numpy as np
 import matplotlib
 matplotlib.use('Qt5Agg')
-from PyQt5.QtWidgets import QWidget, QVBoxLayout, QTabWidget
+from PyQt5.QtCore import pyqtSignal
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QComboBox, QTabWidget
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
+from matplotlib.patches import Rectangle
 
-from src.services.fis_service import FISResult, FISService, MembershipPlotData
+from config import fis_config
+from src.services.fis_service import FISInputs, FISResult, FISService, MembershipPlotData, SurfaceData
 
 
 # Color palette for dark mode visualizations
@@ -30,6 +34,52 @@ def apply_dark_style(ax):
     ax.grid(True, alpha=0.25, color=DARK_GRID, linewidth=0.5)
 
 
+class BlitManager:
+    """Redraws a canvas' animated artists over a cached background.
+
+    The background (everything not marked ``animated``) is captured on every
+    full draw, so resizes and data changes that call ``canvas.draw`` keep it
+    current; ``update`` then only repaints the animated artists.
+    """
+
+    def __init__(self, canvas, artists=()):
+        self.canvas = canvas
+        self.artists = []
+        self._background = None
+        for artist in artists:
+            self.add(artist)
+        canvas.mpl_connect('draw_event', self._on_draw)
+
+    def add(self, artist):
+        artist.set_animated(True)
+        self.artists.append(artist)
+
+    def _on_draw(self, event):
+        self._background = self.canvas.copy_from_bbox(self.canvas.figure.bbox)
+        self._draw_animated()
+
+    def _draw_animated(self):
+        for artist in self.artists:
+            self.canvas.figure.draw_artist(artist)
+
+    def update(self):
+        if self._background is None:
+            # Not drawn yet (e.g. the tab is hidden); the first draw paints everything.
+            self.canvas.draw_idle()
+            return
+        self.canvas.restore_region(self._background)
+        self._draw_animated()
+        self.canvas.blit(self.canvas.figure.bbox)
+
+
+def _same_layout(old: Tuple[MembershipPlotData, ...], new: Tuple[MembershipPlotData, ...]) -> bool:
+    """True when ``new`` can be shown by updating the artists created for ``old``."""
+    return len(old) == len(new) and all(
+        a.identifier == b.identifier and len(a.terms) == len(b.terms) and len(a.universe) == len(b.universe)
+        for a, b in zip(old, new)
+    )
+
+
 class MembershipFunctionsTab(QWidget):
 
     def __init__(self, membership_data: Tuple[MembershipPlotData, ...], rule_count: int):
@@ -47,22 +97,55 @@ class MembershipFunctionsTab(QWidget):
         self._draw()
 
     def update_membership_data(self, membership_data: Tuple[MembershipPlotData, ...], rule_count: int):
+        previous = self.membership_data
         self.membership_data = membership_data
         self.rule_count = rule_count
-        self._draw()
+        if not _same_layout(previous, membership_data):
+            self._draw()
+            return
+
+        # Same variables and terms (every MF type): swap the curves in place.
+        for variable, lines, fills in zip(membership_data, self._lines, self._fills):
+            ax = lines[0].axes
+            for term_idx, (term, line) in enumerate(zip(variable.terms, lines)):
+                line.set_data(variable.universe, term.membership)
+                fills[term_idx].remove()
+                fills[term_idx] = ax.fill_between(variable.universe, term.membership, alpha=0.1,
+                                                  color=line.get_color())
+        self._info_text.set_text(self._info(rule_count))
+        self.canvas.draw_idle()
+
+    @staticmethod
+    def _info(rule_count: int) -> str:
+        return (
+            "FIS CONFIGURATION\n"
+            "──────────────────────\n"
+            "Type:       Mamdani\n"
+            "Defuzz:     Centroid\n"
+            "T-norm:     min\n"
+            "S-norm:     max\n"
+            "Implication: min\n"
+            "Aggregation: max\n"
+            f"Rules:      {rule_count}"
+        )
 
     def _draw(self):
         self.figure.clear()
+        self._lines = []
+        self._fills = []
 
         for idx, variable in enumerate(self.membership_data):
             ax = self.figure.add_subplot(4, 2, idx + 1)
             apply_dark_style(ax)
 
+            lines, fills = [], []
             for term_idx, term in enumerate(variable.terms):
                 color = ACCENT_COLORS[term_idx % len(ACCENT_COLORS)]
-                ax.plot(variable.universe, term.membership, linewidth=2.0,
-                        label=term.name, color=color)
-                ax.fill_between(variable.universe, term.membership, alpha=0.1, color=color)
+                lines.extend(ax.plot(variable.universe, term.membership, linewidth=2.0,
+                                     label=term.name, color=color))
+                fills.append(ax.fill_between(variable.universe, term.membership, alpha=0.1, color=color))
+            self._lines.append(lines)
+            self._fills.append(fills)
 
             ax.set_title(variable.label, fontsize=10, fontweight='bold', color=DARK_TEXT)
             ax.set_ylabel('\u03bc', fontsize=10, color='#cccccc')
@@ -73,28 +156,31 @@ class MembershipFunctionsTab(QWidget):
         ax_info = self.figure.add_subplot(4, 2, 8)
         ax_info.set_facecolor(DARK_BG)
         ax_info.axis('off')
-        info_text = (
-            "FIS CONFIGURATION\n"
-            "──────────────────────\n"
-            "Type:       Mamdani\n"
-            "Defuzz:     Centroid\n"
-            "T-norm:     min\n"
-            "S-norm:     max\n"
-            "Implication: min\n"
-            "Aggregation: max\n"
-            f"Rules:      {self.rule_count}"
-        )
-        ax_info.text(0.5, 0.5, info_text, transform=ax_info.transAxes, fontsize=10,
-                     verticalalignment='center', horizontalalignment='center',
-                     fontfamily='monospace', color='#00e5ff',
-                     bbox=dict(boxstyle='round,pad=0.8', facecolor='#1a1a1a',
-                               edgecolor='#333333', linewidth=1))
+        self._info_text = ax_info.text(
+            0.5, 0.5, self._info(self.rule_count), transform=ax_info.transAxes, fontsize=10,
+            verticalalignment='center', horizontalalignment='center',
+            fontfamily='monospace', color='#00e5ff',
+            bbox=dict(boxstyle='round,pad=0.8', facecolor='#1a1a1a',
+                      edgecolor='#333333', linewidth=1))
 
         self.figure.tight_layout()
         self.canvas.draw()
 
 
 class DefuzzificationTab(QWidget):
+    """Output MFs with the crisp result marked.
+
+    Axes, term curves and legends are built once per membership snapshot;
+    an evaluation only moves the result line, band and label, which are
+    animated artists blitted over the cached background.
+    """
+
+    OUTPUTS = (
+        ('opor', 'Machine Resistance [%]', '.1f'),
+        ('feedback', 'Feedback Signal', '.2f'),
+    )
+    # Half width of the highlighted band around the result, in output units.
+    BAND_HALF_WIDTH = 1.5
 
     def __init__(self, membership_data: Tuple[MembershipPlotData, ...]):
         super().__init__()
@@ -106,6 +192,7 @@ class DefuzzificationTab(QWidget):
         self.figure = Figure(figsize=(10, 5), dpi=100, facecolor=DARK_FACE)
         self.canvas = FigureCanvas(self.figure)
         layout.addWidget(self.canvas)
+        self._blit = BlitManager(self.canvas)
 
         self._draw_empty()
 
@@ -118,11 +205,10 @@ class DefuzzificationTab(QWidget):
 
     def _draw_empty(self):
         self.figure.clear()
+        self._blit.artists = []
+        self._markers = {}
 
-        for idx, (identifier, title) in enumerate([
-            ('opor', 'Machine Resistance [%]'),
-            ('feedback', 'Feedback Signal')
-        ]):
+        for idx, (identifier, title, _) in enumerate(self.OUTPUTS):
             ax = self.figure.add_subplot(1, 2, idx + 1)
             var_data = self._find_variable(identifier)
             apply_dark_style(ax)
@@ -131,7 +217,23 @@ class DefuzzificationTab(QWidget):
                 for term_idx, term in enumerate(var_data.terms):
                     color = ACCENT_COLORS[term_idx % len(ACCENT_COLORS)]
                     ax.plot(var_data.universe, term.membership, linewidth=1.8,
-                            label=term.name, alpha=0.4, color=color)
+                            label=term.name, alpha=0.35, color=color)
+                    ax.fill_between(var_data.universe, term.membership, alpha=0.05, color=color)
+
+                # Kept out of the legend; they only show once a result exists.
+                start = var_data.universe[0]
+                line = ax.axvline(x=start, color='#FF5252', linewidth=3, linestyle='--',
+                                  zorder=10, visible=False)
+                # A Rectangle in data-x / axes-y coordinates rather than
+                # axvspan, which returns a Polygon before matplotlib 3.9.
+                band = Rectangle((start, 0), 0, 1, transform=ax.get_xaxis_transform(),
+                                 alpha=0.2, color='#FF5252', zorder=5, visible=False)
+                ax.add_patch(band)
+                label = ax.text(0.02, 0.95, '', transform=ax.transAxes, fontsize=10, fontweight='bold',
+                                color='#FF5252', verticalalignment='top', zorder=11)
+                for artist in (band, line, label):
+                    self._blit.add(artist)
+                self._markers[identifier] = (line, band, label)
 
             ax.set_title(title, fontweight='bold', fontsize=12, color=DARK_TEXT)
             ax.set_ylabel('\u03bc', fontsize=10)
@@ -139,43 +241,150 @@ class DefuzzificationTab(QWidget):
                       labelcolor='#ffffff')
             ax.set_ylim(-0.05, 1.1)
 
-        self.figure.suptitle('Click EVALUATE to see defuzzification results',
-                             color='#666666', fontsize=12, fontweight='bold')
+        self._hint = self.figure.suptitle('Click EVALUATE to see defuzzification results',
+                                          color='#666666', fontsize=12, fontweight='bold')
         self.figure.tight_layout()
         self.canvas.draw()
 
     def update_results(self, result: FISResult):
-        self.figure.clear()
+        values = {'opor': result.resistance, 'feedback': result.feedback}
+        for identifier, _, fmt in self.OUTPUTS:
+            if identifier not in self._markers:
+                continue
+            line, band, label = self._markers[identifier]
+            value = values[identifier]
+            line.set_xdata([value, value])
+            band.set_x(value - self.BAND_HALF_WIDTH)
+            band.set_width(2 * self.BAND_HALF_WIDTH)
+            label.set_text(f'Result: {value:{fmt}}')
+            for artist in (line, band):
+                artist.set_visible(True)
+
+        if self._hint.get_visible():
+            # The hint is part of the cached background: repaint it once.
+            self._hint.set_visible(False)
+            self.canvas.draw()
+        else:
+            self._blit.update()
+
+
+class SurfaceTab(QWidget):
+    """Resistance heatmap over two chosen inputs with the operating point on top.
+
+    The heatmap is redrawn only when a new surface arrives; moving the
+    inputs just moves the marker and its readout (taken from the surface),
+    which are blitted.
+    """
+
+    axesChanged = pyqtSignal(str, str)
+
+    DEFAULT_AXES = ('sila', 'faza')
+
+    def __init__(self):
+        super().__init__()
+        self.surface: Optional[SurfaceData] = None
+        self._inputs: Optional[FISInputs] = None
+        self._names = list(fis_config.INPUT_VARIABLES)
 
-        for idx, (identifier, value, title, fmt) in enumerate([
-            ('opor', result.resistance, 'Machine Resistance [%]', '.1f'),
-            ('feedback', result.feedback, 'Feedback Signal', '.2f'),
-        ]):
-            var_data = self._find_variable(identifier)
-            ax = self.figure.add_subplot(1, 2, idx + 1)
-            apply_dark_style(ax)
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(4, 4, 4, 4)
 
-            if var_data is not None:
-                for term_idx, term in enumerate(var_data.terms):
-                    color = ACCENT_COLORS[term_idx % len(ACCENT_COLORS)]
-                    ax.plot(var_data.universe, term.membership, linewidth=1.8,
-                            label=term.name, alpha=0.35, color=color)
-                    ax.fill_between(var_data.universe, term.membership, alpha=0.05, color=color)
+        axes_row = QHBoxLayout()
+        self.x_combo = QComboBox()
+        self.y_combo = QComboBox()
+        for combo, default in zip((self.x_combo, self.y_combo), self.DEFAULT_AXES):
+            combo.addItems([config.label for config in fis_config.INPUT_VARIABLES.values()])
+            combo.setCurrentIndex(self._names.index(default))
+        axes_row.addWidget(QLabel("X axis"))
+        axes_row.addWidget(self.x_combo, 1)
+        axes_row.addWidget(QLabel("Y axis"))
+        axes_row.addWidget(self.y_combo, 1)
+        layout.addLayout(axes_row)
+
+        self.figure = Figure(figsize=(10, 6), dpi=100, facecolor=DARK_FACE)
+        self.canvas = FigureCanvas(self.figure)
+        layout.addWidget(self.canvas)
+        self._blit = BlitManager(self.canvas)
 
-                ax.axvline(x=value, color='#FF5252', linewidth=3, linestyle='--',
-                           label=f'Result: {value:{fmt}}', zorder=10)
-                ax.fill_betweenx([0, 1.1], value - 1.5, value + 1.5,
-                                 alpha=0.2, color='#FF5252', zorder=5)
+        self.x_combo.currentIndexChanged.connect(lambda index: self._axis_changed(self.x_combo, self.y_combo))
+        self.y_combo.currentIndexChanged.connect(lambda index: self._axis_changed(self.y_combo, self.x_combo))
 
-            ax.set_title(title, fontweight='bold', fontsize=12, color=DARK_TEXT)
-            ax.set_ylabel('\u03bc', fontsize=10)
-            ax.legend(fontsize=9, facecolor='#1a1a1a', edgecolor='#333333',
-                      labelcolor='#ffffff')
-            ax.set_ylim(-0.05, 1.1)
+        self._draw_empty()
+
+    def axes(self) -> Tuple[str, str]:
+        return self._names[self.x_combo.currentIndex()], self._names[self.y_combo.currentIndex()]
+
+    def _axis_changed(self, changed: QComboBox, other: QComboBox):
+        if changed.currentIndex() == other.currentIndex():
+            # Keep the axes distinct: the other combo takes the next input.
+            other.blockSignals(True)
+            other.setCurrentIndex((other.currentIndex() + 1) % len(self._names))
+            other.blockSignals(False)
+        self._draw_empty()
+        self.axesChanged.emit(*self.axes())
+
+    def _draw_empty(self):
+        self.surface = None
+        self.figure.clear()
+        self._blit.artists = []
+        ax = self.figure.add_subplot(1, 1, 1)
+        apply_dark_style(ax)
+        ax.text(0.5, 0.5, 'Computing surface...', transform=ax.transAxes, color='#666666',
+                fontsize=12, fontweight='bold', horizontalalignment='center')
+        self.canvas.draw()
+
+    def show_surface(self, surface: SurfaceData):
+        if surface is self.surface or (surface.x_name, surface.y_name) != self.axes():
+            return
+        self.surface = surface
+        x_config = fis_config.INPUT_VARIABLES[surface.x_name]
+        y_config = fis_config.INPUT_VARIABLES[surface.y_name]
 
+        self.figure.clear()
+        self._blit.artists = []
+        ax = self.figure.add_subplot(1, 1, 1)
+        apply_dark_style(ax)
+        image = ax.imshow(surface.resistance, origin='lower', aspect='auto', cmap='inferno',
+                          vmin=0, vmax=100, interpolation='bilinear',
+                          extent=(surface.x[0], surface.x[-1], surface.y[0], surface.y[-1]))
+        colorbar = self.figure.colorbar(image, ax=ax)
+        colorbar.set_label('Resistance [%]', color=DARK_TEXT)
+        colorbar.ax.tick_params(colors=DARK_TICK, labelsize=8)
+        ax.set_xlabel(f'{x_config.label} [{x_config.unit}]')
+        ax.set_ylabel(f'{y_config.label} [{y_config.unit}]')
+        fixed = ', '.join(f'{name}={value:g}' for name, value in surface.fixed)
+        ax.set_title(f'{fis_config.MF_TYPE_LABELS.get(surface.mf_type, surface.mf_type)} MFs  |  {fixed}',
+                     fontsize=10, color=DARK_TEXT)
+
+        self._marker, = ax.plot([], [], 'o', markersize=11, markerfacecolor='none',
+                                markeredgecolor='#00e5ff', markeredgewidth=2.5, zorder=10)
+        self._readout = ax.text(0.02, 0.96, '', transform=ax.transAxes, fontsize=10, fontweight='bold',
+                                color='#00e5ff', verticalalignment='top', zorder=11,
+                                bbox=dict(boxstyle='round,pad=0.3', facecolor='#1a1a1a', edgecolor='#333333'))
+        self._blit.add(self._marker)
+        self._blit.add(self._readout)
+        self._place_marker()
         self.figure.tight_layout()
         self.canvas.draw()
 
+    def set_operating_point(self, inputs: FISInputs):
+        self._inputs = inputs
+        if self.surface is not None:
+            self._place_marker()
+            self._blit.update()
+
+    def _place_marker(self):
+        if self._inputs is None:
+            return
+        surface = self.surface
+        x = getattr(self._inputs, surface.x_name)
+        y = getattr(self._inputs, surface.y_name)
+        self._marker.set_data([x], [y])
+        col = int(np.abs(surface.x - x).argmin())
+        row = int(np.abs(surface.y - y).argmin())
+        value = surface.resistance[row, col]
+        self._readout.set_text('no rule fired' if np.isnan(value) else f'Resistance \u2248 {value:.1f}%')
+
 
 class VisualizationPanel(QWidget):
 
@@ -191,16 +400,21 @@ class VisualizationPanel(QWidget):
 
         self.mf_tab = MembershipFunctionsTab(self.membership_data, service.rule_count)
         self.defuzz_tab = DefuzzificationTab(self.membership_data)
+        self.surface_tab = SurfaceTab()
 
         self.tabs.addTab(self.mf_tab, "Membership Functions")
         self.tabs.addTab(self.defuzz_tab, "Defuzzification")
+        self.tabs.addTab(self.surface_tab, "Inference Surface")
 
         layout.addWidget(self.tabs)
 
     def refresh_membership_data(self):
-        self.membership_data = self.service.get_membership_plot_data()
-        self.mf_tab.update_membership_data(self.membership_data, self.service.rule_count)
-        self.defuzz_tab.update_membership_data(self.membership_data)
+        self.show_membership_data(self.service.get_membership_plot_data(), self.service.rule_count)
+
+    def show_membership_data(self, membership_data: Tuple[MembershipPlotData, ...], rule_count: int):
+        self.membership_data = membership_data
+        self.mf_tab.update_membership_data(membership_data, rule_count)
+        self.defuzz_tab.update_membership_data(membership_data)
 
     def update_results(self, result: FISResult):
         self.defuzz_tab.update_results(result)
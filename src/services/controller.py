@@ -0,0 +1,164 @@
+"""Fixed-rate streaming controller on top of FISService."""
+import math
+import time
+from dataclasses import dataclass
+from typing import Callable, Iterable, Iterator, Optional
+
+import numpy as np
+
+from config import fis_config
+from src.core.fis_engine import FALLBACK_FEEDBACK_CODE, feedback_code
+from .fis_service import FISInputs, FISService, LOGGER
+from .session_log import SessionLog
+
+
+@dataclass(frozen=True)
+class ControlCommand:
+    sequence: int
+    resistance: float
+    feedback: float
+    feedback_code: int
+    valid: bool
+    latency: float
+    deadline_missed: bool
+
+    @property
+    def feedback_text(self) -> str:
+        return fis_config.FEEDBACK_LABELS[self.feedback_code]
+
+
+@dataclass(frozen=True)
+class LoopStats:
+    samples: int
+    deadline_misses: int
+    skipped_ticks: int
+    latency_mean: float
+    latency_max: float
+    jitter_mean: float
+    jitter_max: float
+    jitter_std: float
+
+    @property
+    def miss_rate(self) -> float:
+        return self.deadline_misses / self.samples if self.samples else 0.0
+
+
+class RealTimeController:
+    """Runs inference on a stream of sensor samples at a fixed rate.
+
+    Each tick reads one sample (an ``FISInputs`` or a sequence ordered as
+    ``fis_config.INPUT_ORDER``), clamps it into the input universes and
+    evaluates it with the service's compiled engine through a preallocated
+    input row. Jitter is the delay between a tick's scheduled and actual
+    start; a deadline is missed when the command is ready after the next
+    tick is due, in which case the overdue ticks are dropped rather than
+    run back to back. ``rate_hz=None`` free-runs without sleeping.
+    """
+
+    def __init__(self, service: FISService, rate_hz: Optional[float] = fis_config.CONTROL_RATE_HZ,
+                 clock: Callable[[], float] = time.perf_counter,
+                 sleep: Callable[[float], None] = time.sleep):
+        if rate_hz is not None and rate_hz <= 0:
+            raise ValueError(f"rate_hz must be positive, got {rate_hz}")
+        self.service = service
+        self.period = 1.0 / rate_hz if rate_hz else 0.0
+        self.clock = clock
+        self.sleep = sleep
+        self._row = np.empty((1, len(fis_config.INPUT_ORDER)), dtype=np.float64)
+        universes = [fis_config.VARIABLE_UNIVERSES[name] for name in fis_config.INPUT_ORDER]
+        self._low = np.array([universe[0] for universe in universes], dtype=np.float64)
+        self._high = np.array([universe[1] for universe in universes], dtype=np.float64)
+        self._reset_stats()
+
+    def _reset_stats(self):
+        self._samples = 0
+        self._misses = 0
+        self._skipped = 0
+        self._latency_sum = 0.0
+        self._latency_max = 0.0
+        self._jitter_sum = 0.0
+        self._jitter_sq_sum = 0.0
+        self._jitter_max = 0.0
+
+    @property
+    def stats(self) -> LoopStats:
+        count = self._samples or 1
+        jitter_mean = self._jitter_sum / count
+        variance = max(self._jitter_sq_sum / count - jitter_mean ** 2, 0.0)
+        return LoopStats(
+            samples=self._samples,
+            deadline_misses=self._misses,
+            skipped_ticks=self._skipped,
+            latency_mean=self._latency_sum / count,
+            latency_max=self._latency_max,
+            jitter_mean=jitter_mean,
+            jitter_max=self._jitter_max,
+            jitter_std=math.sqrt(variance),
+        )
+
+    def run(self, samples: Iterable, log: Optional[SessionLog] = None) -> Iterator[ControlCommand]:
+        """Yield one command per sample; ``stats`` is updated as the loop runs.
+
+        The engine is captured when iteration starts, so an MF type change
+        on the service takes effect on the next ``run``. With a ``log``
+        (``CONTROL_DTYPE``), every tick is recorded with its clamped inputs.
+        """
+        self._reset_stats()
+        machine = self.service.machine
+        engine = machine.engine
+        if engine is None:
+            raise ValueError(f"Streaming needs a compiled backend, machine uses '{machine.backend}'")
+        row = self._row
+        LOGGER.info("Starting control loop at %s", f"{1.0 / self.period:.0f} Hz" if self.period else "free-run")
+
+        next_tick = self.clock()
+        for sequence, sample in enumerate(samples):
+            if self.period:
+                delay = next_tick - self.clock()
+                if delay > 0:
+                    self.sleep(delay)
+            start = self.clock()
+            jitter = max(start - next_tick, 0.0) if self.period else 0.0
+
+            if isinstance(sample, FISInputs):
+                sample = (sample.sila, sample.predkosc, sample.faza, sample.zmeczenie, sample.tryb)
+            row[0] = sample
+            np.clip(row, self._low, self._high, out=row)
+            opor, feedback, valid = engine.evaluate(row)
+            if valid[0]:
+                resistance = float(opor[0])
+                feedback_value = float(feedback[0])
+                code = feedback_code(feedback_value)
+            else:
+                resistance = fis_config.FALLBACK_RESISTANCE
+                feedback_value = fis_config.FALLBACK_FEEDBACK
+                code = FALLBACK_FEEDBACK_CODE
+
+            end = self.clock()
+            latency = end - start
+            missed = False
+            if self.period:
+                next_tick += self.period
+                if end > next_tick:
+                    missed = True
+                    self._misses += 1
+                    overdue = math.floor((end - next_tick) / self.period) + 1
+                    self._skipped += overdue
+                    next_tick += overdue * self.period
+
+            self._samples += 1
+            self._latency_sum += latency
+            self._latency_max = max(self._latency_max, latency)
+            self._jitter_sum += jitter
+            self._jitter_sq_sum += jitter * jitter
+            self._jitter_max = max(self._jitter_max, jitter)
+            if log is not None:
+                log.append(start, *row[0], resistance, feedback_value, code, valid[0], latency, missed)
+
+            yield ControlCommand(sequence, resistance, feedback_value, code, bool(valid[0]), latency, missed)
+
+        stats = self.stats
+        LOGGER.info(
+            "Control loop finished: %d samples, %d deadline misses, jitter mean %.1f us / max %.1f us",
+            stats.samples, stats.deadline_misses, stats.jitter_mean * 1e6, stats.jitter_max * 1e6,
+        )
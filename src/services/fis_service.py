@@ -1,6 +1,9 @@
 import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Tuple, Optional
+from typing import Dict, Tuple, Optional
 
 import numpy as np
 
@@ -8,6 +11,9 @@ from config import fis_config
 from config.logging_config import configure_logging, LOGGER_NAME
 from src.core.experimental import IntelligentGymMachineExperimental
 from src.core.fis_engine import IntelligentGymMachine
+from src.core.instrumentation import StageTimings
+from .machine_pool import MachinePool
+from .result_cache import CacheStats, QuantizedLRUCache
 
 configure_logging()
 LOGGER = logging.getLogger(LOGGER_NAME)
@@ -30,6 +36,23 @@ class FISResult:
     error: Optional[str] = None
 
 
+# Array-holding dataclasses compare by identity: element-wise ndarray
+# equality cannot be reduced to a single bool.
+@dataclass(frozen=True, eq=False)
+class FISBatchResult:
+    resistance: np.ndarray
+    feedback: np.ndarray
+    feedback_codes: np.ndarray
+    valid: np.ndarray
+
+    def __len__(self):
+        return len(self.resistance)
+
+    @property
+    def feedback_texts(self) -> Tuple[str, ...]:
+        return tuple(fis_config.FEEDBACK_LABELS[code] for code in self.feedback_codes)
+
+
 @dataclass(frozen=True)
 class TermPlotData:
     name: str
@@ -45,42 +68,143 @@ class MembershipPlotData:
     terms: Tuple[TermPlotData, ...]
 
 
+@dataclass(frozen=True, eq=False)
+class SurfaceData:
+    """Resistance over two inputs' slider ranges, the others held at ``fixed``.
+
+    ``resistance`` is (len(y), len(x)) and NaN where no rule fired; the
+    arrays are shared through the cache and therefore read-only.
+    """
+    mf_type: str
+    x_name: str
+    y_name: str
+    fixed: Tuple[Tuple[str, float], ...]
+    x: np.ndarray
+    y: np.ndarray
+    resistance: np.ndarray
+
+
+# Surfaces kept per service, keyed by machine, axes and snapped fixed values.
+SURFACE_CACHE_SIZE = 32
+
+# Rows per task in ``compute_batch_parallel``; large enough to amortize
+# dispatch, small enough to spread a few thousand rows over the workers.
+PARALLEL_CHUNK_ROWS = 1024
+
+
 class ValidationError(ValueError):
     pass
 
 
 class FISService:
-    def __init__(self, mf_type: str = fis_config.DEFAULT_MF_TYPE):
+    """Facade over the active machine; safe to share between threads.
+
+    The compiled engines are stateless and the skfuzzy backend serializes
+    its simulation; each call reads the active machine once and MF type
+    switches are serialized, so concurrent callers never see each other's
+    state.
+    """
+
+    def __init__(self, mf_type: str = fis_config.DEFAULT_MF_TYPE, instrument: bool = False,
+                 cache_size: int = 0, preload: bool = False, batch_workers: Optional[int] = None):
         self.logger = LOGGER
         self._machine = None
+        # (machine, membership snapshot) per MF type; switching swaps entries.
+        self._pool: MachinePool[Tuple[object, Tuple[MembershipPlotData, ...]]] = MachinePool(self._build_entry)
         self._membership_snapshot: Tuple[MembershipPlotData, ...] = ()
+        self._timings: Optional[StageTimings] = StageTimings() if instrument else None
+        # With a cache, inputs are snapped to the slider step grid before
+        # inference so every input in a cell shares the cached result.
+        self._cache: Optional[QuantizedLRUCache] = QuantizedLRUCache(cache_size) if cache_size else None
+        self._surfaces = QuantizedLRUCache(SURFACE_CACHE_SIZE)
+        self._switch_lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._batch_workers = batch_workers or os.cpu_count() or 1
         self.current_mf_type = ''
         self.change_mf_type(mf_type)
+        if preload:
+            self.preload()
 
     def change_mf_type(self, mf_type: str):
         if mf_type not in fis_config.MF_TYPE_LABELS:
             raise ValidationError(f"Unknown MF type: {mf_type}")
         self.logger.info("Switching machine to %s MFs", fis_config.MF_TYPE_LABELS[mf_type])
-        self.current_mf_type = mf_type
+        machine, snapshot = self._pool.get(mf_type)
+        with self._switch_lock:
+            if self._machine is not None and self._machine is not machine:
+                self._machine.instrument(None)
+            machine.instrument(self._timings)
+            self._machine, self._membership_snapshot = machine, snapshot
+            self.current_mf_type = mf_type
+            if self._cache is not None:
+                self._cache.clear()
+
+    def preload(self):
+        """Build the machines of every MF type on a background thread.
+
+        Opt-in for interactive front ends: the builds write to the artifact
+        cache and compete with the caller for CPU while they run.
+        """
+        self._pool.warm(fis_config.MF_TYPE_LABELS)
+
+    def is_ready(self, mf_type: str) -> bool:
+        """True when switching to ``mf_type`` will not have to build a machine."""
+        return self._pool.ready(mf_type)
+
+    def _build_entry(self, mf_type: str):
         if mf_type == fis_config.DEFAULT_MF_TYPE:
-            self._machine = IntelligentGymMachine()
+            machine = IntelligentGymMachine()
         else:
-            self._machine = IntelligentGymMachineExperimental(mf_type=mf_type)
-        self._membership_snapshot = self._snapshot_membership()
+            machine = IntelligentGymMachineExperimental(mf_type=mf_type)
+        return machine, self._snapshot_membership(machine)
+
+    def enable_instrumentation(self, enabled: bool = True):
+        """Start (or stop) recording per-stage timings; stats survive MF type changes."""
+        if enabled and self._timings is None:
+            self._timings = StageTimings()
+        elif not enabled:
+            self._timings = None
+        self._machine.instrument(self._timings)
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Per-stage latency summaries in seconds; empty when not instrumented."""
+        return self._timings.stats() if self._timings is not None else {}
+
+    def reset_stats(self):
+        if self._timings is not None:
+            self._timings.reset()
+
+    def log_stats(self, level: int = logging.INFO):
+        if self._timings is not None:
+            self._timings.log(self.logger, level, f"FIS stage timings (us), {self.current_mf_label} MFs")
 
     def get_membership_plot_data(self) -> Tuple[MembershipPlotData, ...]:
         return self._membership_snapshot
 
+    def cache_stats(self) -> Optional[CacheStats]:
+        return self._cache.stats() if self._cache is not None else None
+
     def compute(self, inputs: FISInputs) -> FISResult:
-        self._validate_inputs(inputs)
+        self.validate_inputs(inputs)
         self.logger.debug("Computing FIS for inputs %s", inputs)
-        raw = self._machine.compute(
-            inputs.sila,
-            inputs.predkosc,
-            inputs.faza,
-            inputs.zmeczenie,
-            inputs.tryb
-        )
+        values = (inputs.sila, inputs.predkosc, inputs.faza, inputs.zmeczenie, inputs.tryb)
+        machine = self._machine
+        if self._cache is None:
+            return self._compute_values(machine, values)
+
+        # Keys carry the machine so a result computed across a concurrent
+        # MF type switch is never served for the new type.
+        key, snapped = self._cache.quantize(values)
+        key = (machine, key)
+        result = self._cache.get(key)
+        if result is None:
+            result = self._compute_values(machine, snapped)
+            self._cache.put(key, result)
+        return result
+
+    @staticmethod
+    def _compute_values(machine, values) -> FISResult:
+        raw = machine.compute(*values)
         return FISResult(
             resistance=raw['opor'],
             feedback=raw['feedback'],
@@ -88,20 +212,132 @@ class FISService:
             error=raw.get('error')
         )
 
-    def _snapshot_membership(self) -> Tuple[MembershipPlotData, ...]:
+    def compute_batch(self, inputs) -> FISBatchResult:
+        """Evaluate an (N, 5) array with columns ordered as ``fis_config.INPUT_ORDER``."""
+        inputs = self._prepare_batch(inputs)
+        self.logger.debug("Computing FIS batch of %d rows", len(inputs))
+        return self._batch_result(self._machine.compute_batch(inputs))
+
+    def compute_batch_parallel(self, inputs, chunk_rows: int = PARALLEL_CHUNK_ROWS) -> FISBatchResult:
+        """``compute_batch`` split into chunks evaluated on the service's thread pool.
+
+        NumPy releases the GIL inside the engine's array kernels, so chunks
+        overlap on multi-core machines. Results equal ``compute_batch``.
+        """
+        inputs = self._prepare_batch(inputs)
+        if chunk_rows <= 0:
+            raise ValidationError(f"chunk_rows must be positive, got {chunk_rows}")
+        machine = self._machine
+        chunks = [inputs[start:start + chunk_rows] for start in range(0, len(inputs), chunk_rows)]
+        if len(chunks) <= 1:
+            return self._batch_result(machine.compute_batch(inputs))
+
+        self.logger.debug("Computing FIS batch of %d rows in %d chunks", len(inputs), len(chunks))
+        parts = list(self._thread_pool().map(machine.compute_batch, chunks))
+        return self._batch_result({key: np.concatenate([part[key] for part in parts]) for key in parts[0]})
+
+    def compute_surface(self, x_name: str, y_name: str, fixed_values: Dict[str, float],
+                        resolution: int = fis_config.SURFACE_RESOLUTION) -> SurfaceData:
+        """Resistance over ``x_name`` x ``y_name``, evaluated once per MF type and fixed values.
+
+        ``fixed_values`` supplies every other input; they are snapped to the
+        slider step grid, so nearby values share one cached surface.
+        """
+        for name in (x_name, y_name):
+            if name not in fis_config.INPUT_VARIABLES:
+                raise ValidationError(f"Unknown surface axis: {name}")
+        if x_name == y_name:
+            raise ValidationError(f"Surface axes must differ, got {x_name} twice")
+        missing = [name for name in fis_config.INPUT_ORDER if name not in (x_name, y_name) and name not in fixed_values]
+        if missing:
+            raise ValidationError(f"Missing fixed values for: {', '.join(missing)}")
+        with self._switch_lock:
+            machine, mf_type = self._machine, self.current_mf_type
+
+        axes = (x_name, y_name)
+        values = tuple(0.0 if name in axes else fixed_values[name] for name in fis_config.INPUT_ORDER)
+        key, snapped = self._surfaces.quantize(values)
+        key = (machine, x_name, y_name, resolution, key)
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            return surface
+
+        x, y = (np.linspace(fis_config.INPUT_VARIABLES[name].range_min,
+                            fis_config.INPUT_VARIABLES[name].range_max, resolution) for name in axes)
+        X, Y = np.meshgrid(x, y)
+        columns = []
+        for name, value in zip(fis_config.INPUT_ORDER, snapped):
+            if name == x_name:
+                columns.append(X.ravel())
+            elif name == y_name:
+                columns.append(Y.ravel())
+            else:
+                columns.append(np.full(X.size, value))
+        self.logger.debug("Computing %s x %s surface (%d rows)", x_name, y_name, X.size)
+        raw = machine.compute_batch(self._prepare_batch(np.column_stack(columns)))
+        resistance = np.where(raw['valid'], raw['opor'], np.nan).reshape(X.shape)
+        for array in (x, y, resistance):
+            array.flags.writeable = False
+        fixed = tuple((name, float(value)) for name, value in zip(fis_config.INPUT_ORDER, snapped) if name not in axes)
+        surface = SurfaceData(mf_type, x_name, y_name, fixed, x, y, resistance)
+        self._surfaces.put(key, surface)
+        return surface
+
+    def close(self):
+        """Stop the batch thread pool and any pending background machine builds."""
+        with self._switch_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+        self._pool.shutdown()
+
+    def _thread_pool(self) -> ThreadPoolExecutor:
+        with self._switch_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self._batch_workers, thread_name_prefix='fis-batch')
+            return self._executor
+
+    def _prepare_batch(self, inputs) -> np.ndarray:
+        inputs = np.asarray(inputs, dtype=np.float64)
+        if inputs.ndim != 2 or inputs.shape[1] != len(fis_config.INPUT_ORDER):
+            raise ValidationError(
+                f"Expected array of shape (N, {len(fis_config.INPUT_ORDER)}), got {inputs.shape}"
+            )
+        self._validate_batch(inputs)
+        return inputs
+
+    @staticmethod
+    def _batch_result(raw) -> FISBatchResult:
+        return FISBatchResult(
+            resistance=raw['opor'],
+            feedback=raw['feedback'],
+            feedback_codes=raw['feedback_code'],
+            valid=raw['valid']
+        )
+
+    @staticmethod
+    def _snapshot_membership(machine) -> Tuple[MembershipPlotData, ...]:
+        """Plot data as read-only views into one buffer copied from the machine's definition."""
+        variables = [machine.definition.variables[identifier] for identifier in fis_config.VISUALIZATION_ORDER]
+        arrays = []
+        for variable in variables:
+            arrays.append(variable.universe)
+            arrays.extend(variable.memberships)
+        buffer = np.concatenate(arrays, dtype=np.float64)
+        buffer.flags.writeable = False
+
+        offsets = np.cumsum([0] + [len(array) for array in arrays]).tolist()
+        views = (buffer[start:stop] for start, stop in zip(offsets, offsets[1:]))
         snapshots = []
-        for identifier in fis_config.VISUALIZATION_ORDER:
-            variable = getattr(self._machine, identifier)
+        for identifier, variable in zip(fis_config.VISUALIZATION_ORDER, variables):
             metadata = fis_config.VARIABLE_METADATA[identifier]
-            universe = np.array(variable.universe, copy=True)
-            terms = tuple(
-                TermPlotData(name, np.array(variable[name].mf, copy=True))
-                for name in variable.terms
-            )
+            universe = next(views)
+            terms = tuple(TermPlotData(name, next(views)) for name in variable.term_names)
             snapshots.append(MembershipPlotData(identifier, metadata.label, metadata.unit, universe, terms))
         return tuple(snapshots)
 
-    def _validate_inputs(self, inputs: FISInputs):
+    def validate_inputs(self, inputs: FISInputs):
+        """Raise ValidationError if any input lies outside INPUT_VALIDATION_BOUNDS."""
         for field_name, value in inputs.__dict__.items():
             if field_name not in fis_config.INPUT_VALIDATION_BOUNDS:
                 continue
@@ -109,9 +345,22 @@ class FISService:
             if not (min_val <= value <= max_val):
                 raise ValidationError(f"{field_name}={value} outside [{min_val}, {max_val}]")
 
+    def _validate_batch(self, inputs: np.ndarray):
+        for column, field_name in enumerate(fis_config.INPUT_ORDER):
+            if field_name not in fis_config.INPUT_VALIDATION_BOUNDS:
+                continue
+            min_val, max_val = fis_config.INPUT_VALIDATION_BOUNDS[field_name]
+            values = inputs[:, column]
+            invalid = ~((values >= min_val) & (values <= max_val))
+            if invalid.any():
+                row = int(np.argmax(invalid))
+                raise ValidationError(
+                    f"{field_name}={values[row]} outside [{min_val}, {max_val}] (row {row})"
+                )
+
     @property
     def rule_count(self) -> int:
-        return len(self._machine.rules)
+        return self._machine.rule_count
 
     @property
     def machine(self):
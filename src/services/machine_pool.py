@@ -0,0 +1,78 @@
+"""Pool of per-MF-type machines built ahead of time on a background thread."""
+import logging
+import threading
+from concurrent.futures import Future
+from typing import Callable, Dict, Generic, Iterable, TypeVar
+
+from config.logging_config import LOGGER_NAME
+
+LOGGER = logging.getLogger(LOGGER_NAME)
+
+T = TypeVar('T')
+
+
+class MachinePool(Generic[T]):
+    """Builds one entry per MF type with ``factory`` and keeps it for reuse.
+
+    ``warm`` queues builds on a daemon thread so startup is not blocked and
+    exit never waits for them. ``get`` returns the pooled entry, waiting for
+    a build already in progress, or builds it on the calling thread when it
+    is still queued (or was never requested), so a switch never waits behind
+    other MF types.
+    """
+
+    def __init__(self, factory: Callable[[str], T]):
+        self._factory = factory
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Future] = {}
+
+    def warm(self, mf_types: Iterable[str]):
+        queued = []
+        with self._lock:
+            for mf_type in mf_types:
+                if mf_type not in self._entries:
+                    entry = self._entries[mf_type] = Future()
+                    queued.append((mf_type, entry))
+        if queued:
+            threading.Thread(target=self._warm, args=(queued,), name='fis-pool', daemon=True).start()
+
+    def get(self, mf_type: str) -> T:
+        with self._lock:
+            entry = self._entries.get(mf_type)
+            # cancel() only succeeds while the background build has not started.
+            build_here = entry is None or entry.cancel()
+            if build_here:
+                entry = self._entries[mf_type] = Future()
+                entry.set_running_or_notify_cancel()
+        if build_here:
+            self._resolve(entry, mf_type)
+        try:
+            return entry.result()
+        except Exception:
+            # A failed build is not kept; the next request retries it.
+            with self._lock:
+                if self._entries.get(mf_type) is entry:
+                    del self._entries[mf_type]
+            raise
+
+    def ready(self, mf_type: str) -> bool:
+        entry = self._entries.get(mf_type)
+        return entry is not None and entry.done() and not entry.cancelled() and entry.exception() is None
+
+    def shutdown(self):
+        """Cancel builds that have not started; finished entries stay usable."""
+        with self._lock:
+            for entry in self._entries.values():
+                entry.cancel()
+
+    def _warm(self, queued):
+        for mf_type, entry in queued:
+            if entry.set_running_or_notify_cancel():
+                self._resolve(entry, mf_type)
+
+    def _resolve(self, entry: Future, mf_type: str):
+        LOGGER.debug("Building pooled machine for %s MFs", mf_type)
+        try:
+            entry.set_result(self._factory(mf_type))
+        except Exception as exc:
+            entry.set_exception(exc)
@@ -0,0 +1,93 @@
+"""Bounded LRU cache of FIS results keyed by inputs quantized to sensor resolution."""
+import math
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Hashable, Optional, Sequence, Tuple
+
+from config import fis_config
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+    capacity: int
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+def quantization_grid() -> Tuple[Tuple[float, int], ...]:
+    """(step, decimals) per input in ``INPUT_ORDER``.
+
+    Slider inputs use their ``SliderConfig``; the training mode, which has no
+    slider, falls back to the step of its universe.
+    """
+    grid = []
+    for name in fis_config.INPUT_ORDER:
+        slider = fis_config.INPUT_VARIABLES.get(name)
+        if slider is not None:
+            grid.append((slider.step, slider.decimals))
+        else:
+            step = fis_config.VARIABLE_UNIVERSES[name][2]
+            grid.append((step, max(0, -math.floor(math.log10(step)))))
+    return tuple(grid)
+
+
+class QuantizedLRUCache:
+    """Maps inputs snapped to the slider step grid to a cached result.
+
+    ``quantize`` returns both the key and the snapped values; callers compute
+    on the snapped values so that every input falling into the same cell gets
+    exactly the result stored for that cell.
+    """
+
+    def __init__(self, capacity: int, grid: Optional[Sequence[Tuple[float, int]]] = None):
+        if capacity <= 0:
+            raise ValueError(f"Cache capacity must be positive, got {capacity}")
+        self.capacity = capacity
+        self.grid = tuple(grid or quantization_grid())
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def quantize(self, values: Sequence[float]) -> Tuple[Hashable, Tuple[float, ...]]:
+        key = tuple(round(value / step) for value, (step, _) in zip(values, self.grid))
+        snapped = tuple(round(cell * step, decimals) for cell, (step, decimals) in zip(key, self.grid))
+        return key, snapped
+
+    def get(self, key: Hashable):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key: Hashable, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """Drop all entries; counters are kept."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> CacheStats:
+        return CacheStats(self.hits, self.misses, self.evictions, len(self._entries), self.capacity)
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,240 @@
+"""Asyncio FIS server that coalesces concurrent requests into batches.
+
+Protocol: newline-delimited JSON over TCP or a Unix socket. A request is
+``{"id": <any>, "inputs": [sila, predkosc, faza, zmeczenie, tryb]}`` (or
+``inputs`` as an object keyed by input name); the response echoes ``id``
+and carries ``resistance``, ``feedback``, ``feedback_text`` and ``valid``,
+or ``error``. Responses on one connection may arrive out of order.
+"""
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+from config import fis_config
+from .fis_service import FISInputs, FISService, LOGGER, ValidationError
+
+DEFAULT_WINDOW = 0.002
+DEFAULT_MAX_BATCH = 512
+
+
+@dataclass(frozen=True)
+class ServerStats:
+    requests: int
+    batches: int
+    errors: int
+
+    @property
+    def mean_batch_size(self) -> float:
+        return self.requests / self.batches if self.batches else 0.0
+
+
+class FISServer:
+    """Serves ``FISService`` to many clients with one batched inference per window.
+
+    The first queued request opens a coalescing window of ``window`` seconds;
+    everything that arrives before it closes (up to ``max_batch`` rows) is
+    evaluated by a single ``compute_batch`` call on a dedicated worker
+    thread, so the event loop keeps accepting requests meanwhile.
+    """
+
+    def __init__(self, service: FISService, window: float = DEFAULT_WINDOW,
+                 max_batch: int = DEFAULT_MAX_BATCH):
+        self.service = service
+        self.window = window
+        self.max_batch = max_batch
+        self._queue: Optional[asyncio.Queue] = None
+        self._batcher: Optional[asyncio.Task] = None
+        self._servers = []
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='fis-batch')
+        self._requests = 0
+        self._batches = 0
+        self._errors = 0
+
+    @property
+    def stats(self) -> ServerStats:
+        return ServerStats(self._requests, self._batches, self._errors)
+
+    async def start_tcp(self, host: str = '127.0.0.1', port: int = 0):
+        """Listen on TCP; returns the bound ``(host, port)``."""
+        server = await asyncio.start_server(self._handle_connection, host, port)
+        self._register(server)
+        return server.sockets[0].getsockname()[:2]
+
+    async def start_unix(self, path: str):
+        self._register(await asyncio.start_unix_server(self._handle_connection, path))
+        return path
+
+    def _register(self, server):
+        if self._batcher is None:
+            self._queue = asyncio.Queue()
+            self._batcher = asyncio.create_task(self._batch_loop())
+        self._servers.append(server)
+        LOGGER.info("FIS server listening on %s", server.sockets[0].getsockname())
+
+    async def close(self):
+        for server in self._servers:
+            server.close()
+            await server.wait_closed()
+        self._servers = []
+        if self._batcher is not None:
+            self._batcher.cancel()
+            try:
+                await self._batcher
+            except asyncio.CancelledError:
+                pass
+            self._batcher = None
+        self._executor.shutdown()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def compute(self, inputs: FISInputs) -> dict:
+        """Queue one validated request and wait for its share of a batch."""
+        if self._queue is None:
+            raise RuntimeError("FISServer is not started; call start_tcp or start_unix first")
+        self.service.validate_inputs(inputs)
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((
+            (inputs.sila, inputs.predkosc, inputs.faza, inputs.zmeczenie, inputs.tryb), future
+        ))
+        return await future
+
+    async def _batch_loop(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            pending = [await self._queue.get()]
+            deadline = loop.time() + self.window
+            while len(pending) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    pending.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            while len(pending) < self.max_batch and not self._queue.empty():
+                pending.append(self._queue.get_nowait())
+
+            try:
+                rows = np.array([row for row, _ in pending], dtype=np.float64)
+                result = await loop.run_in_executor(self._executor, self.service.compute_batch, rows)
+            except Exception as exc:
+                LOGGER.exception("Batch of %d requests failed", len(pending))
+                for _, future in pending:
+                    if not future.done():
+                        future.set_exception(exc)
+                continue
+            self._batches += 1
+            texts = result.feedback_texts
+            for idx, (_, future) in enumerate(pending):
+                if not future.done():
+                    future.set_result({
+                        'resistance': float(result.resistance[idx]),
+                        'feedback': float(result.feedback[idx]),
+                        'feedback_text': texts[idx],
+                        'valid': bool(result.valid[idx]),
+                    })
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        tasks = set()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                task = asyncio.create_task(self._respond(line, writer))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks)
+        except ConnectionError:
+            pass
+        finally:
+            for task in tasks:
+                task.cancel()
+            writer.close()
+
+    async def _respond(self, line: bytes, writer: asyncio.StreamWriter):
+        request_id = None
+        try:
+            request = json.loads(line)
+            request_id = request.get('id')
+            response = await self.compute(_parse_inputs(request['inputs']))
+            self._requests += 1
+        except Exception as exc:
+            # Includes engine failures set on every future of the batch, so
+            # each client gets an error line instead of waiting forever.
+            self._errors += 1
+            response = {'error': str(exc) or type(exc).__name__}
+        response['id'] = request_id
+        writer.write(json.dumps(response).encode() + b'\n')
+        await writer.drain()
+
+
+def _parse_inputs(payload) -> FISInputs:
+    if isinstance(payload, dict):
+        return FISInputs(**{name: float(payload[name]) for name in fis_config.INPUT_ORDER})
+    if len(payload) != len(fis_config.INPUT_ORDER):
+        raise ValidationError(f"Expected {len(fis_config.INPUT_ORDER)} inputs, got {len(payload)}")
+    return FISInputs(*(float(value) for value in payload))
+
+
+class FISClient:
+    """Pipelining client: many requests in flight over one connection."""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self._reader = reader
+        self._writer = writer
+        self._pending = {}
+        self._next_id = 0
+        self._receiver = asyncio.create_task(self._receive())
+
+    @classmethod
+    async def connect_tcp(cls, host: str, port: int) -> 'FISClient':
+        return cls(*await asyncio.open_connection(host, port))
+
+    @classmethod
+    async def connect_unix(cls, path: str) -> 'FISClient':
+        return cls(*await asyncio.open_unix_connection(path))
+
+    async def compute(self, inputs) -> dict:
+        """Send one request; ``inputs`` is a 5-sequence or a dict keyed by input name."""
+        request_id = self._next_id
+        self._next_id += 1
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        payload = inputs if isinstance(inputs, dict) else [float(value) for value in inputs]
+        self._writer.write(json.dumps({'id': request_id, 'inputs': payload}).encode() + b'\n')
+        await self._writer.drain()
+        return await future
+
+    async def _receive(self):
+        try:
+            while True:
+                line = await self._reader.readline()
+                if not line:
+                    break
+                response = json.loads(line)
+                future = self._pending.pop(response.pop('id'), None)
+                if future is not None and not future.done():
+                    future.set_result(response)
+        finally:
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(ConnectionError("Server closed the connection"))
+
+    async def close(self):
+        self._writer.close()
+        await self._writer.wait_closed()
+        self._receiver.cancel()
+        try:
+            await self._receiver
+        except asyncio.CancelledError:
+            pass
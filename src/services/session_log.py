@@ -0,0 +1,172 @@
+"""Columnar session logs: chunked appends into preallocated NumPy storage.
+
+A log is either kept in memory or written to a directory holding one
+``.npy`` file per column. Rows are buffered in a preallocated structured
+chunk; a full chunk is moved into compact storage (or appended to the
+column files, whose headers are then rewritten with the new row count), so
+the files are valid ``.npy`` arrays at every chunk boundary and can be
+memory-mapped by ``read_session`` while a session is still running.
+"""
+import os
+from typing import Dict, List, Mapping, Optional
+
+import numpy as np
+
+# Offline exercise simulation, one row per evaluated sample.
+EXERCISE_DTYPE = np.dtype([
+    ('time', np.float64),
+    ('seria', np.uint16),
+    ('powtorzenie', np.uint16),
+    ('faza', np.float32),
+    ('sila', np.float32),
+    ('predkosc', np.float32),
+    ('zmeczenie', np.float32),
+    ('opor', np.float32),
+    ('feedback', np.float32),
+])
+
+# Synthetic population, the exercise rows tagged with user and training mode.
+POPULATION_DTYPE = np.dtype([('user', np.uint32), ('tryb', np.uint8)] + EXERCISE_DTYPE.descr)
+
+# Live control loop, one row per command.
+CONTROL_DTYPE = np.dtype([
+    ('time', np.float64),
+    ('sila', np.float32),
+    ('predkosc', np.float32),
+    ('faza', np.float32),
+    ('zmeczenie', np.float32),
+    ('tryb', np.float32),
+    ('opor', np.float32),
+    ('feedback', np.float32),
+    ('feedback_code', np.uint8),
+    ('valid', np.bool_),
+    ('latency', np.float32),
+    ('deadline_missed', np.bool_),
+])
+
+DEFAULT_CHUNK_ROWS = 4096
+# Fixed .npy header size so it can be rewritten in place as the column grows.
+HEADER_BYTES = 128
+
+
+class SessionLog:
+    """Append-only table with a fixed structured ``dtype``.
+
+    ``path=None`` keeps the rows in memory; otherwise ``path`` is a
+    directory that receives one ``<column>.npy`` per field. Call ``close``
+    (or use the log as a context manager) to write the last partial chunk.
+    """
+
+    def __init__(self, dtype: np.dtype = EXERCISE_DTYPE, path: Optional[str] = None,
+                 chunk_rows: int = DEFAULT_CHUNK_ROWS):
+        if chunk_rows <= 0:
+            raise ValueError(f"chunk_rows must be positive, got {chunk_rows}")
+        self.dtype = np.dtype(dtype)
+        self.path = path
+        self._buffer = np.empty(chunk_rows, dtype=self.dtype)
+        self._pending = 0
+        self._stored = 0
+        self._chunks: List[np.ndarray] = []
+        self._files = {}
+        if path is not None:
+            os.makedirs(path, exist_ok=True)
+            for name in self.dtype.names:
+                handle = open(os.path.join(path, f'{name}.npy'), 'w+b')
+                _write_header(handle, self.dtype[name], 0)
+                self._files[name] = handle
+
+    def __len__(self):
+        return self._stored + self._pending
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes used by stored rows plus the preallocated chunk."""
+        stored = 0 if self.path is not None else self._stored * self.dtype.itemsize
+        return stored + self._buffer.nbytes
+
+    def append(self, *values, **fields):
+        """Add one row, given positionally in ``dtype`` order or by field name."""
+        if fields:
+            values = tuple(fields[name] for name in self.dtype.names)
+        self._buffer[self._pending] = values
+        self._pending += 1
+        if self._pending == len(self._buffer):
+            self.flush()
+
+    def extend(self, columns: Mapping[str, np.ndarray]):
+        """Add rows from equal-length columns (a dict of arrays or a structured array)."""
+        count = len(columns[self.dtype.names[0]])
+        start = 0
+        while start < count:
+            take = min(count - start, len(self._buffer) - self._pending)
+            target = self._buffer[self._pending:self._pending + take]
+            for name in self.dtype.names:
+                target[name] = columns[name][start:start + take]
+            self._pending += take
+            start += take
+            if self._pending == len(self._buffer):
+                self.flush()
+
+    def flush(self):
+        """Move buffered rows to storage; column files are valid ``.npy`` afterwards."""
+        if not self._pending:
+            return
+        rows = self._buffer[:self._pending]
+        if self.path is None:
+            self._chunks.append(rows.copy())
+        else:
+            for name, handle in self._files.items():
+                handle.seek(0, os.SEEK_END)
+                handle.write(np.ascontiguousarray(rows[name]).tobytes())
+                handle.seek(0)
+                _write_header(handle, self.dtype[name], self._stored + self._pending)
+                handle.flush()
+        self._stored += self._pending
+        self._pending = 0
+
+    def close(self):
+        self.flush()
+        for handle in self._files.values():
+            handle.close()
+        self._files = {}
+
+    def to_array(self) -> np.ndarray:
+        """All rows as one structured array (read back from disk for file logs)."""
+        if self.path is not None:
+            self.flush()
+            columns = read_session(self.path, mmap_mode=None)
+            table = np.empty(len(self), dtype=self.dtype)
+            for name in self.dtype.names:
+                table[name] = columns[name]
+            return table
+        parts = self._chunks + [self._buffer[:self._pending]]
+        if len(parts) == 1:
+            return parts[0].copy()
+        return np.concatenate(parts)
+
+
+def read_session(path: str, mmap_mode: Optional[str] = 'r') -> Dict[str, np.ndarray]:
+    """Columns of a session directory, memory-mapped read-only by default."""
+    columns = {}
+    for filename in sorted(os.listdir(path)):
+        if filename.endswith('.npy'):
+            columns[filename[:-4]] = np.load(os.path.join(path, filename), mmap_mode=mmap_mode)
+    if not columns:
+        raise FileNotFoundError(f"No session columns in {path}")
+    return columns
+
+
+def _write_header(handle, dtype: np.dtype, rows: int):
+    header = {'descr': np.lib.format.dtype_to_descr(dtype), 'fortran_order': False, 'shape': (rows,)}
+    text = repr(header).encode('latin1')
+    prefix = np.lib.format.magic(1, 0)
+    padding = HEADER_BYTES - len(prefix) - 2 - len(text) - 1
+    if padding < 0:
+        raise ValueError(f"Column header does not fit in {HEADER_BYTES} bytes: {text!r}")
+    handle.write(prefix + (HEADER_BYTES - len(prefix) - 2).to_bytes(2, 'little') + text + b' ' * padding + b'\n')
@@ -1,3 +1,10 @@
-from .plots import plot_membership_functions, plot_surface_3d, simulate_exercise
+from importlib import import_module
 
-__all__ = ['plot_membership_functions', 'plot_surface_3d', 'simulate_exercise']
+# plots imports matplotlib; load it on first use rather than with the package.
+__all__ = ['plot_membership_functions', 'plot_surface_3d', 'compute_surface', 'simulate_exercise']
+
+
+def __getattr__(name):
+    if name not in __all__:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(import_module('.plots', __name__), name)
@@ -7,7 +7,9 @@ import matplotlib
 matplotlib.use('Agg')
 import matplotlib.pyplot as plt
 from matplotlib.gridspec import GridSpec
-from scipy.ndimage import gaussian_filter
+
+from config import fis_config
+from src.analysis.simulation import simulate_session
 
 plt.rcParams['font.family'] = 'DejaVu Sans'
 
@@ -119,52 +121,52 @@ def plot_membership_functions(machine, save_path=None, output_dir='output'):
     plt.close()
 
 
+def compute_surface(machine, var1_name, var2_name, var1_vals, var2_vals, fixed_values, sweep=None):
+    """Evaluate the FIS over the var1 x var2 meshgrid in one batched call.
+
+    Returns ``(X, Y, Z_opor, Z_feedback)``; cells where no rule fired are NaN.
+    Pass a ``ParallelSweep`` to spread the grid over worker processes.
+    """
+    X, Y = np.meshgrid(var1_vals, var2_vals)
+    columns = []
+    for name in fis_config.INPUT_ORDER:
+        if name == var1_name:
+            columns.append(X.ravel())
+        elif name == var2_name:
+            columns.append(Y.ravel())
+        else:
+            columns.append(np.full(X.size, fixed_values[name], dtype=float))
+
+    inputs = np.column_stack(columns)
+    raw = sweep.evaluate(machine, inputs) if sweep is not None else machine.compute_batch(inputs)
+    Z_opor = np.where(raw['valid'], raw['opor'], np.nan).reshape(X.shape)
+    Z_feedback = np.where(raw['valid'], raw['feedback'], np.nan).reshape(X.shape)
+    return X, Y, Z_opor, Z_feedback
+
+
 def plot_surface_3d(machine, var1_name, var2_name, var1_range, var2_range,
-                    fixed_values, save_path=None, output_dir='output', smooth=True):
+                    fixed_values, save_path=None, output_dir='output', smooth=True, refine=2,
+                    sweep=None):
 
     var1_start, var1_end, var1_step = var1_range
     var2_start, var2_end, var2_step = var2_range
 
-    var1_step_fine = var1_step / 2
-    var2_step_fine = var2_step / 2
+    var1_step_fine = var1_step / refine
+    var2_step_fine = var2_step / refine
 
     var1_vals = np.arange(var1_start, var1_end, var1_step_fine)
     var2_vals = np.arange(var2_start, var2_end, var2_step_fine)
 
-    X, Y = np.meshgrid(var1_vals, var2_vals)
-    Z_opor = np.zeros_like(X, dtype=float)
-    Z_feedback = np.zeros_like(X, dtype=float)
-
-    var_mapping = {
-        'sila': 'sila_generowana',
-        'predkosc': 'predkosc_ruchu',
-        'faza': 'faza_ruchu',
-        'zmeczenie': 'wskaznik_zmeczenia',
-        'tryb': 'tryb_treningu'
-    }
-
-    for i in range(len(var2_vals)):
-        for j in range(len(var1_vals)):
-            machine.simulator.reset()
-
-            for var, val in fixed_values.items():
-                machine.simulator.input[var_mapping[var]] = val
-
-            machine.simulator.input[var_mapping[var1_name]] = var1_vals[j]
-            machine.simulator.input[var_mapping[var2_name]] = var2_vals[i]
-
-            try:
-                machine.simulator.compute()
-                Z_opor[i, j] = machine.simulator.output['opor_maszyny']
-                Z_feedback[i, j] = machine.simulator.output['sygnal_feedback']
-            except Exception:
-                Z_opor[i, j] = np.nan
-                Z_feedback[i, j] = np.nan
+    X, Y, Z_opor, Z_feedback = compute_surface(
+        machine, var1_name, var2_name, var1_vals, var2_vals, fixed_values, sweep=sweep
+    )
 
     if smooth:
         Z_opor = np.nan_to_num(Z_opor, nan=np.nanmean(Z_opor))
         Z_feedback = np.nan_to_num(Z_feedback, nan=np.nanmean(Z_feedback))
 
+        from scipy.ndimage import gaussian_filter
+
         Z_opor = gaussian_filter(Z_opor, sigma=1.5)
         Z_feedback = gaussian_filter(Z_feedback, sigma=1.5)
 
@@ -200,46 +202,14 @@ def plot_surface_3d(machine, var1_name, var2_name, var1_range, var2_range,
 
     plt.close()
 
+    return Z_opor, Z_feedback
 
-def simulate_exercise(machine, tryb=2, serie=3, powtorzenia=10, save_path=None, output_dir='output'):
 
-    tryb_nazwa = {1: 'Silowy', 2: 'Hipertrofia', 3: 'Wytrzymalosc'}
+def simulate_exercise(machine, tryb=2, serie=3, powtorzenia=10, save_path=None, output_dir='output', log=None):
 
-    results = {
-        'time': [], 'seria': [], 'powtorzenie': [], 'faza': [],
-        'sila': [], 'predkosc': [], 'zmeczenie': [], 'opor': [], 'feedback': []
-    }
-
-    t = 0
-    base_sila = 300 if tryb == 1 else (250 if tryb == 2 else 200)
-    base_predkosc = 0.5 if tryb == 1 else (0.7 if tryb == 2 else 1.0)
-
-    for s in range(1, serie + 1):
-        zmeczenie_base = (s - 1) * 25
-
-        for p in range(1, powtorzenia + 1):
-            zmeczenie = min(100, zmeczenie_base + (p - 1) * 3)
-
-            for faza in np.linspace(0, 100, 20):
-                sila_mod = np.sin(np.pi * faza / 100) * 0.5 + 0.5
-                sila = base_sila * sila_mod * (1 - zmeczenie/200)
-
-                predkosc = base_predkosc * (1 - zmeczenie/300) * (1 - abs(faza - 50)/150)
-                predkosc = max(0.05, min(1.45, predkosc))
-
-                result = machine.compute(sila, predkosc, faza, zmeczenie, tryb)
-
-                results['time'].append(t)
-                results['seria'].append(s)
-                results['powtorzenie'].append(p)
-                results['faza'].append(faza)
-                results['sila'].append(sila)
-                results['predkosc'].append(predkosc)
-                results['zmeczenie'].append(zmeczenie)
-                results['opor'].append(result['opor'])
-                results['feedback'].append(result['feedback'])
+    tryb_nazwa = {1: 'Silowy', 2: 'Hipertrofia', 3: 'Wytrzymalosc'}
 
-                t += 0.05
+    results = simulate_session(machine, tryb, serie, powtorzenia, log)
 
     fig, axes = plt.subplots(4, 1, figsize=(14, 12), sharex=True)
     time = np.array(results['time'])
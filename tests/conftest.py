@@ -0,0 +1,23 @@
+import os
+
+import pytest
+
+from config import fis_config
+
+
+@pytest.fixture(autouse=True)
+def isolated_fis_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(fis_config, 'FIS_CACHE_DIR', str(tmp_path / 'fis-cache'))
+    return tmp_path / 'fis-cache'
+
+
+@pytest.fixture(scope='session')
+def qapp():
+    """The QApplication shared by all Qt tests.
+
+    GUI modules must be imported after it exists: matplotlib only accepts
+    the Qt5Agg backend on a headless machine once a Qt application runs.
+    """
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    QtWidgets = pytest.importorskip('PyQt5.QtWidgets')
+    return QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+
+from benchmarks.defuzzification import reference_centroid
+from src.analysis.sweep import random_inputs
+from src.core.experimental import IntelligentGymMachineExperimental
+from src.core.fis_engine import IntelligentGymMachine
+
+
+def test_analytic_centroid_is_exact_for_piecewise_linear_outputs():
+    sampled = IntelligentGymMachine().engine
+    analytic = IntelligentGymMachine(defuzzifier='analytic').engine
+    inputs = random_inputs(200, seed=11)
+    cuts = sampled.term_cuts(sampled.firing_strengths(inputs))
+    conditioned = sampled.firing_strengths(inputs).max(axis=1) > 1e-6
+    for col, variable in enumerate(sampled.outputs):
+        reference = reference_centroid(variable, cuts[col][conditioned])
+        analytic_error = np.abs(analytic.defuzzify(col, cuts[col][conditioned]) - reference)
+        sampled_error = np.abs(sampled.defuzzify(col, cuts[col][conditioned]) - reference)
+        assert analytic_error.max() < 1e-6
+        assert analytic_error.max() <= sampled_error.max()
+
+
+def test_analytic_machine_agrees_with_sampled():
+    machine = IntelligentGymMachine()
+    inputs = random_inputs(500, seed=11)
+    sampled = machine.compute_batch(inputs)
+    analytic = IntelligentGymMachine(defuzzifier='analytic').compute_batch(inputs)
+    np.testing.assert_array_equal(analytic['valid'], sampled['valid'])
+    # Rows firing at rounding-noise level hit the sampled path's area floor.
+    conditioned = machine.engine.firing_strengths(inputs).max(axis=1) > 1e-6
+    np.testing.assert_allclose(analytic['opor'][conditioned], sampled['opor'][conditioned], atol=0.1)
+    np.testing.assert_allclose(analytic['feedback'][conditioned], sampled['feedback'][conditioned], atol=0.01)
+
+
+def test_analytic_sparse_matches_analytic_dense():
+    inputs = random_inputs(500, seed=11)
+    dense = IntelligentGymMachine(defuzzifier='analytic').engine.evaluate(inputs)
+    sparse = IntelligentGymMachine(backend='sparse', defuzzifier='analytic').engine.evaluate(inputs)
+    np.testing.assert_array_equal(sparse[0], dense[0])
+
+
+def test_smooth_outputs_keep_sampled_centroid():
+    machine = IntelligentGymMachineExperimental(mf_type='gaussian', defuzzifier='analytic')
+    opor, feedback = machine.engine.analytic
+    assert opor is None
+    assert feedback is not None
+
+
+def test_analytic_requires_compiled_backend():
+    with pytest.raises(ValueError):
+        IntelligentGymMachine(backend='skfuzzy', defuzzifier='analytic')
+    with pytest.raises(ValueError):
+        IntelligentGymMachine(defuzzifier='nope')
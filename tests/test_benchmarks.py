@@ -0,0 +1,34 @@
+import json
+
+from benchmarks import run
+
+
+def test_quick_run_writes_json_report(tmp_path, monkeypatch):
+    monkeypatch.setattr(run, 'QUICK_ROUNDS', (2, 0.0))
+    output = tmp_path / 'results.json'
+    status = run.main([
+        '--quick', '--output', str(output),
+        '--cases', 'compute_latency', 'change_mf_type', '--mf-types', 'gaussian',
+    ])
+    report = json.loads(output.read_text())
+    assert status == 0
+    assert set(report['results']) == {'compute_latency[gaussian]', 'change_mf_type[gaussian]'}
+    assert report['results']['compute_latency[gaussian]']['rows'] == 1
+    assert report['meta']['schema'] == run.SCHEMA_VERSION
+
+
+def test_compare_flags_only_slower_cases():
+    baseline = {'results': {'a[x]': {'median': 1.0}, 'b[x]': {'median': 1.0}}}
+    current = {'results': {'a[x]': {'median': 1.5}, 'b[x]': {'median': 1.1}, 'c[x]': {'median': 9.0}}}
+    regressions = run.compare(current, baseline, threshold=0.2)
+    assert [item['case'] for item in regressions] == ['a[x]']
+    assert regressions[0]['ratio'] == 1.5
+
+
+def test_inference_path_imports_only_numpy():
+    from benchmarks import import_time
+
+    for module in ('src.services.fis_service', 'src.services.server', 'src.analysis.sweep'):
+        profile = import_time.import_profile(module)
+        assert profile['heavy'] == [], module
+        assert profile['seconds'] > 0
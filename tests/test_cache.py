@@ -0,0 +1,77 @@
+import os
+
+import numpy as np
+
+from config import fis_config
+from src.core.cache import ArtifactCache, artifact_key
+from src.core.experimental import IntelligentGymMachineExperimental
+from src.core.fis_engine import IntelligentGymMachine
+
+SMALL_SHAPE = (6, 5, 6, 6, 3)
+
+
+def _is_memory_mapped(array):
+    while array is not None:
+        if isinstance(array, np.memmap):
+            return True
+        array = array.base
+    return False
+
+
+def test_second_machine_loads_memory_mapped_engine(isolated_fis_cache):
+    first = IntelligentGymMachine()
+    key = artifact_key(first)
+    assert os.path.isdir(os.path.join(isolated_fis_cache, key))
+
+    second = IntelligentGymMachine()
+    assert _is_memory_mapped(second.engine.inputs[0].memberships)
+    inputs = [[250, 0.7, 50, 20, 2], [420, 0.8, 90, 20, 1]]
+    np.testing.assert_array_equal(first.compute_batch(inputs)['opor'], second.compute_batch(inputs)['opor'])
+
+
+def test_lut_and_error_stats_round_trip():
+    built = IntelligentGymMachine(backend='lut', lut_shape=SMALL_SHAPE)
+    loaded = IntelligentGymMachine(backend='lut', lut_shape=SMALL_SHAPE)
+    assert _is_memory_mapped(loaded.engine.table)
+    assert loaded.engine.error_stats == built.engine.error_stats
+    np.testing.assert_array_equal(loaded.engine.table, built.engine.table)
+
+
+def test_key_changes_with_config_and_mf_type(monkeypatch):
+    triangular = IntelligentGymMachineExperimental(mf_type='triangular')
+    gaussian = IntelligentGymMachineExperimental(mf_type='gaussian')
+    assert artifact_key(triangular) != artifact_key(gaussian)
+    assert artifact_key(triangular) != artifact_key(IntelligentGymMachine())
+
+    before = artifact_key(triangular)
+    universes = dict(fis_config.VARIABLE_UNIVERSES, opor=(0, 100, 0.5))
+    monkeypatch.setattr(fis_config, 'VARIABLE_UNIVERSES', universes)
+    assert artifact_key(triangular) != before
+
+
+def test_corrupt_entry_is_rebuilt(isolated_fis_cache):
+    machine = IntelligentGymMachine()
+    key = artifact_key(machine)
+    with open(os.path.join(isolated_fis_cache, key, 'manifest.json'), 'w') as handle:
+        handle.write('{')
+    assert ArtifactCache(str(isolated_fis_cache)).load(key) is None
+    assert IntelligentGymMachine().compute(250, 0.7, 50, 20, 2)['opor'] == machine.compute(250, 0.7, 50, 20, 2)['opor']
+
+
+def test_simulator_is_built_on_demand():
+    machine = IntelligentGymMachine()
+    assert 'simulator' not in machine.__dict__
+    assert machine.simulator is machine.simulator
+    assert IntelligentGymMachineExperimental().control_system is not None
+
+
+def test_unusable_cache_dir_keeps_engine_in_memory(tmp_path, monkeypatch, caplog):
+    blocker = tmp_path / 'not-a-directory'
+    blocker.write_text('')
+    monkeypatch.setattr(fis_config, 'FIS_CACHE_DIR', str(blocker / 'fis-cache'))
+    with caplog.at_level('WARNING'):
+        machine = IntelligentGymMachine()
+    assert 'Could not store FIS artifacts' in caplog.text
+    assert machine.engine is not None
+    assert not os.path.exists(fis_config.FIS_CACHE_DIR)
+    assert 0 <= machine.compute(250, 0.7, 50, 20, 2)['opor'] <= 100
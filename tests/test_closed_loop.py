@@ -0,0 +1,64 @@
+import numpy as np
+
+from src.analysis.closed_loop import PlantConfig, simulate_closed_loop
+from src.core.fis_engine import IntelligentGymMachine
+
+
+class ScriptedController:
+    """Stands in for a machine: returns ``levels`` in turn on every step."""
+
+    def __init__(self, *levels):
+        self.levels = levels
+        self.calls = 0
+
+    def compute_batch(self, inputs):
+        level = self.levels[self.calls % len(self.levels)]
+        self.calls += 1
+        return {'opor': np.full(len(inputs), level), 'feedback': np.full(len(inputs), 3.0)}
+
+
+SMALL = PlantConfig(users=8, serie=2, powtorzenia=3, seed=1)
+
+
+def test_fis_closed_loop_completes_every_session():
+    run = simulate_closed_loop(IntelligentGymMachine(), SMALL)
+    assert run.completed.all()
+    assert run.traces['resistance'].shape == (run.steps, SMALL.users)
+    # Users finish at different steps and leave NaN behind.
+    last = (~np.isnan(run.traces['resistance'])).sum(axis=0)
+    assert last.max() == run.steps and last.min() < run.steps
+    metrics = run.metrics()
+    assert np.all(metrics['peak_fatigue'] > 0)
+    assert np.all((metrics['mean_resistance'] >= 0) & (metrics['mean_resistance'] <= 100))
+
+
+def test_fatigue_builds_within_a_set_and_recovers_between_sets():
+    config = PlantConfig(users=3, serie=2, powtorzenia=3, seed=2)
+    run = simulate_closed_loop(ScriptedController(40.0), config)
+    fatigue = run.traces['zmeczenie'][:, 0]
+    fatigue = fatigue[~np.isnan(fatigue)]
+    drops = np.flatnonzero(np.diff(fatigue) < 0)
+    assert len(drops) == 1
+    assert np.all(np.diff(fatigue[:drops[0] + 1]) > 0)
+
+
+def test_metrics_separate_steady_and_oscillating_control():
+    steady = simulate_closed_loop(ScriptedController(40.0), SMALL).metrics()
+    chattering = simulate_closed_loop(ScriptedController(30.0, 60.0), SMALL).metrics()
+    assert np.all(steady['reversal_rate'] == 0)
+    assert np.all(steady['resistance_variation'] == 0)
+    assert np.all(chattering['reversal_rate'] > 5)
+
+
+def test_trace_growth_keeps_history(monkeypatch):
+    from src.analysis import closed_loop
+
+    reference = simulate_closed_loop(ScriptedController(40.0, 60.0), SMALL)
+    monkeypatch.setattr(closed_loop, 'TRACE_BLOCK_STEPS', 3)
+    grown = simulate_closed_loop(ScriptedController(40.0, 60.0), SMALL)
+    assert grown.steps == reference.steps
+    for name, values in reference.traces.items():
+        np.testing.assert_array_equal(grown.traces[name], values)
+
+    capped = simulate_closed_loop(ScriptedController(40.0), PlantConfig(users=2, max_steps=10))
+    assert capped.steps == 10 and not capped.completed.any()
@@ -0,0 +1,79 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from src.core.experimental import IntelligentGymMachineExperimental
+from src.core.fis_engine import IntelligentGymMachine
+
+
+def _dense_grid():
+    return np.array(list(itertools.product(
+        np.linspace(0, 500, 4),
+        (0.1, 0.7, 1.3),
+        np.linspace(0, 100, 4),
+        (10, 50, 85),
+        (1, 2.5),
+    )))
+
+
+def _assert_parity(reference, compiled, inputs):
+    opor, feedback, valid = compiled.engine.evaluate(inputs)
+    # Rows whose strongest rule fires only at rounding-noise level have an
+    # ill-conditioned centroid in both implementations.
+    conditioned = compiled.engine.firing_strengths(inputs).max(axis=1) > 1e-9
+    for row, values in enumerate(inputs):
+        expected = reference.compute(*values)
+        assert ('error' in expected) == (not valid[row])
+        if 'error' in expected or not conditioned[row]:
+            continue
+        assert opor[row] == pytest.approx(expected['opor'], abs=1e-9)
+        assert feedback[row] == pytest.approx(expected['feedback'], abs=1e-9)
+
+
+def test_compiled_matches_skfuzzy_on_dense_grid():
+    _assert_parity(
+        IntelligentGymMachine(backend='skfuzzy'),
+        IntelligentGymMachine(backend='compiled'),
+        _dense_grid(),
+    )
+
+
+@pytest.mark.parametrize('mf_type', IntelligentGymMachineExperimental.FUNCTION_TYPES)
+def test_compiled_matches_skfuzzy_for_mf_types(mf_type):
+    rng = np.random.default_rng(7)
+    inputs = np.column_stack([
+        rng.uniform(0, 500, 30),
+        rng.uniform(0, 1.5, 30),
+        rng.uniform(0, 100, 30),
+        rng.uniform(0, 100, 30),
+        rng.uniform(1, 3, 30),
+    ])
+    _assert_parity(
+        IntelligentGymMachineExperimental(mf_type=mf_type, backend='skfuzzy'),
+        IntelligentGymMachineExperimental(mf_type=mf_type, backend='compiled'),
+        inputs,
+    )
+
+
+def test_compiled_compute_is_drop_in():
+    reference = IntelligentGymMachine(backend='skfuzzy').compute(350, 0.4, 15, 5, 1)
+    result = IntelligentGymMachine().compute(350, 0.4, 15, 5, 1)
+    assert set(result) == set(reference)
+    assert result['opor'] == pytest.approx(reference['opor'])
+    assert result['feedback_text'] == reference['feedback_text']
+
+
+def test_compiled_reports_error_when_no_rule_fires():
+    machine = IntelligentGymMachineExperimental(mf_type='triangular')
+    reference = IntelligentGymMachineExperimental(mf_type='triangular', backend='skfuzzy')
+    inputs = (0, 0.7, 0, 0, 2)
+    assert 'error' in reference.compute(*inputs)
+    result = machine.compute(*inputs)
+    assert 'error' in result
+    assert result['opor'] == 50.0
+
+
+def test_unknown_backend_rejected():
+    with pytest.raises(ValueError):
+        IntelligentGymMachine(backend='nope')
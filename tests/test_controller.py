@@ -0,0 +1,90 @@
+import numpy as np
+import pytest
+
+from src.services.controller import RealTimeController
+from src.services.fis_service import FISInputs, FISService
+
+
+class FakeClock:
+    """Deterministic clock advancing by ``step`` on every read and by the slept time."""
+
+    def __init__(self, step):
+        self.now = 0.0
+        self.step = step
+
+    def __call__(self):
+        self.now += self.step
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+ROWS = np.array([
+    [250, 0.7, 50, 20, 2],
+    [350, 0.4, 15, 5, 1],
+    [120, 0.15, 40, 90, 2],
+    [180, 1.1, 70, 40, 3],
+])
+
+
+def test_stream_matches_batch_results():
+    service = FISService()
+    controller = RealTimeController(service, rate_hz=None)
+    commands = list(controller.run(ROWS))
+    batch = service.compute_batch(ROWS)
+    np.testing.assert_allclose([c.resistance for c in commands], batch.resistance)
+    assert [c.feedback_text for c in commands] == list(batch.feedback_texts)
+    assert controller.stats.samples == len(ROWS)
+    assert controller.stats.deadline_misses == 0
+
+
+def test_stream_accepts_fis_inputs_and_clamps_out_of_range():
+    controller = RealTimeController(FISService(), rate_hz=None)
+    inside, outside = controller.run([
+        FISInputs(sila=500, predkosc=0.7, faza=50, zmeczenie=20, tryb=2),
+        FISInputs(sila=900, predkosc=0.7, faza=50, zmeczenie=20, tryb=2),
+    ])
+    assert outside.resistance == pytest.approx(inside.resistance)
+
+
+def test_deadline_misses_are_counted_and_ticks_skipped():
+    clock = FakeClock(step=0.0005)
+    controller = RealTimeController(FISService(), rate_hz=500, clock=clock, sleep=clock.sleep)
+    assert not any(c.deadline_missed for c in controller.run(ROWS))
+    assert controller.stats.latency_max == pytest.approx(0.0005)
+
+    clock = FakeClock(step=0.005)
+    controller = RealTimeController(FISService(), rate_hz=500, clock=clock, sleep=clock.sleep)
+    commands = list(controller.run(ROWS))
+    stats = controller.stats
+    assert all(c.deadline_missed for c in commands)
+    assert stats.deadline_misses == len(ROWS)
+    assert stats.skipped_ticks >= len(ROWS)
+    assert stats.miss_rate == 1.0
+
+
+def test_control_loop_records_session(tmp_path):
+    from src.services.session_log import CONTROL_DTYPE, SessionLog, read_session
+
+    service = FISService()
+    controller = RealTimeController(service, rate_hz=None)
+    with SessionLog(CONTROL_DTYPE, path=str(tmp_path / 'live')) as log:
+        commands = list(controller.run(ROWS, log=log))
+    stored = read_session(log.path)
+    assert len(stored['opor']) == len(ROWS)
+    np.testing.assert_allclose(stored['opor'], [c.resistance for c in commands], rtol=1e-6)
+    np.testing.assert_array_equal(stored['feedback_code'], [c.feedback_code for c in commands])
+    np.testing.assert_allclose(stored['sila'], ROWS[:, 0])
+
+
+def test_unfired_rows_get_the_machine_fallback(monkeypatch):
+    from config import fis_config
+    monkeypatch.setattr(fis_config, 'FALLBACK_RESISTANCE', 42.0)
+    rows = np.array([[134.9, 0.73, 30.6, 20.1, 1], [250, 0.7, 50, 20, 2]])
+    service = FISService()
+    commands = list(RealTimeController(service, rate_hz=None).run(rows))
+    batch = service.compute_batch(rows)
+    assert [c.valid for c in commands] == list(batch.valid) == [False, True]
+    assert commands[0].resistance == batch.resistance[0] == 42.0
+    assert [c.feedback_code for c in commands] == list(batch.feedback_codes)
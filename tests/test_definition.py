@@ -0,0 +1,81 @@
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+from config import fis_config
+from src.core import definition
+from src.core.definition import fis_definition
+from src.core.experimental import IntelligentGymMachineExperimental
+from src.core.fis_engine import IntelligentGymMachine
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.mark.parametrize('function, params', [
+    ('trimf', (15, 30, 45)),
+    ('trimf', (1, 1, 1.8)),
+    ('trapmf', (0, 0, 50, 100)),
+    ('trapmf', (400, 450, 500, 500)),
+    ('gaussmf', (250, 45.0)),
+    ('gbellmf', (67.5, 2.5, 125)),
+    ('sigmf', (300, -0.02)),
+])
+def test_membership_functions_match_skfuzzy(function, params):
+    fuzz = pytest.importorskip('skfuzzy')
+    universe = definition.make_universe(0, 500, 1)
+    if function in ('trimf', 'trapmf'):
+        expected = getattr(fuzz, function)(universe, list(params))
+    else:
+        expected = getattr(fuzz, function)(universe, *params)
+    np.testing.assert_array_equal(definition.MEMBERSHIP_FUNCTIONS[function](universe, params), expected)
+
+
+@pytest.mark.parametrize('mf_type', [None] + list(fis_config.MF_FUNCTION_TYPES))
+def test_definition_is_shared_and_read_only(mf_type):
+    built = fis_definition(mf_type)
+    assert fis_definition(mf_type) is built
+    for variable in built.variables.values():
+        assert variable.memberships.shape == (len(variable.terms), len(variable.universe))
+        for array in (variable.universe, variable.memberships):
+            assert not array.flags.writeable
+    for rule in built.rules:
+        for name, term_name in rule.antecedents + rule.consequents:
+            assert term_name in built.variables[name].term_names
+
+    machine = (IntelligentGymMachine() if mf_type is None
+               else IntelligentGymMachineExperimental(mf_type=mf_type))
+    assert machine.definition is built
+    assert machine.rule_count == len(built.rules)
+
+
+def test_unknown_mf_type_is_rejected():
+    with pytest.raises(ValueError):
+        fis_definition('trapezoidal')
+
+
+def test_control_variables_are_built_from_definition():
+    machine = IntelligentGymMachineExperimental(mf_type='gbell')
+    assert 'sila' not in machine.__dict__
+    sila = machine.definition.variables['sila']
+    assert machine.sila.label == sila.label
+    np.testing.assert_array_equal(machine.sila.universe, sila.universe)
+    for term_name, memberships in zip(sila.term_names, sila.memberships):
+        np.testing.assert_array_equal(machine.sila[term_name].mf, memberships)
+    assert len(machine.rules) == machine.rule_count
+
+
+def test_compiled_machine_does_not_import_skfuzzy(tmp_path):
+    script = (
+        'import sys\n'
+        'from config import fis_config\n'
+        f'fis_config.FIS_CACHE_DIR = {str(tmp_path)!r}\n'
+        'from src.core.experimental import IntelligentGymMachineExperimental\n'
+        'machine = IntelligentGymMachineExperimental(mf_type="sigmoid", backend="lut", lut_shape=(4, 4, 4, 4, 3))\n'
+        'machine.compute(250, 0.7, 50, 20, 2)\n'
+        'print(sorted({"skfuzzy", "matplotlib", "scipy"} & set(sys.modules)))\n'
+    )
+    completed = subprocess.run([sys.executable, '-c', script], capture_output=True, text=True, check=True, cwd=ROOT)
+    assert completed.stdout.strip().splitlines()[-1] == '[]'
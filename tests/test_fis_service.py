@@ -1,6 +1,12 @@
+import time
+
+import numpy as np
 import pytest
 
-from src.services.fis_service import FISService, FISInputs, ValidationError
+from config import fis_config
+from src.analysis.sweep import random_inputs
+from src.core.fis_engine import IntelligentGymMachine
+from src.services.fis_service import FISService, FISInputs, FISResult, ValidationError
 
 
 def test_compute_returns_valid_ranges():
@@ -24,4 +30,173 @@ def test_membership_snapshot_updates_on_mf_change():
     before = service.get_membership_plot_data()
     service.change_mf_type('gaussian')
     after = service.get_membership_plot_data()
-    assert before != after
+    assert [variable.identifier for variable in before] == [variable.identifier for variable in after]
+    changed = [
+        not np.array_equal(old_term.membership, new_term.membership)
+        for old, new in zip(before, after)
+        for old_term, new_term in zip(old.terms, new.terms)
+    ]
+    assert any(changed)
+    # Only the generated MFs change; the categorical training mode keeps its terms.
+    assert not all(changed)
+
+
+def test_compute_batch_matches_single_compute():
+    service = FISService()
+    rows = np.array([
+        [250, 0.7, 50, 20, 2],
+        [350, 0.4, 15, 5, 1],
+        [120, 0.15, 40, 90, 2],
+        [180, 1.1, 70, 40, 3],
+    ])
+    batch = service.compute_batch(rows)
+    assert len(batch) == len(rows)
+    for row, values in enumerate(rows):
+        single = service.compute(FISInputs(*values))
+        assert batch.resistance[row] == pytest.approx(single.resistance)
+        assert batch.feedback[row] == pytest.approx(single.feedback)
+        assert batch.feedback_texts[row] == single.feedback_text
+
+
+def test_compute_batch_validates_every_row():
+    service = FISService()
+    rows = np.array([[250, 0.7, 50, 20, 2], [250, 2.0, 50, 20, 2]])
+    with pytest.raises(ValidationError, match='row 1'):
+        service.compute_batch(rows)
+    with pytest.raises(ValidationError):
+        service.compute_batch(rows[:, :4])
+
+
+def test_change_mf_type_reuses_pooled_machines():
+    service = FISService()
+    triangular = service.machine
+    service.change_mf_type('gaussian')
+    gaussian = service.machine
+    service.change_mf_type('triangular')
+    assert service.machine is triangular
+    service.change_mf_type('gaussian')
+    assert service.machine is gaussian
+
+
+def test_preload_builds_every_mf_type_in_background():
+    assert not FISService().is_ready('gaussian')
+    service = FISService(preload=True)
+    deadline = time.monotonic() + 60
+    while not all(service.is_ready(mf_type) for mf_type in fis_config.MF_TYPE_LABELS):
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+    for mf_type in fis_config.MF_TYPE_LABELS:
+        service.change_mf_type(mf_type)
+        assert service.current_mf_type == mf_type
+
+
+def test_machine_pool_builds_queued_entry_on_demand():
+    from src.services.machine_pool import MachinePool
+
+    built = []
+    pool = MachinePool(lambda mf_type: built.append(mf_type) or mf_type.upper())
+    assert pool.get('bell') == 'BELL'
+    assert pool.get('bell') == 'BELL'
+    assert built == ['bell']
+    assert pool.ready('bell') and not pool.ready('gaussian')
+
+
+def _hammer(compute, rows, threads=8, rounds=16):
+    """Run ``compute`` over ``rows`` from many threads; return (index, result) pairs."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    def worker(offset):
+        # Each thread walks the rows from a different start so calls interleave.
+        order = np.roll(np.arange(len(rows)), offset * 7)
+        return [(index, compute(rows[index])) for index in order]
+
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        return [pair for results in pool.map(worker, range(rounds)) for pair in results]
+
+
+def test_concurrent_compute_is_bit_exact():
+    service = FISService()
+    rows = random_inputs(400, seed=7)
+    reference = FISService()
+    expected = [reference.compute(FISInputs(*row)) for row in rows]
+
+    def compute(row):
+        if row[0] < 250:
+            return service.compute(FISInputs(*row))
+        batch = service.compute_batch(row[None])
+        return batch.resistance[0], batch.feedback[0]
+
+    for index, result in _hammer(compute, rows):
+        if isinstance(result, FISResult):
+            assert result == expected[index]
+        else:
+            assert result == (expected[index].resistance, expected[index].feedback)
+
+
+def test_skfuzzy_backend_serializes_simulations():
+    machine = IntelligentGymMachine(backend='skfuzzy')
+    rows = random_inputs(12, seed=11)
+    expected = [machine.compute(*row) for row in rows]
+    for index, result in _hammer(lambda row: machine.compute(*row), rows, threads=4, rounds=4):
+        assert result == expected[index]
+
+
+def test_compute_batch_parallel_matches_compute_batch():
+    service = FISService(batch_workers=4)
+    rows = random_inputs(5000, seed=3)
+    serial = service.compute_batch(rows)
+    parallel = service.compute_batch_parallel(rows, chunk_rows=700)
+    np.testing.assert_array_equal(parallel.resistance, serial.resistance)
+    np.testing.assert_array_equal(parallel.feedback, serial.feedback)
+    np.testing.assert_array_equal(parallel.feedback_codes, serial.feedback_codes)
+    np.testing.assert_array_equal(parallel.valid, serial.valid)
+    service.close()
+
+
+def test_compute_surface_is_cached_per_machine_and_fixed_values():
+    service = FISService()
+    fixed = {'sila': 250, 'predkosc': 0.7, 'faza': 50, 'zmeczenie': 20, 'tryb': 2}
+    surface = service.compute_surface('sila', 'faza', fixed, resolution=11)
+    assert surface.resistance.shape == (11, 11)
+    assert dict(surface.fixed) == {'predkosc': 0.7, 'zmeczenie': 20.0, 'tryb': 2.0}
+    assert not surface.resistance.flags.writeable
+
+    row, col = 3, 7
+    expected = service.compute(FISInputs(sila=surface.x[col], predkosc=0.7, faza=surface.y[row],
+                                         zmeczenie=20, tryb=2))
+    assert surface.resistance[row, col] == pytest.approx(expected.resistance)
+
+    # Moving an axis input or jittering a fixed one within its slider step hits the cache.
+    assert service.compute_surface('sila', 'faza', dict(fixed, sila=10, zmeczenie=20.2), resolution=11) is surface
+    assert service.compute_surface('sila', 'faza', dict(fixed, zmeczenie=40), resolution=11) is not surface
+    service.change_mf_type('gaussian')
+    other = service.compute_surface('sila', 'faza', fixed, resolution=11)
+    assert other is not surface and other.mf_type == 'gaussian'
+
+    with pytest.raises(ValidationError):
+        service.compute_surface('sila', 'sila', fixed)
+    with pytest.raises(ValidationError):
+        service.compute_surface('sila', 'tryb', fixed)
+    with pytest.raises(ValidationError, match='predkosc, zmeczenie'):
+        service.compute_surface('sila', 'faza', {'tryb': 2})
+
+
+def test_membership_snapshot_is_read_only_view_of_one_buffer():
+    service = FISService()
+    snapshot = service.get_membership_plot_data()
+    arrays = [array for item in snapshot for array in (item.universe, *(term.membership for term in item.terms))]
+    base = arrays[0].base
+    assert base is not None and all(array.base is base for array in arrays)
+    assert base.flags.c_contiguous and base.size == sum(array.size for array in arrays)
+
+    for array in arrays:
+        assert not array.flags.writeable
+        with pytest.raises(ValueError):
+            array[0] = 1.0
+        with pytest.raises(ValueError):
+            array.flags.writeable = True
+
+    sila = next(item for item in snapshot if item.identifier == 'sila')
+    np.testing.assert_array_equal(sila.universe, service.machine.sila.universe)
+    for term in sila.terms:
+        np.testing.assert_array_equal(term.membership, service.machine.sila[term.name].mf)
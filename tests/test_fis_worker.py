@@ -0,0 +1,104 @@
+import threading
+import time
+
+import pytest
+
+pytest.importorskip('PyQt5.QtCore')
+
+from src.gui.fis_worker import FISWorker, SurfaceWorker
+from src.services.fis_service import FISInputs, FISService
+
+
+class BlockingService:
+    """Service stand-in whose first ``compute`` waits until ``release`` is set."""
+
+    def __init__(self):
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.computed = []
+        self.current_mf_label = 'Triangular'
+
+    def compute(self, inputs):
+        self.computed.append(inputs)
+        self.started.set()
+        self.release.wait(5)
+        return inputs.sila
+
+
+def _wait_for(app, predicate, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "timed out waiting for the worker"
+        app.processEvents()
+        time.sleep(0.005)
+
+
+def _inputs(sila):
+    return FISInputs(sila=sila, predkosc=0.7, faza=50, zmeczenie=20, tryb=2)
+
+
+def test_stale_requests_are_dropped(qapp):
+    service = BlockingService()
+    worker = FISWorker(service)
+    results = []
+    worker.resultReady.connect(lambda inputs, result, label: results.append(result))
+    try:
+        worker.evaluate(_inputs(100))
+        assert service.started.wait(5)
+        # Arrive while the first evaluation is still running.
+        for sila in (200, 300, 400):
+            worker.evaluate(_inputs(sila))
+        service.release.set()
+        _wait_for(qapp, lambda: results)
+        qapp.processEvents()
+    finally:
+        worker.stop()
+    assert [inputs.sila for inputs in service.computed] == [100, 400]
+    assert results == [400]
+
+
+def test_evaluation_after_switch_uses_new_machine(qapp):
+    service = FISService()
+    worker = FISWorker(service)
+    events = []
+    worker.mfTypeChanged.connect(lambda mf_type, data, rules: events.append(('switch', mf_type, rules)))
+    worker.resultReady.connect(lambda inputs, result, label: events.append(('result', label)))
+    try:
+        worker.change_mf_type('gaussian')
+        worker.evaluate(_inputs(250))
+        _wait_for(qapp, lambda: any(event[0] == 'result' for event in events))
+    finally:
+        worker.stop()
+        service.close()
+    assert events[0] == ('switch', 'gaussian', service.rule_count)
+    assert events[-1] == ('result', 'Gaussian')
+
+
+def test_failures_are_reported(qapp):
+    service = FISService()
+    worker = FISWorker(service)
+    errors = []
+    worker.failed.connect(errors.append)
+    try:
+        worker.change_mf_type('no-such-type')
+        _wait_for(qapp, lambda: errors)
+    finally:
+        worker.stop()
+        service.close()
+    assert 'no-such-type' in errors[0]
+
+
+def test_surface_worker_posts_cached_surface(qapp):
+    service = FISService()
+    worker = SurfaceWorker(service)
+    surfaces = []
+    worker.surfaceReady.connect(surfaces.append)
+    fixed = {'sila': 250, 'predkosc': 0.7, 'faza': 50, 'zmeczenie': 20, 'tryb': 2}
+    try:
+        worker.request('predkosc', 'zmeczenie', fixed)
+        _wait_for(qapp, lambda: surfaces)
+    finally:
+        worker.stop()
+        service.close()
+    assert (surfaces[0].x_name, surfaces[0].y_name) == ('predkosc', 'zmeczenie')
+    assert service.compute_surface('predkosc', 'zmeczenie', fixed) is surfaces[0]
@@ -0,0 +1,107 @@
+import logging
+import time
+
+import numpy as np
+import pytest
+
+from src.core.instrumentation import LatencyHistogram, StageTimings
+from src.services.fis_service import FISInputs, FISService
+
+INPUTS = FISInputs(sila=250, predkosc=0.7, faza=50, zmeczenie=20, tryb=2)
+
+
+def test_histogram_percentiles_within_bucket_precision():
+    histogram = LatencyHistogram()
+    values = np.arange(1, 100001) * 1000
+    for value in values:
+        histogram.record(int(value))
+    assert histogram.count == len(values)
+    assert histogram.min == 1000 and histogram.max == 100000000
+    for percent in (50, 99, 99.9):
+        exact = np.percentile(values, percent)
+        assert exact <= histogram.percentile(percent) <= exact * 1.07
+
+
+def test_histogram_small_values_are_exact():
+    histogram = LatencyHistogram()
+    for value in (0, 3, 17, 31):
+        histogram.record(value)
+    assert histogram.percentile(50) == 3
+    assert histogram.percentile(100) == 31
+
+
+def test_service_records_all_stages():
+    service = FISService(instrument=True)
+    for _ in range(5):
+        service.compute(INPUTS)
+    service.compute_batch(np.array([[250, 0.7, 50, 20, 2], [350, 0.4, 15, 5, 1]]))
+    stats = service.stats()
+    assert list(stats) == ['fuzzify', 'rules', 'aggregate', 'defuzzify', 'compute', 'compute_batch']
+    assert stats['compute']['count'] == 5
+    assert stats['fuzzify']['count'] == 6
+    assert 0 < stats['fuzzify']['p50'] <= stats['compute']['max']
+
+
+def test_stats_survive_mf_type_change_and_can_be_logged(caplog):
+    service = FISService(instrument=True)
+    service.compute(INPUTS)
+    service.change_mf_type('gaussian')
+    service.compute(INPUTS)
+    assert service.stats()['compute']['count'] == 2
+    with caplog.at_level(logging.INFO, logger='intelligent_gym'):
+        service.log_stats()
+    assert 'defuzzify' in caplog.text
+    service.reset_stats()
+    assert service.stats() == {}
+
+
+def test_disabled_instrumentation_records_nothing():
+    service = FISService()
+    service.compute(INPUTS)
+    assert service.stats() == {}
+    assert service.machine.engine.timings is None
+    service.enable_instrumentation()
+    service.compute(INPUTS)
+    assert service.stats()['compute']['count'] == 1
+    service.enable_instrumentation(False)
+    assert service.machine.engine.timings is None
+
+
+@pytest.mark.parametrize('backend', ['sparse', 'lut'])
+def test_other_backends_record_their_stages(backend):
+    from src.core.fis_engine import IntelligentGymMachine
+    machine = IntelligentGymMachine(backend=backend, lut_shape=(5, 4, 5, 5, 3))
+    timings = StageTimings()
+    machine.instrument(timings)
+    machine.compute(250, 0.7, 50, 20, 2)
+    expected = {'interpolate'} if backend == 'lut' else {'fuzzify', 'rules', 'aggregate', 'defuzzify'}
+    assert expected | {'compute'} == set(timings.stats())
+
+
+def test_lap_returns_current_time():
+    timings = StageTimings()
+    start = time.perf_counter_ns()
+    assert timings.lap('fuzzify', start) >= start
+
+
+@pytest.mark.parametrize('backend', ['compiled', 'sparse', 'lut'])
+def test_detaching_mid_call_does_not_break_inference(backend):
+    from src.core.fis_engine import IntelligentGymMachine
+    machine = IntelligentGymMachine(backend=backend, lut_shape=(5, 4, 5, 5, 3))
+    timings = StageTimings()
+    machine.instrument(timings)
+    evaluate = machine.engine.evaluate
+
+    def evaluate_then_detach(inputs):
+        # Another thread turning instrumentation off while this call runs.
+        result = evaluate(inputs)
+        machine.instrument(None)
+        return result
+
+    machine.engine.evaluate = evaluate_then_detach
+    assert 'error' not in machine.compute(250, 0.7, 50, 20, 2)
+    machine.instrument(timings)
+    machine.engine.evaluate = evaluate_then_detach
+    assert machine.compute_batch([[250, 0.7, 50, 20, 2]])['valid'].all()
+    assert timings.stats()['compute']['count'] == 1
+    assert timings.stats()['compute_batch']['count'] == 1
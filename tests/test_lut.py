@@ -0,0 +1,46 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from src.core.experimental import IntelligentGymMachineExperimental
+from src.core.fis_engine import IntelligentGymMachine
+from src.core.lut import FISLookupTable
+
+SMALL_SHAPE = (11, 7, 11, 11, 3)
+
+
+def test_lut_is_exact_on_grid_nodes():
+    exact = IntelligentGymMachine().engine
+    lut = FISLookupTable.build(exact, SMALL_SHAPE)
+    assert lut.table.dtype == np.float32
+    nodes = np.array(list(itertools.product(*(axis[::3] for axis in lut.axes))))
+    opor, feedback, valid = lut.evaluate(nodes)
+    exact_opor, exact_feedback, exact_valid = exact.evaluate(nodes)
+    np.testing.assert_array_equal(valid, exact_valid)
+    np.testing.assert_allclose(opor[valid], exact_opor[valid], atol=1e-4)
+    np.testing.assert_allclose(feedback[valid], exact_feedback[valid], atol=1e-5)
+
+
+def test_lut_backend_reports_error_against_exact_engine():
+    machine = IntelligentGymMachine(backend='lut', lut_shape=SMALL_SHAPE)
+    stats = machine.engine.error_stats
+    assert {'opor_max', 'opor_mean', 'feedback_max', 'feedback_mean'} <= set(stats)
+    assert stats['opor_mean'] < 5.0
+    assert stats['feedback_mean'] < 0.3
+    result = machine.compute(250, 0.7, 50, 20, 2)
+    assert 0 <= result['opor'] <= 100
+    assert result['feedback_text'] in {'ZWOLNIJ', 'DOBRZE', 'IDEALNIE', 'MOCNIEJ', 'STOP'}
+
+
+def test_lut_backend_for_experimental_machine():
+    machine = IntelligentGymMachineExperimental(mf_type='gaussian', backend='lut', lut_shape=SMALL_SHAPE)
+    exact = IntelligentGymMachineExperimental(mf_type='gaussian')
+    batch = machine.compute_batch([[250, 0.7, 50, 20, 2], [420, 0.8, 90, 20, 1]])
+    expected = exact.compute_batch([[250, 0.7, 50, 20, 2], [420, 0.8, 90, 20, 1]])
+    np.testing.assert_allclose(batch['opor'], expected['opor'], atol=5.0)
+
+
+def test_lut_rejects_degenerate_shape():
+    with pytest.raises(ValueError):
+        FISLookupTable.build(IntelligentGymMachine().engine, (1, 2, 2, 2, 2))
@@ -0,0 +1,51 @@
+import time
+
+import pytest
+
+from src.services.fis_service import FISService
+
+
+@pytest.fixture
+def window(qapp):
+    from src.gui.main_window import MainWindow
+
+    window = MainWindow(FISService())
+    evaluated = []
+    # Record evaluation requests instead of queueing them on the worker.
+    window.worker.evaluate = evaluated.append
+    window.evaluated = evaluated
+    yield window
+    window.close()
+
+
+def _spin(qapp, seconds):
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        qapp.processEvents()
+        time.sleep(0.002)
+
+
+def test_live_mode_evaluates_once_per_burst(qapp, window):
+    interval = window.live_timer.interval() / 1000
+    slider = window.input_panel.sliders['sila'].slider
+
+    for position in range(100, 110):
+        slider.setValue(position)
+    _spin(qapp, interval * 3 + 0.05)
+    assert window.evaluated == []
+
+    window.input_panel.live_check.setChecked(True)
+    assert len(window.evaluated) == 1
+    window.evaluated.clear()
+
+    for position in range(200, 210):
+        slider.setValue(position)
+    assert window.evaluated == []
+    _spin(qapp, interval * 3 + 0.05)
+    assert len(window.evaluated) == 1
+    assert window.evaluated[0].sila == window.input_panel.get_values().sila
+
+    window.input_panel.live_check.setChecked(False)
+    slider.setValue(300)
+    _spin(qapp, interval * 3 + 0.05)
+    assert len(window.evaluated) == 1
@@ -0,0 +1,51 @@
+import pytest
+
+from src.services.fis_service import FISInputs, FISService
+from src.services.result_cache import QuantizedLRUCache
+
+
+def test_quantize_snaps_to_slider_steps():
+    cache = QuantizedLRUCache(4)
+    key, snapped = cache.quantize((250.4, 0.7049, 49.6, 20.0, 2.0))
+    assert snapped == (250, 0.7, 50, 20, 2)
+    assert key == cache.quantize((249.6, 0.6951, 50.4, 19.7, 2.001))[0]
+
+
+def test_lru_eviction_and_counters():
+    cache = QuantizedLRUCache(2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    assert cache.get('a') == 1
+    cache.put('c', 3)
+    assert cache.get('b') is None
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.evictions, stats.size) == (1, 1, 1, 2)
+    assert stats.hit_rate == 0.5
+    with pytest.raises(ValueError):
+        QuantizedLRUCache(0)
+
+
+def test_service_cache_hits_on_repeated_quantized_inputs():
+    service = FISService(cache_size=16)
+    first = service.compute(FISInputs(sila=250.2, predkosc=0.701, faza=50, zmeczenie=20, tryb=2))
+    second = service.compute(FISInputs(sila=249.8, predkosc=0.699, faza=50, zmeczenie=20, tryb=2))
+    assert second is first
+    exact = FISService().compute(FISInputs(sila=250, predkosc=0.7, faza=50, zmeczenie=20, tryb=2))
+    assert first.resistance == pytest.approx(exact.resistance)
+    stats = service.cache_stats()
+    assert (stats.hits, stats.misses) == (1, 1)
+
+
+def test_service_cache_invalidated_on_mf_change():
+    service = FISService(cache_size=16)
+    inputs = FISInputs(sila=250, predkosc=0.7, faza=50, zmeczenie=20, tryb=2)
+    triangular = service.compute(inputs)
+    service.change_mf_type('gaussian')
+    assert service.cache_stats().size == 0
+    gaussian = service.compute(inputs)
+    assert gaussian is not triangular
+    assert service.cache_stats().misses == 2
+
+
+def test_cache_disabled_by_default():
+    assert FISService().cache_stats() is None
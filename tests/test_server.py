@@ -0,0 +1,83 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from src.services.fis_service import FISInputs, FISService
+from src.services.server import FISClient, FISServer
+
+ROWS = np.array([
+    [250, 0.7, 50, 20, 2],
+    [350, 0.4, 15, 5, 1],
+    [120, 0.15, 40, 90, 2],
+    [180, 1.1, 70, 40, 3],
+] * 10, dtype=float)
+
+
+def _serve_and_run(scenario, **server_kwargs):
+    async def run():
+        async with FISServer(FISService(), **server_kwargs) as server:
+            host, port = await server.start_tcp()
+            client = await FISClient.connect_tcp(host, port)
+            try:
+                return server, await scenario(client)
+            finally:
+                await client.close()
+    return asyncio.run(run())
+
+
+def test_concurrent_requests_are_coalesced_and_match_batch():
+    async def scenario(client):
+        return await asyncio.gather(*(client.compute(row) for row in ROWS))
+
+    server, responses = _serve_and_run(scenario, window=0.05)
+    expected = FISService().compute_batch(ROWS)
+    np.testing.assert_allclose([r['resistance'] for r in responses], expected.resistance)
+    assert [r['feedback_text'] for r in responses] == list(expected.feedback_texts)
+    assert server.stats.requests == len(ROWS)
+    assert server.stats.batches < len(ROWS)
+
+
+def test_invalid_request_gets_error_without_failing_batch():
+    async def scenario(client):
+        return await asyncio.gather(
+            client.compute([-5, 0.7, 50, 20, 2]),
+            client.compute({'sila': 250, 'predkosc': 0.7, 'faza': 50, 'zmeczenie': 20, 'tryb': 2}),
+            client.compute([1, 2, 3]),
+        )
+
+    server, (bad, good, short) = _serve_and_run(scenario)
+    assert 'sila' in bad['error']
+    assert good['resistance'] == pytest.approx(FISService().compute_batch(ROWS[:1]).resistance[0])
+    assert 'error' in short
+    assert server.stats.errors == 2
+
+
+class FailingService(FISService):
+    def compute_batch(self, inputs):
+        raise FloatingPointError("engine blew up")
+
+
+def test_failed_batch_answers_every_client_with_error():
+    async def run():
+        async with FISServer(FailingService(), window=0.05) as server:
+            host, port = await server.start_tcp()
+            client = await FISClient.connect_tcp(host, port)
+            try:
+                responses = await asyncio.wait_for(asyncio.gather(*(client.compute(row) for row in ROWS[:4])), 10)
+            finally:
+                await client.close()
+            return server, responses
+
+    server, responses = asyncio.run(run())
+    assert [response['error'] for response in responses] == ['engine blew up'] * 4
+    assert server.stats.errors == 4
+
+
+def test_compute_before_start_raises():
+    async def run():
+        async with FISServer(FISService()) as server:
+            await server.compute(FISInputs(250, 0.7, 50, 20, 2))
+
+    with pytest.raises(RuntimeError, match='not started'):
+        asyncio.run(run())
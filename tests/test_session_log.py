@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+from src.services.session_log import CONTROL_DTYPE, EXERCISE_DTYPE, SessionLog, read_session
+
+
+def _columns(count):
+    index = np.arange(count)
+    return {
+        'time': index * 0.05,
+        'seria': index // 100 + 1,
+        'powtorzenie': index % 10 + 1,
+        'faza': index % 100,
+        'sila': index * 0.5,
+        'predkosc': np.full(count, 0.7),
+        'zmeczenie': index % 100,
+        'opor': index % 101,
+        'feedback': np.full(count, 3.0),
+    }
+
+
+def test_in_memory_log_spans_chunks():
+    log = SessionLog(EXERCISE_DTYPE, chunk_rows=64)
+    columns = _columns(150)
+    log.extend({name: values[:100] for name, values in columns.items()})
+    for row in range(100, 150):
+        log.append(**{name: values[row] for name, values in columns.items()})
+    table = log.to_array()
+    assert len(log) == len(table) == 150
+    np.testing.assert_array_equal(table['time'], columns['time'])
+    np.testing.assert_array_equal(table['sila'], columns['sila'].astype(np.float32))
+
+
+def test_file_log_is_memory_mappable_while_recording(tmp_path):
+    columns = _columns(300)
+    log = SessionLog(EXERCISE_DTYPE, path=str(tmp_path / 'session'), chunk_rows=128)
+    log.extend(columns)
+    # Two full chunks are on disk; the rest is still buffered.
+    partial = read_session(log.path)
+    assert len(partial['time']) == 256
+    assert isinstance(partial['opor'], np.memmap)
+    log.close()
+
+    stored = read_session(log.path)
+    assert set(stored) == set(EXERCISE_DTYPE.names)
+    np.testing.assert_array_equal(stored['time'], columns['time'])
+    assert stored['seria'].dtype == np.uint16
+
+
+def test_log_rejects_bad_chunk_size():
+    with pytest.raises(ValueError):
+        SessionLog(CONTROL_DTYPE, chunk_rows=0)
+
@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+
+from src.analysis.simulation import SAMPLES_PER_REP, PopulationConfig, simulate_population, simulate_session
+from src.core.fis_engine import IntelligentGymMachine
+from src.services.session_log import EXERCISE_DTYPE, POPULATION_DTYPE, SessionLog
+
+
+@pytest.fixture(scope='module')
+def machine():
+    return IntelligentGymMachine()
+
+
+def test_session_rows_follow_sets_and_reps(machine):
+    table = simulate_session(machine, tryb=2, serie=2, powtorzenia=3)
+    assert table.dtype == EXERCISE_DTYPE
+    assert len(table) == 2 * 3 * SAMPLES_PER_REP
+    assert list(np.unique(table['seria'])) == [1, 2]
+    assert table['zmeczenie'][-1] == 25 + 2 * 3
+
+
+def test_population_matches_single_compute(machine):
+    config = PopulationConfig(users=5, serie=2, powtorzenia=2, seed=4)
+    run = simulate_population(machine, config)
+    table = run.table
+    assert table.dtype == POPULATION_DTYPE
+    assert len(table) == config.users * config.samples_per_user
+    assert list(np.unique(table['user'])) == list(range(5))
+    for row in table[::37]:
+        result = machine.compute(row['sila'], row['predkosc'], row['faza'], row['zmeczenie'], row['tryb'])
+        assert row['opor'] == pytest.approx(result['opor'], rel=1e-5)
+    assert run.realtime_users > 0
+
+
+def test_population_parameters(machine, tmp_path):
+    config = PopulationConfig(users=50, modes=(1, 2, 3), mode_weights=(0, 1, 0), serie=1, powtorzenia=2)
+    table = simulate_population(machine, config).table
+    assert set(table['tryb']) == {2}
+    peak = [table['sila'][table['user'] == user].max() for user in range(config.users)]
+    assert np.std(peak) > 0
+
+    nominal = PopulationConfig(users=3, modes=(2,), serie=1, powtorzenia=2, strength_sd=0, speed_sd=0, fatigue_sd=0)
+    with SessionLog(POPULATION_DTYPE, path=str(tmp_path / 'population')) as log:
+        run = simulate_population(machine, nominal, log=log)
+    assert run.table is None
+    table = log.to_array()
+    assert len(table) == run.rows == nominal.users * nominal.samples_per_user
+    np.testing.assert_array_equal(table['sila'][table['user'] == 0], table['sila'][table['user'] == 2])
+
+
+def test_population_chunks_match_single_batch(machine):
+    config = PopulationConfig(users=7, serie=1, powtorzenia=2, seed=9)
+    whole = simulate_population(machine, config).table
+    chunked = simulate_population(machine, config, chunk_rows=2 * config.samples_per_user).table
+    np.testing.assert_array_equal(chunked, whole)
+
+    with SessionLog(POPULATION_DTYPE, chunk_rows=32) as log:
+        simulate_population(machine, config, log=log, chunk_rows=1)
+    np.testing.assert_array_equal(log.to_array(), whole)
@@ -0,0 +1,60 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from src.analysis.sweep import random_inputs
+from src.core.cache import ArtifactCache, artifact_key
+from src.core.experimental import IntelligentGymMachineExperimental
+from src.core.fis_engine import IntelligentGymMachine
+from src.core.sparse import SparseCompiledFIS
+
+
+@pytest.mark.parametrize('mf_type', [None] + list(IntelligentGymMachineExperimental.FUNCTION_TYPES))
+def test_sparse_matches_dense_engine(mf_type):
+    def build(backend):
+        if mf_type is None:
+            return IntelligentGymMachine(backend=backend)
+        return IntelligentGymMachineExperimental(mf_type=mf_type, backend=backend)
+
+    inputs = random_inputs(3000, seed=3)
+    dense = build('compiled').engine.evaluate(inputs)
+    sparse = build('sparse').engine.evaluate(inputs)
+    for expected, actual in zip(dense, sparse):
+        np.testing.assert_array_equal(actual, expected)
+
+
+def test_rule_index_never_drops_a_firing_rule():
+    engine = IntelligentGymMachine(backend='sparse').engine
+    inputs = random_inputs(5000, seed=3)
+    firing = engine.firing_strengths(inputs)
+    candidates = engine.rule_index.candidates(inputs)
+    assert not (firing > 0)[~candidates].any()
+    assert candidates.sum(axis=1).mean() < engine.rule_count / 4
+
+
+def test_sparse_engine_counts_active_rules():
+    engine = IntelligentGymMachine(backend='sparse').engine
+    engine.evaluate(random_inputs(500, seed=3))
+    assert 0 < engine.mean_active_rules < engine.rule_count
+
+
+def test_active_rule_counts_are_exact_across_threads():
+    inputs = random_inputs(300, seed=3)
+    engine = IntelligentGymMachine(backend='sparse').engine
+    engine.evaluate(inputs)
+    expected = engine.mean_active_rules
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        list(pool.map(engine.evaluate, [inputs] * 32))
+    assert engine._rows == 33 * len(inputs)
+    assert engine.mean_active_rules == pytest.approx(expected)
+
+
+def test_sparse_engine_round_trips_through_cache(tmp_path):
+    machine = IntelligentGymMachine(backend='sparse')
+    cache = ArtifactCache(str(tmp_path))
+    cache.store(artifact_key(machine), machine.engine)
+    loaded = cache.load(artifact_key(machine))
+    assert isinstance(loaded, SparseCompiledFIS)
+    inputs = random_inputs(50, seed=3)
+    np.testing.assert_array_equal(loaded.evaluate(inputs)[0], machine.engine.evaluate(inputs)[0])
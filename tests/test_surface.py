@@ -0,0 +1,28 @@
+import numpy as np
+import pytest
+
+from src.core.fis_engine import IntelligentGymMachine
+from src.visualization.plots import compute_surface
+
+
+def test_compute_surface_matches_pointwise_compute():
+    machine = IntelligentGymMachine()
+    sila = np.arange(50, 450, 40)
+    faza = np.arange(0, 100, 12.5)
+    X, Y, Z_opor, Z_feedback = compute_surface(
+        machine, 'sila', 'faza', sila, faza, {'predkosc': 0.6, 'zmeczenie': 30, 'tryb': 2}
+    )
+    assert Z_opor.shape == Z_feedback.shape == (len(faza), len(sila))
+    for i, faza_val in enumerate(faza):
+        for j, sila_val in enumerate(sila):
+            expected = machine.compute(sila_val, 0.6, faza_val, 30, 2)
+            if 'error' in expected:
+                assert np.isnan(Z_opor[i, j])
+            else:
+                assert Z_opor[i, j] == pytest.approx(expected['opor'])
+                assert Z_feedback[i, j] == pytest.approx(expected['feedback'])
+
+
+def test_compute_surface_requires_fixed_values():
+    with pytest.raises(KeyError):
+        compute_surface(IntelligentGymMachine(), 'sila', 'faza', [100], [50], {'predkosc': 0.6})
@@ -0,0 +1,35 @@
+import numpy as np
+
+from src.analysis.sweep import MachineSpec, ParallelSweep, grid_inputs
+from src.core.fis_engine import IntelligentGymMachine
+
+
+def test_grid_inputs_orders_columns_and_rows():
+    inputs = grid_inputs({'faza': [0, 50], 'sila': [100, 200, 300]},
+                         {'predkosc': 0.6, 'zmeczenie': 30, 'tryb': 2})
+    assert inputs.shape == (6, 5)
+    np.testing.assert_array_equal(inputs[:3, 0], [100, 200, 300])
+    np.testing.assert_array_equal(inputs[:, 2], [0, 0, 0, 50, 50, 50])
+    assert (inputs[:, 1] == 0.6).all()
+
+
+def test_parallel_grid_matches_inline_batch():
+    machine = IntelligentGymMachine()
+    axes = {'sila': np.linspace(0, 500, 30), 'zmeczenie': np.linspace(0, 100, 20)}
+    fixed = {'predkosc': 0.6, 'faza': 50, 'tryb': 2}
+    with ParallelSweep(workers=2, chunk_rows=128) as sweep:
+        result = sweep.grid(machine, axes, fixed)
+    expected = machine.compute_batch(grid_inputs(axes, fixed))
+    assert result['opor'].shape == (30, 20)
+    np.testing.assert_array_equal(result['opor'].ravel(), expected['opor'])
+    np.testing.assert_array_equal(result['valid'].ravel(), expected['valid'])
+
+
+def test_evaluate_many_uses_one_pool_for_several_specs():
+    inputs = grid_inputs({'sila': np.linspace(0, 500, 50), 'faza': np.linspace(0, 100, 10)},
+                         {'predkosc': 0.6, 'zmeczenie': 30, 'tryb': 2})
+    specs = [MachineSpec('gaussian'), MachineSpec('sigmoid')]
+    with ParallelSweep(workers=2, chunk_rows=100) as sweep:
+        results = sweep.evaluate_many(specs, inputs)
+    for spec, result in zip(specs, results):
+        np.testing.assert_allclose(result['feedback'], spec.build().compute_batch(inputs)['feedback'])
@@ -0,0 +1,27 @@
+import pytest
+
+from src.services.fis_service import FISResult, FISService
+
+
+def test_defuzzification_markers_follow_results(qapp):
+    from src.gui.visualization_panel import DefuzzificationTab
+
+    tab = DefuzzificationTab(FISService().get_membership_plot_data())
+    tab.resize(800, 400)
+    tab.show()
+    qapp.processEvents()
+    for ax in tab.figure.axes:
+        assert 'Result' not in [text.get_text() for text in ax.get_legend().get_texts()]
+
+    for resistance, feedback in ((62.5, 3.2), (20.0, 1.4)):
+        tab.update_results(FISResult(resistance=resistance, feedback=feedback, feedback_text='DOBRZE'))
+        qapp.processEvents()
+        for (identifier, _, fmt), value in zip(tab.OUTPUTS, (resistance, feedback)):
+            line, band, label = tab._markers[identifier]
+            assert list(line.get_xdata()) == [value, value]
+            assert band.get_x() == pytest.approx(value - tab.BAND_HALF_WIDTH)
+            assert band.get_width() == pytest.approx(2 * tab.BAND_HALF_WIDTH)
+            assert line.get_visible() and band.get_visible()
+            assert label.get_text() == f'Result: {value:{fmt}}'
+    assert not tab._hint.get_visible()
+    assert tab._blit._background is not None